@@ -1,21 +1,40 @@
 import sys
 import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+import pandas as pd
+import numpy as np
 
 # Add the project root to sys.path so Python can find 'llm_eval_package'
 project_root = os.path.abspath(os.path.dirname(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+try:
+    import orjson # Optional fast serializer for the NDJSON stream
+except ImportError:
+    orjson = None
+
 # Import core components from your modularized package
-from llm_eval_package.core.engine import Evaluator
+from llm_eval_package.core.engine import Evaluator, format_run_summary
+from llm_eval_package.core.progress import ProgressSink
+from llm_eval_package.core.jobs import JobStore, JobRunner
+from llm_eval_package.core.streaming import RunningAggregates
 from llm_eval_package.config import (
     AVAILABLE_METRICS, METRIC_THRESHOLDS, TASK_TYPE_MAPPING,
-    TASK_METRICS_PRESELECTION, REQUIRED_COLUMNS
+    TASK_METRICS_PRESELECTION, REQUIRED_COLUMNS,
+    API_EVALUATION_WORKERS, API_EMBEDDING_MICROBATCH,
+    EMBEDDING_MICROBATCH_MAX_SIZE, EMBEDDING_MICROBATCH_MAX_WAIT_MS,
+    JOBS_DB_PATH, JOB_CHUNK_SIZE, JOB_POLL_INTERVAL_SECONDS, JOB_RESULTS_MAX_PAGE_SIZE,
+    API_STREAM_CHUNK_SIZE, API_GZIP_MINIMUM_SIZE
 )
 
 # --- Pydantic Models for API Request/Response Validation and Documentation ---
@@ -34,6 +53,7 @@ class TestCaseInput(BaseModel):
     id: Optional[str] = Field(None, description="Unique identifier for the test case.")
     task_type: Optional[str] = Field(None, description="Task type for the test case (e.g., 'rag_faq', 'summarization').")
     model: Optional[str] = Field(None, description="Name of the LLM model being evaluated.")
+    response_latency_seconds: Optional[float] = Field(None, description="Bot response time in seconds (scored by the 'Latency' metric).")
 
 class EvaluationRequest(BaseModel):
     """
@@ -52,6 +72,10 @@ class EvaluationRequest(BaseModel):
         None,
         description="Optional: List of sensitive keywords for the 'Safety' metric."
     )
+    short_circuit: bool = Field(
+        False,
+        description="Optional: Run metrics cheapest-first and skip metrics for rows whose overall result is already decided."
+    )
 
 class EvaluationResult(BaseModel):
     """
@@ -69,27 +93,159 @@ app = FastAPI(
     description="API for evaluating Large Language Model outputs using various metrics.",
     version="1.0.0",
 )
+# Compresses any response (including the NDJSON stream) for clients sending Accept-Encoding: gzip.
+app.add_middleware(GZipMiddleware, minimum_size=API_GZIP_MINIMUM_SIZE)
 
 # --- Initialize Evaluator (cached per process by Streamlit's @st.cache_resource, but here it's per API app instance) ---
 # For a pure FastAPI app, you might want to manage this caching/singleton pattern differently
 # or ensure the Evaluator is initialized only once.
 # For simplicity, we'll initialize it globally here.
 try:
-    evaluator_instance = Evaluator()
+    evaluator_instance = Evaluator(progress_sink=ProgressSink())
 except Exception as e:
     print(f"CRITICAL ERROR: Failed to initialize Evaluator: {e}")
     sys.exit(1) # Exit if the core evaluator cannot be initialized
 
+# Evaluations are blocking (model inference, NLTK), so they run on this bounded pool instead of
+# the event loop. Each call gets its own Evaluator over the shared, already-loaded metric registry,
+# so concurrent requests don't overwrite each other's run state.
+evaluation_pool = ThreadPoolExecutor(max_workers=API_EVALUATION_WORKERS, thread_name_prefix="evaluate")
+_micro_batching_lock = threading.Lock()
+
+def _enable_embedding_micro_batching(selected_metrics: list):
+    """Lets concurrent requests share Sentence-BERT batches (see MicroBatcher)."""
+    if not API_EMBEDDING_MICROBATCH or "Semantic Similarity" not in selected_metrics:
+        return
+    with _micro_batching_lock:
+        if "Semantic Similarity" not in evaluator_instance.metrics_instances:
+            return
+        metric = evaluator_instance.metrics_instances["Semantic Similarity"]
+        if metric.micro_batcher is None:
+            metric.enable_micro_batching(EMBEDDING_MICROBATCH_MAX_SIZE, EMBEDDING_MICROBATCH_MAX_WAIT_MS / 1000)
+
+def _test_cases_to_dataframe(test_cases: List[TestCaseInput]) -> pd.DataFrame:
+    """Converts request test cases to the DataFrame layout the Evaluator expects."""
+    # Ensure all required columns are present, fill missing optional ones with None/empty string
+    data_for_df = []
+    for tc in test_cases:
+        tc_dict = tc.dict()
+        # Ensure all REQUIRED_COLUMNS from config are present, even if empty
+        for col in REQUIRED_COLUMNS:
+            if col not in tc_dict:
+                tc_dict[col] = None # Or "" if you prefer empty string
+        data_for_df.append(tc_dict)
+
+    df_input = pd.DataFrame(data_for_df)
+
+    # Ensure mandatory columns are present after DataFrame creation
+    mandatory_cols = ['query', 'llm_output', 'reference_answer']
+    if not all(col in df_input.columns for col in mandatory_cols):
+        raise HTTPException(status_code=400, detail=f"Missing one or more mandatory columns in test cases. Required: {', '.join(mandatory_cols)}")
+    return df_input
+
+def _publish_run_summary(run_summary: dict, label: str):
+    """Makes a finished request's or job's summary the one served by /stats, and logs it once."""
+    evaluator_instance.last_run_summary = run_summary
+    print(f"{label}:\n{format_run_summary(run_summary)}")
+
+def _evaluate_request(df_input: pd.DataFrame, request: EvaluationRequest, aggregates: RunningAggregates = None) -> pd.DataFrame:
+    """
+    Blocking evaluation of one request, or of one chunk of it when aggregates is given (the
+    chunk's run summary is then added to aggregates instead of being published); runs on evaluation_pool.
+    """
+    _enable_embedding_micro_batching(request.selected_metrics)
+    evaluator = Evaluator(progress_sink=ProgressSink())
+    df_evaluated = evaluator.evaluate_dataframe(
+        df_input,
+        request.selected_metrics,
+        custom_thresholds=request.custom_thresholds,
+        sensitive_keywords=request.sensitive_keywords,
+        short_circuit=request.short_circuit
+    )
+    if aggregates is not None:
+        aggregates.update(df_evaluated, evaluator.last_run_summary)
+    else:
+        _publish_run_summary(evaluator.last_run_summary, "Evaluation request")
+    return df_evaluated
+
+def _evaluate_request_to_records(df_input: pd.DataFrame, request: EvaluationRequest) -> list:
+    df_evaluated = _evaluate_request(df_input, request)
+    # Convert DataFrame back to a list of dictionaries for JSON response
+    # Ensure NaN values are handled (e.g., converted to None or string "NaN")
+    return df_evaluated.replace({np.nan: None}).to_dict(orient='records')
+
+def _evaluate_job_chunk(df_chunk: pd.DataFrame, params: dict) -> tuple:
+    """Evaluates one chunk of a background job over the already-loaded metric registry."""
+    for col in REQUIRED_COLUMNS:
+        if col not in df_chunk.columns:
+            df_chunk[col] = None
+    _enable_embedding_micro_batching(params["selected_metrics"])
+    evaluator = Evaluator(progress_sink=ProgressSink())
+    df_evaluated = evaluator.evaluate_dataframe(
+        df_chunk,
+        params["selected_metrics"],
+        custom_thresholds=params.get("custom_thresholds"),
+        sensitive_keywords=params.get("sensitive_keywords"),
+        short_circuit=params.get("short_circuit", False)
+    )
+    return df_evaluated, evaluator.last_run_summary
+
+def _job_finished(job_id: str, status: str, run_summary: dict):
+    _publish_run_summary(run_summary, f"Evaluation job {job_id} ({status})")
+
+# Created on startup, so importing this module does not touch the jobs database.
+job_store: JobStore = None
+job_runner: JobRunner = None
+
+@app.on_event("startup")
+def _start_job_runner():
+    global job_store, job_runner
+    os.makedirs(os.path.dirname(JOBS_DB_PATH), exist_ok=True)
+    job_store = JobStore(JOBS_DB_PATH)
+    job_runner = JobRunner(job_store, _evaluate_job_chunk, chunk_size=JOB_CHUNK_SIZE,
+                           poll_interval=JOB_POLL_INTERVAL_SECONDS, on_job_finished=_job_finished)
+    job_runner.start()
+
+def _json_default(value):
+    """orjson fallback for values it can't serialize natively (pd.NA, NaT, Timestamps...)."""
+    if value is None or pd.isna(value):
+        return None
+    return str(value)
+
+def _to_ndjson(df_evaluated: pd.DataFrame) -> bytes:
+    """One JSON object per row, newline-terminated. NaN and missing values become null."""
+    if df_evaluated.empty:
+        return b""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+        return b"".join(orjson.dumps(record, default=_json_default, option=option)
+                        for record in df_evaluated.to_dict(orient='records'))
+    return (df_evaluated.to_json(orient="records", lines=True, force_ascii=False).rstrip("\n") + "\n").encode("utf-8")
+
+def _evaluate_request_to_ndjson(df_input: pd.DataFrame, request: EvaluationRequest,
+                                aggregates: RunningAggregates = None) -> bytes:
+    return _to_ndjson(_evaluate_request(df_input, request, aggregates))
+
+@app.on_event("shutdown")
+def _shutdown_evaluation_pool():
+    if job_runner is not None:
+        job_runner.stop(timeout=5)
+    evaluation_pool.shutdown(wait=False, cancel_futures=True)
+
 # --- API Endpoints ---
 
 @app.get("/metrics", response_model=Dict[str, Any], summary="Get Available Metrics")
 async def get_available_metrics():
     """
     Retrieves a list of all available evaluation metrics and their default thresholds.
+    Metrics are loaded on first use; `warm_metrics` lists those already loaded in this worker
+    and `failed_metrics` those that could not be initialized.
     """
     return {
         "available_metrics": list(AVAILABLE_METRICS.keys()),
-        "default_thresholds": METRIC_THRESHOLDS
+        "default_thresholds": METRIC_THRESHOLDS,
+        "warm_metrics": evaluator_instance.metrics_instances.warm_metrics(),
+        "failed_metrics": evaluator_instance.metrics_instances.failed_metrics()
     }
 
 @app.get("/tasks", response_model=Dict[str, Any], summary="Get Available Task Types")
@@ -126,36 +282,13 @@ async def run_evaluation(request: EvaluationRequest):
         raise HTTPException(status_code=400, detail="No metrics selected for evaluation.")
 
     # Convert list of Pydantic models to pandas DataFrame
-    # Ensure all required columns are present, fill missing optional ones with None/empty string
-    data_for_df = []
-    for tc in request.test_cases:
-        tc_dict = tc.dict()
-        # Ensure all REQUIRED_COLUMNS from config are present, even if empty
-        for col in REQUIRED_COLUMNS:
-            if col not in tc_dict:
-                tc_dict[col] = None # Or "" if you prefer empty string
-        data_for_df.append(tc_dict)
-
-    df_input = pd.DataFrame(data_for_df)
-
-    # Ensure mandatory columns are present after DataFrame creation
-    mandatory_cols = ['query', 'llm_output', 'reference_answer']
-    if not all(col in df_input.columns for col in mandatory_cols):
-        raise HTTPException(status_code=400, detail=f"Missing one or more mandatory columns in test cases. Required: {', '.join(mandatory_cols)}")
+    df_input = _test_cases_to_dataframe(request.test_cases)
 
     try:
-        # Call the evaluator
-        df_evaluated = evaluator_instance.evaluate_dataframe(
-            df_input,
-            request.selected_metrics,
-            custom_thresholds=request.custom_thresholds,
-            sensitive_keywords=request.sensitive_keywords
-        )
-        
-        # Convert DataFrame back to a list of dictionaries for JSON response
-        # Use .to_dict(orient='records') for easy conversion
-        # Ensure NaN values are handled (e.g., converted to None or string "NaN")
-        results_list = df_evaluated.replace({np.nan: None}).to_dict(orient='records')
+        # Run the evaluator (and the record conversion) on the worker pool so the event loop
+        # keeps serving other requests
+        loop = asyncio.get_running_loop()
+        results_list = await loop.run_in_executor(evaluation_pool, _evaluate_request_to_records, df_input, request)
         
         # Wrap each dictionary in EvaluationResult model
         return [{"results": item} for item in results_list]
@@ -166,6 +299,108 @@ async def run_evaluation(request: EvaluationRequest):
         print(f"ERROR during evaluation API call: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"An error occurred during evaluation: {e}")
 
+@app.post("/evaluate/stream", summary="Run LLM Evaluation (streaming NDJSON)",
+          response_class=StreamingResponse, responses={200: {"content": {"application/x-ndjson": {}}}})
+async def run_evaluation_stream(request: EvaluationRequest):
+    """
+    Same input as `/evaluate`, but the response is NDJSON: one JSON object per evaluated test case,
+    in input order, sent as soon as its chunk of rows is evaluated. Memory stays bounded by the
+    chunk size and the first rows arrive long before the whole suite is done.
+
+    If evaluation fails midway, the stream ends with a line `{"error": "..."}`.
+    """
+    if not request.test_cases:
+        raise HTTPException(status_code=400, detail="No test cases provided for evaluation.")
+    if not request.selected_metrics:
+        raise HTTPException(status_code=400, detail="No metrics selected for evaluation.")
+    df_input = _test_cases_to_dataframe(request.test_cases)
+
+    async def ndjson_chunks():
+        loop = asyncio.get_running_loop()
+        # Chunks run one after another, so they can share one set of running totals.
+        aggregates = RunningAggregates(request.selected_metrics)
+        try:
+            for start in range(0, len(df_input), API_STREAM_CHUNK_SIZE):
+                df_chunk = df_input.iloc[start:start + API_STREAM_CHUNK_SIZE]
+                try:
+                    yield await loop.run_in_executor(evaluation_pool, _evaluate_request_to_ndjson, df_chunk, request, aggregates)
+                except Exception as e:
+                    import traceback
+                    print(f"ERROR during streaming evaluation: {e}\n{traceback.format_exc()}")
+                    yield _to_ndjson(pd.DataFrame([{"error": f"An error occurred during evaluation: {e}"}]))
+                    return
+        finally:
+            # Also reached when the client disconnects mid-stream.
+            if aggregates.rows:
+                _publish_run_summary(aggregates.as_run_summary(), f"Streaming evaluation request ({aggregates.chunks} chunk(s))")
+
+    return StreamingResponse(ndjson_chunks(), media_type="application/x-ndjson")
+
+# The /jobs endpoints are plain functions: FastAPI runs them in its threadpool, so the synchronous
+# SQLite JobStore calls (a large submission serializes and inserts every test case) never block
+# the event loop that serves /evaluate/stream and the other requests.
+@app.post("/jobs", status_code=202, response_model=Dict[str, Any], summary="Submit an Evaluation Job")
+def submit_evaluation_job(request: EvaluationRequest):
+    """
+    Queues an evaluation and returns at once with a `job_id`. The job runs in the background;
+    poll `GET /jobs/{job_id}` for progress and page through `GET /jobs/{job_id}/results`.
+    Accepts the same body as `/evaluate`.
+    """
+    if not request.test_cases:
+        raise HTTPException(status_code=400, detail="No test cases provided for evaluation.")
+    if not request.selected_metrics:
+        raise HTTPException(status_code=400, detail="No metrics selected for evaluation.")
+    params = request.dict(exclude={"test_cases"})
+    job_id = job_store.create_job([tc.dict() for tc in request.test_cases], params)
+    job_runner.notify_new_job()
+    return job_store.get_job(job_id)
+
+@app.get("/jobs/{job_id}", response_model=Dict[str, Any], summary="Get Evaluation Job Status")
+def get_evaluation_job(job_id: str):
+    """
+    Returns the job's status (`queued`, `running`, `completed`, `failed` or `cancelled`),
+    `completed_rows` out of `total_rows`, `progress` (0-1) and `rows_per_second`.
+    """
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+@app.get("/jobs/{job_id}/results", response_model=Dict[str, Any], summary="Get Evaluation Job Results")
+def get_evaluation_job_results(job_id: str, offset: int = Query(0, ge=0),
+                               limit: int = Query(100, ge=1, le=JOB_RESULTS_MAX_PAGE_SIZE)):
+    """
+    Pages through the finished rows of a job in input order. Rows become available chunk by
+    chunk while the job runs; `completed_rows` tells how many exist so far.
+    """
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return {
+        "job_id": job_id, "status": job["status"], "offset": offset, "limit": limit,
+        "total_rows": job["total_rows"], "completed_rows": job["completed_rows"],
+        "results": job_store.get_results(job_id, offset, limit),
+    }
+
+@app.post("/jobs/{job_id}/cancel", response_model=Dict[str, Any], summary="Cancel an Evaluation Job")
+def cancel_evaluation_job(job_id: str):
+    """
+    Cancels a job. A queued job is cancelled immediately; a running job stops after its current
+    chunk. Rows finished before cancellation stay available.
+    """
+    job = job_store.request_cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+@app.get("/stats", response_model=Dict[str, Any], summary="Get Last Run Summary")
+async def get_last_run_summary():
+    """
+    Returns the summary of the most recent evaluation served by this worker,
+    including embedding cache hit/miss statistics.
+    """
+    return evaluator_instance.last_run_summary
+
 # --- Health Check Endpoint (Optional but Recommended) ---
 @app.get("/health", summary="Health Check")
 async def health_check():
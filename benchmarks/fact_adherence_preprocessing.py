@@ -0,0 +1,106 @@
+# benchmarks/fact_adherence_preprocessing.py
+"""
+Throughput of FactAdherenceMetric before and after memoized, batched preprocessing.
+
+Builds a synthetic suite (default 20,000 rows) in which outputs and ';'-separated fact lists
+repeat the way they do in real test suites, then scores it three ways:
+
+    before     per-row compute() that re-tokenizes, POS-tags and lemmatizes every text
+               (the metric as it was, reproduced here without any caches)
+    compute    per-row compute() with the text LRU and lemma memo
+    batch      compute_batch(): one pos_tag_sents call for every distinct text
+
+Run from the repository root:
+
+    python benchmarks/fact_adherence_preprocessing.py [--rows 20000] [--distinct_outputs 2000]
+
+Without the NLTK data packages the metric falls back to substring matching; the script says so
+and the numbers then only measure that fallback.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from llm_eval_package.metrics import fact_adherence  # noqa: E402
+from llm_eval_package.metrics.fact_adherence import FactAdherenceMetric  # noqa: E402
+
+FACTS = ["NRIC", "proof of address", "annual fee waived", "interest rates apply", "minimum deposit of $500",
+         "valid passport", "income documents", "processing takes 5 working days", "branch visit required",
+         "online application available", "credit limits are reviewed", "supplementary cards issued"]
+FILLER = ("Thank you for your question. Customers applying for this product should note that "
+          "requirements differ by segment and the bank may request additional documents.")
+
+
+def build_suite(rows: int, distinct_outputs: int, seed: int = 0):
+    rng = random.Random(seed)
+    outputs = []
+    for i in range(distinct_outputs):
+        mentioned = rng.sample(FACTS, rng.randint(2, 6))
+        outputs.append(f"{FILLER} You will need: {', '.join(mentioned)}. Reference {i}.")
+    fact_lists = [";".join(rng.sample(FACTS, rng.randint(1, 4))) for _ in range(max(1, distinct_outputs // 10))]
+    return ([rng.choice(outputs) for _ in range(rows)], [rng.choice(fact_lists) for _ in range(rows)])
+
+
+def uncached_compute(metric: FactAdherenceMetric, llm_output: str, required_facts: str) -> float:
+    """The per-row algorithm without caches: every text is tokenized, tagged and lemmatized again."""
+    def process(text):
+        tokens = metric._clean_tokens(text)
+        return [metric.lemmatizer.lemmatize(token, metric._get_wordnet_pos(tag))
+                for token, tag in fact_adherence.nltk.pos_tag(tokens)] if tokens else []
+
+    facts = metric._split_facts(required_facts)
+    if facts is None:
+        return np.nan
+    output_words = set(process(llm_output))
+    found = 0
+    for fact in facts:
+        fact_words = process(fact)
+        if fact_words and all(word in output_words for word in fact_words):
+            found += 1
+    return found / len(facts)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    scores = fn()
+    return np.asarray(scores, dtype=float), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FactAdherenceMetric rows/s with and without preprocessing caches.")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows in the synthetic suite (default: 20000).")
+    parser.add_argument("--distinct_outputs", type=int, default=2000,
+                        help="Distinct LLM outputs the rows are drawn from (default: 2000).")
+    args = parser.parse_args()
+
+    outputs, facts = build_suite(args.rows, args.distinct_outputs)
+    probe = FactAdherenceMetric()
+    if not probe.nltk_ready:
+        print("NLTK data not available: measuring the substring fallback only (no preprocessing to cache).")
+
+    runs = {}
+    if probe.nltk_ready:
+        runs["before"] = timed(lambda: [uncached_compute(probe, o, f) for o, f in zip(outputs, facts)])
+    metric = FactAdherenceMetric()
+    runs["compute"] = timed(lambda: [metric.compute(o, required_facts=f) for o, f in zip(outputs, facts)])
+    metric = FactAdherenceMetric()
+    runs["batch"] = timed(lambda: metric.compute_batch(outputs, required_facts=facts))
+
+    reference = next(iter(runs.values()))[0]
+    baseline_seconds = next(iter(runs.values()))[1]
+    print(f"{args.rows} rows, {args.distinct_outputs} distinct outputs")
+    for name, (scores, seconds) in runs.items():
+        same = np.allclose(scores, reference, equal_nan=True)
+        print(f"  {name:<8} {seconds:8.2f}s  {args.rows / seconds:10.0f} rows/s  "
+              f"{baseline_seconds / seconds:6.1f}x  {'same scores' if same else 'SCORES DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/import_time.py
+"""
+Cold-start cost of the headless entry points.
+
+Each target is imported in a fresh interpreter several times; the script reports the median
+wall time and which heavy packages the import pulled in. Run from the repository root:
+
+    python benchmarks/import_time.py [--runs 5]
+
+For a per-module breakdown of one target, use:
+
+    python -X importtime -c "import llm_eval_package.main" 2> importtime.log
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# What `python -m llm_eval_package.main evaluate` and `uvicorn api_app:app` import before doing any work.
+TARGETS = {
+    "main.py evaluate": "import llm_eval_package.main",
+    "uvicorn api_app:app": "import api_app",
+    "core engine only": "import llm_eval_package.core.engine",
+}
+HEAVY_MODULES = ("streamlit", "sentence_transformers", "torch", "nltk", "sklearn")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, runs: int) -> dict:
+    timings, heavy = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+        payload = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(payload["seconds"])
+        heavy = payload["heavy"]
+    return {"median_seconds": statistics.median(timings), "heavy_modules": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the CLI and API entry points.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (default: 5).")
+    args = parser.parse_args()
+
+    for name, statement in TARGETS.items():
+        result = measure(statement, args.runs)
+        if "error" in result:
+            print(f"{name:<24} import failed: {result['error']}")
+            continue
+        heavy = ", ".join(result["heavy_modules"]) or "none"
+        print(f"{name:<24} {result['median_seconds']:.3f}s  (heavy modules loaded: {heavy})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/lexical_metrics.py
+"""
+Completeness, Trust & Factuality and Conciseness on a large synthetic suite: per-row
+compute() calls versus compute_batch() the way the Evaluator runs it (lowercased texts
+built once for all three metrics, the word overlap shared by Completeness and Trust).
+
+Outputs and references are random sentences over a 20,000-word vocabulary. With
+--distinct-fraction below 1, rows repeat earlier texts, as suites with repeated queries do.
+
+The last two columns time the reference word coverage alone: the per-row set loop that ships
+in lexical_overlap.py, against binary sparse document-term matrices (words factorized into one
+shared vocabulary, CSR matrices for outputs and references, overlap = row sums of
+A.multiply(B)). Splitting and factorizing the words in Python costs more than the whole set
+loop, so the sparse variant is kept here as the measured alternative rather than shipped.
+Run from the repository root:
+
+    python benchmarks/lexical_metrics.py [--rows 100000] [--distinct-fraction 1.0 0.2]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from llm_eval_package.metrics.completeness import CompletenessMetric  # noqa: E402
+from llm_eval_package.metrics.conciseness import ConcisenessMetric  # noqa: E402
+from llm_eval_package.metrics.lexical_overlap import reference_word_coverage  # noqa: E402
+from llm_eval_package.metrics.text_artifacts import build_text_artifacts  # noqa: E402
+from llm_eval_package.metrics.trust_factuality import TrustFactualityMetric  # noqa: E402
+
+METRICS = (CompletenessMetric, TrustFactualityMetric, ConcisenessMetric)
+
+
+def build_inputs(rows: int, distinct_fraction: float, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_letters, k=rng.randint(2, 9))) for _ in range(20000)]
+
+    def sentence(low, high):
+        return " ".join(rng.choices(vocabulary, k=rng.randint(low, high))) + "."
+
+    num_distinct = max(1, int(rows * distinct_fraction))
+    pairs = [(sentence(10, 80), sentence(5, 40)) for _ in range(num_distinct)]
+    pairs += [rng.choice(pairs) for _ in range(rows - num_distinct)]
+    rng.shuffle(pairs)
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def per_row(metrics: list, outputs: list, references: list) -> dict:
+    return {m.name: np.array([m.compute(o, reference_answer=r) for o, r in zip(outputs, references)])
+            for m in metrics}
+
+
+def batched(metrics: list, outputs: list, references: list) -> dict:
+    columns = {"llm_output": outputs, "reference_answer": references}
+    artifacts, _ = build_text_artifacts(columns, [request for m in metrics for request in m.text_artifacts])
+    return {m.name: m.compute_batch(outputs, references, **{name: artifacts[name] for name in m.row_argument_names()
+                                                            if name in artifacts})
+            for m in metrics}
+
+
+def sparse_reference_coverage(lowered_outputs: list, lowered_references: list) -> np.ndarray:
+    """reference_word_coverage() through binary sparse document-term matrices."""
+    from scipy import sparse
+    num_rows = len(lowered_outputs)
+    # Each distinct text is split once; rows point at their text's words.
+    text_codes, texts = pd.factorize(np.asarray(list(lowered_references) + list(lowered_outputs), dtype=object))
+    text_words = [text.split() for text in texts]
+    word_codes, vocabulary = pd.factorize(np.fromiter((w for words in text_words for w in words), dtype=object))
+    lengths = np.fromiter(map(len, text_words), dtype=np.int64, count=len(text_words))
+    per_text = sparse.csr_matrix((np.ones(len(word_codes), dtype=np.int8), word_codes,
+                                  np.concatenate(([0], np.cumsum(lengths)))), shape=(len(texts), len(vocabulary)))
+    per_text.sum_duplicates()
+    per_text.data[:] = 1
+    references, outputs = per_text[text_codes[:num_rows]], per_text[text_codes[num_rows:]]
+    common = np.asarray(outputs.multiply(references).sum(axis=1)).ravel()
+    reference_sizes = np.diff(references.indptr)
+    return np.divide(common, reference_sizes, out=np.ones(num_rows), where=reference_sizes > 0)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-row and batched scoring of the lexical metrics.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows to score (default: 100000).")
+    parser.add_argument("--distinct-fraction", type=float, nargs="+", default=[1.0, 0.2],
+                        help="Fractions of distinct (output, reference) pairs to measure (default: 1.0 0.2).")
+    args = parser.parse_args()
+
+    print(f"{'distinct':>9} {'per-row':>9} {'batched':>9} {'speedup':>8} {'coverage':>9} {'sparse':>9}  scores")
+    for fraction in args.distinct_fraction:
+        outputs, references = build_inputs(args.rows, fraction)
+        row_seconds, row_scores = timed(lambda: per_row([m() for m in METRICS], outputs, references))
+        batch_seconds, batch_scores = timed(lambda: batched([m() for m in METRICS], outputs, references))
+        lowered_outputs, lowered_references = [t.lower() for t in outputs], [t.lower() for t in references]
+        loop_seconds, loop_coverage = timed(lambda: reference_word_coverage(lowered_outputs, lowered_references))
+        sparse_seconds, sparse_coverage = timed(lambda: sparse_reference_coverage(lowered_outputs, lowered_references))
+        same = all(np.allclose(row_scores[name], batch_scores[name]) for name in row_scores) and \
+            np.allclose(loop_coverage, sparse_coverage)
+        print(f"{fraction:>9.0%} {row_seconds:>8.2f}s {batch_seconds:>8.2f}s {row_seconds / batch_seconds:>7.1f}x "
+              f"{loop_seconds:>8.2f}s {sparse_seconds:>8.2f}s  {'same' if same else 'DIFFER'} for {', '.join(row_scores)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/safety_keyword_matcher.py
+"""
+SafetyMetric keyword matching: one regex search per keyword (the old loop) versus the compiled
+trie matcher, at 10, 1,000 and 10,000 keywords.
+
+Keywords and outputs are synthetic (random words and two-word phrases; about one output in
+ten contains a keyword). The old loop costs rows x keywords searches, so it is timed on a
+sample of rows sized to keep each run short. Run from the repository root:
+
+    python benchmarks/safety_keyword_matcher.py [--rows 5000] [--keywords 10 1000 10000]
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from llm_eval_package.metrics.keyword_matcher import KeywordMatcher  # noqa: E402
+
+OLD_LOOP_SEARCH_BUDGET = 100_000  # rows x keywords searched by the old loop per run
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def build_inputs(rows: int, num_keywords: int, seed: int = 0):
+    rng = random.Random(seed)
+    keywords = list(dict.fromkeys(
+        random_word(rng) if rng.random() < 0.7 else f"{random_word(rng)} {random_word(rng)}"
+        for _ in range(num_keywords)
+    ))
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    outputs = []
+    for _ in range(rows):
+        words = rng.choices(vocabulary, k=rng.randint(30, 120))
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        outputs.append(" ".join(words).capitalize() + ".")
+    return keywords, outputs
+
+
+def old_loop(outputs: list, keywords: list) -> list:
+    """SafetyMetric._evaluate_safety before the compiled matcher."""
+    results = []
+    for output in outputs:
+        lowered = output.lower()
+        results.append(any(re.search(r'\b' + re.escape(k.lower()) + r'\b', lowered) for k in keywords))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-keyword regex search with the compiled keyword matcher.")
+    parser.add_argument("--rows", type=int, default=5000, help="LLM outputs to scan (default: 5000).")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[10, 1000, 10000],
+                        help="Keyword list sizes to measure (default: 10 1000 10000).")
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} {'compile':>9} {'old rows/s':>12} {'new rows/s':>12} {'speedup':>8}  results")
+    for num_keywords in args.keywords:
+        keywords, outputs = build_inputs(args.rows, num_keywords)
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        new_results = [matcher.contains_any(output.lower()) for output in outputs]
+        new_rate = len(outputs) / (time.perf_counter() - started)
+
+        sample = outputs[:max(1, min(len(outputs), OLD_LOOP_SEARCH_BUDGET // max(1, len(keywords))))]
+        started = time.perf_counter()
+        old_results = old_loop(sample, keywords)
+        old_rate = len(sample) / (time.perf_counter() - started)
+
+        same = old_results == new_results[:len(sample)]
+        print(f"{len(keywords):>9} {compile_seconds:>8.3f}s {old_rate:>12.0f} {new_rate:>12.0f} "
+              f"{new_rate / old_rate:>7.1f}x  {'same' if same else 'DIFFER'} on {len(sample)} rows, "
+              f"{sum(new_results)} of {len(outputs)} flagged")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ TASK_TYPE_MAPPING = {
 AVAILABLE_METRICS = {
     "Semantic Similarity": "SemanticSimilarityMetric",
     "Fact Adherence": "FactAdherenceMetric",  # <-- ADDED
+    "Latency": "LatencyMetric", # Bot response time in seconds, from `fetch-responses` timings
     # "Trust & Factuality": "TrustFactualityMetric",
     # "Completeness": "CompletenessMetric",
     # "Conciseness": "ConcisenessMetric",
@@ -41,8 +42,12 @@ METRIC_THRESHOLDS = {
     "Trust & Factuality": 0.75,
     "Fact Adherence": 0.99, # e.g., require all facts to be present (score 1.0 for all found)
     "Safety": 1.0,
+    "Latency": 10.0, # Seconds; a response passes when its latency is at or below this
 }
 
+# Metrics whose score is a cost (lower is better): a row passes when score <= threshold.
+LOWER_IS_BETTER_METRICS = ("Latency",)
+
 # --- Overall Pass/Fail Criteria Constants ---
 PASS_CRITERION_ALL_PASS = "All selected metrics must pass"
 PASS_CRITERION_ANY_PASS = "Any selected metric can pass"
@@ -93,6 +98,82 @@ MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mode
 # This model is used for semantic similarity calculations
 SENTENCE_BERT_MODEL = "all-MiniLM-L6-v2"
 SENTENCE_BERT_MODEL_PATH = os.path.join(MODEL_DIR, SENTENCE_BERT_MODEL)
+# Number of texts encoded per forward pass when Semantic Similarity scores a whole dataset at once.
+# Larger batches amortize model overhead; lower this if memory is tight.
+SEMANTIC_SIMILARITY_BATCH_SIZE = 256
+
+# Persistent embedding cache shared by the CLI, the API and the Streamlit app.
+# Embeddings are keyed by (model name, normalized text hash), so unchanged reference answers are
+# never re-embedded across runs. Set ENABLE_EMBEDDING_CACHE = False to always re-encode.
+ENABLE_EMBEDDING_CACHE = True
+EMBEDDING_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'embeddings')
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000 # LRU-evicted beyond this; ~150 MB on disk for a 384-dim model
+
+# --- Fact Adherence ---
+# Lemmatized tokens are cached per distinct output / fact phrase (LRU), and lemmas per (token, POS).
+FACT_ADHERENCE_TEXT_CACHE_SIZE = 50_000
+FACT_ADHERENCE_LEMMA_CACHE_SIZE = 200_000 # Cleared when full
+# Substring fallback (no NLTK data): one compiled matcher per distinct fact list (LRU).
+FACT_ADHERENCE_MATCHER_CACHE_SIZE = 10_000
+FACT_ADHERENCE_WORD_BOUNDARIES = False # True: a fact only matches as whole words ("NRIC" not in "NRICs")
+
+# --- Evaluation Execution ---
+# "serial" scores every metric in this process. "process" spreads CPU-bound metrics
+# (e.g. Fact Adherence) over a pool of worker processes in row chunks; model-based metrics
+# always run in the main process. Results are identical either way.
+EVALUATION_EXECUTOR = "serial"
+EVALUATION_WORKERS = None # None = os.cpu_count()
+PROCESS_POOL_MIN_ROWS = 500 # Smaller runs stay serial; starting the pool costs more than it saves
+PROCESS_POOL_MIN_CHUNK_ROWS = 64
+STREAM_CHUNK_SIZE = 5000 # Rows per chunk for `main.py evaluate --stream`
+
+# --- API Server ---
+# /evaluate runs on a bounded thread pool so the event loop (and /health) stays responsive.
+API_EVALUATION_WORKERS = 4
+# Embedding requests from concurrent API evaluations are merged into shared model batches:
+# a batch is sent to the model once it holds MAX_SIZE texts or its first text has waited MAX_WAIT_MS.
+API_EMBEDDING_MICROBATCH = True
+EMBEDDING_MICROBATCH_MAX_SIZE = 256
+EMBEDDING_MICROBATCH_MAX_WAIT_MS = 10
+# Asynchronous evaluation jobs (POST /jobs). The queue and per-row results live in this SQLite
+# file, so queued and interrupted jobs survive an API restart.
+JOBS_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'jobs.sqlite')
+JOB_CHUNK_SIZE = 500 # Rows evaluated (and persisted) per step; also the cancellation granularity
+JOB_POLL_INTERVAL_SECONDS = 1.0
+JOB_RESULTS_MAX_PAGE_SIZE = 1000
+# POST /evaluate/stream evaluates this many rows at a time and sends them as NDJSON lines.
+API_STREAM_CHUNK_SIZE = 200
+API_GZIP_MINIMUM_SIZE = 1000 # Responses smaller than this many bytes are not gzip-compressed
+
+# --- RAG Bot Response Fetching ---
+# `main.py fetch-responses` and the Streamlit "Fetch Responses" button send this many bot
+# requests at once over a shared keep-alive connection pool.
+FETCH_CONCURRENCY = 8
+FETCH_TIMEOUT_SECONDS = 30
+# The in-flight limit adapts (AIMD) between these bounds: it grows while responses are fast and
+# successful, and halves on HTTP 429/5xx, timeouts, or responses whose time to first chunk exceeds
+# FETCH_LATENCY_TOLERANCE x its running average. FETCH_CONCURRENCY is the starting point.
+FETCH_MIN_CONCURRENCY = 1
+FETCH_MAX_CONCURRENCY = 64
+FETCH_LATENCY_TOLERANCE = 2.0
+# Retries wait a random time in [0, min(MAX, BASE * 2**attempt)] (a 429's Retry-After wins if longer).
+FETCH_BACKOFF_BASE_SECONDS = 0.5
+FETCH_BACKOFF_MAX_SECONDS = 30.0
+# After this many consecutive failures for one domain, requests to it pause for the cooldown.
+FETCH_CIRCUIT_FAILURE_THRESHOLD = 5
+FETCH_CIRCUIT_COOLDOWN_SECONDS = 30.0
+# Successful bot answers are cached by (api_url, domain path, query) and reused until they are
+# FETCH_CACHE_TTL_SECONDS old. `fetch-responses --refresh` ignores the cache for one run.
+FETCH_CACHE_ENABLED = True
+FETCH_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'responses.sqlite')
+FETCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+# fetch-responses appends every finished row to <output CSV> + this suffix. Re-running with the
+# same input and output resumes from it; it is removed once every row has been fetched successfully.
+FETCH_CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+# `main.py load-test`: connection pool size for --rate runs (--concurrency runs use one per user)
+# and the interval of the live progress lines and the per-interval report.
+LOAD_TEST_MAX_CONNECTIONS = 256
+LOAD_TEST_REPORT_INTERVAL_SECONDS = 5.0
 
 # Interpretation engine configuration
 # This could include rules or prompts for generating insights
@@ -105,6 +186,7 @@ INTERPRETATION_CONFIG = {
     "conciseness_insight": "Conciseness evaluates if the LLM's output is brief and to the point. Higher score = less verbosity.",
     "trust_factuality_insight": "Trust & Factuality checks if the LLM's output is consistent with factual information in the reference. Higher score = more reliable.",
     "safety_insight": "Safety checks for user-defined sensitive keywords. Score 1.0 = safe (no keywords detected), 0.0 = unsafe.",
+    "latency_insight": "Latency is the time in seconds the bot took to stream its full answer, recorded when responses are fetched. Lower score = faster; a row passes at or below the threshold.",
 }
 
 # Report generation configuration
@@ -0,0 +1,91 @@
+# llm_eval_package/core/decision.py
+import numpy as np
+
+from llm_eval_package.config import PASS_CRITERION_ALL_PASS, PASS_CRITERION_ANY_PASS, LOWER_IS_BETTER_METRICS
+
+# Decision layer: turns raw metric scores into Pass/Fail strings and the overall verdict.
+# It never calls a metric, so thresholds and the pass criterion can be changed and re-applied
+# to stored scores (see Evaluator.apply_decisions) without re-running any model.
+
+# Overall result of a short-circuited row whose verdict, under the current thresholds and pass
+# criterion, depends on a metric that was skipped; only re-running that metric can decide it.
+NEEDS_RE_EVALUATION = 'Needs Re-evaluation'
+
+
+def decide_statuses(metric_names: list, score_matrix: np.ndarray, error_matrix: np.ndarray, thresholds: dict,
+                    skipped_matrix: np.ndarray = None):
+    """
+    Decides every metric/row status in one vectorized pass.
+
+    Args:
+        metric_names (list): Metric names, one per column of score_matrix.
+        score_matrix (np.ndarray): Float (rows x metrics) raw scores, NaN where no score was produced.
+        error_matrix (np.ndarray): Bool (rows x metrics), True where the metric raised for that row.
+        thresholds (dict): Metric name -> threshold. Metrics without a threshold get 'N/A (No Threshold)'.
+        skipped_matrix (np.ndarray, optional): Bool (rows x metrics), True where short-circuit evaluation
+            did not run the metric. Such cells are 'Skipped' and count as neither pass nor error.
+
+    Returns:
+        tuple: (object status matrix, pass mask, error mask, no-threshold mask), all (rows x metrics).
+    """
+    has_score = ~np.isnan(score_matrix) & ~error_matrix
+    threshold_row = np.array([np.nan if thresholds.get(m) is None else float(thresholds[m]) for m in metric_names])
+    has_threshold = ~np.isnan(threshold_row)
+    is_safety = np.array([m == "Safety" for m in metric_names])
+    is_lower_better = np.array([m in LOWER_IS_BETTER_METRICS for m in metric_names])
+
+    with np.errstate(invalid='ignore'):
+        # Safety is binary and must equal its threshold; lower-is-better metrics (e.g. Latency) pass
+        # at or below it; every other metric passes at or above it.
+        passed = np.where(is_safety, score_matrix == threshold_row,
+                          np.where(is_lower_better, score_matrix <= threshold_row, score_matrix >= threshold_row))
+    is_pass = has_score & has_threshold & passed
+    no_threshold = has_score & ~has_threshold
+
+    statuses = np.full(score_matrix.shape, 'Error (No Score)', dtype=object)
+    statuses[has_score & has_threshold] = 'Fail'
+    statuses[is_pass] = 'Pass'
+    statuses[no_threshold] = 'N/A (No Threshold)'
+    statuses[error_matrix] = 'Error (Calculation)'
+    is_error = ~has_score
+    if skipped_matrix is not None:
+        statuses[skipped_matrix] = 'Skipped'
+        is_error &= ~skipped_matrix
+    return statuses, is_pass, is_error, no_threshold
+
+
+def decided_rows(pass_matrix: np.ndarray, skipped_matrix: np.ndarray, overall_pass_criterion: str) -> np.ndarray:
+    """
+    Rows whose overall verdict can no longer become "Pass" (ALL_PASS: some metric that ran did not
+    pass) or is already "Pass" (ANY_PASS: some metric passed). Short-circuit evaluation skips
+    the remaining metrics for these rows.
+    """
+    if overall_pass_criterion == PASS_CRITERION_ALL_PASS:
+        return (~pass_matrix & ~skipped_matrix).any(axis=1)
+    if overall_pass_criterion == PASS_CRITERION_ANY_PASS:
+        return pass_matrix.any(axis=1)
+    return np.zeros(pass_matrix.shape[0], dtype=bool)
+
+
+def undecided_skipped_rows(pass_matrix: np.ndarray, skipped_matrix: np.ndarray, overall_pass_criterion: str) -> np.ndarray:
+    """
+    Rows with skipped metrics that the metrics which did run no longer decide, e.g. under
+    ALL_PASS after a threshold was loosened so the metric that failed now passes. Always empty
+    for decisions made under the settings the run was short-circuited with.
+    """
+    return skipped_matrix.any(axis=1) & ~decided_rows(pass_matrix, skipped_matrix, overall_pass_criterion)
+
+
+def decide_overall_results(pass_matrix: np.ndarray, error_matrix: np.ndarray,
+                           no_threshold_matrix: np.ndarray, overall_pass_criterion: str) -> np.ndarray:
+    """Combines per-metric (rows x metrics) status masks into the "Automated Overall Result" column."""
+    overall = np.full(pass_matrix.shape[0], 'N/A', dtype=object)
+    if overall_pass_criterion == PASS_CRITERION_ALL_PASS:
+        overall[:] = 'Fail'
+        overall[error_matrix.any(axis=1)] = 'Error'
+        overall[pass_matrix.all(axis=1)] = 'Pass'
+    elif overall_pass_criterion == PASS_CRITERION_ANY_PASS:
+        overall[:] = 'Fail'
+        overall[(error_matrix | no_threshold_matrix).all(axis=1)] = 'Error'
+        overall[pass_matrix.any(axis=1)] = 'Pass'
+    return overall
@@ -1,150 +1,392 @@
 # llm_eval_package/core/engine.py
 import pandas as pd
 import numpy as np
-import streamlit as st
-import os
-from tqdm import tqdm
-import traceback
-
-from llm_eval_package.metrics.fluency_similarity import SemanticSimilarityMetric
-from llm_eval_package.metrics.completeness import CompletenessMetric
-from llm_eval_package.metrics.conciseness import ConcisenessMetric
-from llm_eval_package.metrics.trust_factuality import TrustFactualityMetric
-from llm_eval_package.metrics.safety import SafetyMetric
-from llm_eval_package.metrics.fact_adherence import FactAdherenceMetric
+import time
+import warnings
 
 from llm_eval_package.config import (
     METRIC_THRESHOLDS, AVAILABLE_METRICS,
-    SENTENCE_BERT_MODEL_PATH, MODEL_DIR, SENTENCE_BERT_MODEL,
-    PASS_CRITERION_ALL_PASS, PASS_CRITERION_ANY_PASS, DEFAULT_PASS_CRITERION
+    PASS_CRITERION_ALL_PASS, PASS_CRITERION_ANY_PASS, DEFAULT_PASS_CRITERION,
+    EVALUATION_EXECUTOR, EVALUATION_WORKERS, PROCESS_POOL_MIN_ROWS, PROCESS_POOL_MIN_CHUNK_ROWS
 )
-from llm_eval_package.utils import ModelDownloader
-
-
-@st.cache_resource
-def _get_cached_metric_instances_internal():
-    metrics_instances = {}
-    model_downloader = ModelDownloader()
-    
-    if "Semantic Similarity" in AVAILABLE_METRICS:
-        if not os.path.exists(SENTENCE_BERT_MODEL_PATH) or not os.listdir(SENTENCE_BERT_MODEL_PATH):
-            msg_download = f"Semantic Similarity model ('{SENTENCE_BERT_MODEL}') not found. Downloading..."
-            try: st.info(msg_download)
-            except: print(msg_download)
-            downloaded_path = model_downloader.download_and_save_model(SENTENCE_BERT_MODEL, MODEL_DIR)
-            if not downloaded_path: raise Exception(f"Failed to download model '{SENTENCE_BERT_MODEL}'.")
-            else: 
-                msg_success = f"Model '{SENTENCE_BERT_MODEL}' downloaded!"
-                try: st.success(msg_success)
-                except: print(msg_success)
-    
-    metric_class_map = {
-        "SemanticSimilarityMetric": SemanticSimilarityMetric, "CompletenessMetric": CompletenessMetric,
-        "ConcisenessMetric": ConcisenessMetric, "TrustFactualityMetric": TrustFactualityMetric,
-        "SafetyMetric": SafetyMetric, "FactAdherenceMetric": FactAdherenceMetric,
-    }
-    for metric_name, class_name_str in AVAILABLE_METRICS.items():
-        try:
-            MetricClass = metric_class_map.get(class_name_str)
-            if MetricClass:
-                metrics_instances[metric_name] = MetricClass(SENTENCE_BERT_MODEL_PATH) if metric_name == "Semantic Similarity" else MetricClass()
-        except Exception as e:
-            print(f"ERROR initializing metric {metric_name}: {e}")
-    return metrics_instances
+from llm_eval_package.core.registry import get_metric_registry
+from llm_eval_package.core.progress import ProgressSink, get_default_sink
+from llm_eval_package.core.decision import (
+    decide_statuses, decide_overall_results, decided_rows, undecided_skipped_rows, NEEDS_RE_EVALUATION
+)
+from llm_eval_package.core.executor import (
+    score_metric_inputs, ProcessMetricExecutor, EXECUTOR_SERIAL, EXECUTOR_PROCESS
+)
+from llm_eval_package.metrics.text_artifacts import build_text_artifacts
+
+
+# Columns every metric receives; extracted from the DataFrame once per evaluation run.
+TEXT_INPUT_FIELDS = ('query', 'llm_output', 'reference_answer')
+AUTOMATED_OVERALL_COL = "Automated Overall Result"
+# How the per-row path read a missing cell: pandas turned None/null into NaN and str() gave 'nan'.
+MISSING_TEXT = 'nan'
+
+
+def _decision_columns(run, selected_metrics: list, thresholds: dict, overall_pass_criterion: str) -> dict:
+    """Builds the Pass/Fail and overall result columns from a run's raw scores in one NumPy pass."""
+    scored_metrics = [m for m in selected_metrics if m in run.scores]
+    score_matrix = np.column_stack([run.scores[m] for m in scored_metrics]) if scored_metrics else np.empty((run.num_rows, 0))
+    error_matrix = np.column_stack([run.calc_errors[m] for m in scored_metrics]) if scored_metrics else np.empty((run.num_rows, 0), dtype=bool)
+    skipped_matrix = np.column_stack([run.skipped[m] for m in scored_metrics]) if scored_metrics else np.empty((run.num_rows, 0), dtype=bool)
+    statuses, is_pass, is_error, no_threshold = decide_statuses(scored_metrics, score_matrix, error_matrix, thresholds, skipped_matrix)
+    needs_re_evaluation = undecided_skipped_rows(is_pass, skipped_matrix, overall_pass_criterion)
+
+    columns = {f'{m} Pass/Fail': statuses[:, j] for j, m in enumerate(scored_metrics)}
+    # Metrics that were selected but could not be initialized count as errors for the overall result.
+    missing_count = len(selected_metrics) - len(scored_metrics)
+    if missing_count:
+        is_pass = np.hstack([is_pass, np.zeros((run.num_rows, missing_count), dtype=bool)])
+        is_error = np.hstack([is_error, np.ones((run.num_rows, missing_count), dtype=bool)])
+        no_threshold = np.hstack([no_threshold, np.zeros((run.num_rows, missing_count), dtype=bool)])
+    columns[AUTOMATED_OVERALL_COL] = decide_overall_results(is_pass, is_error, no_threshold, overall_pass_criterion)
+    columns[AUTOMATED_OVERALL_COL][needs_re_evaluation] = NEEDS_RE_EVALUATION
+    return columns
+
+
+def _text_column(values: pd.Series) -> list:
+    """str() of every cell, with missing cells (None, NaN, pd.NA) read as MISSING_TEXT whatever the column dtype."""
+    missing = values.isna().to_numpy()
+    return [MISSING_TEXT if is_missing else str(v) for v, is_missing in zip(values, missing)]
+
+
+def _row_fingerprints(column_inputs: dict, fields) -> np.ndarray:
+    """64-bit content hash of each row's values for the given input fields."""
+    return pd.util.hash_pandas_object(
+        pd.DataFrame({f: column_inputs[f] for f in sorted(fields)}), index=False
+    ).to_numpy()
+
+
+def _metric_config_key(metric_instance, metric_kwargs: dict) -> str:
+    """Identifies everything besides the row inputs that can change a metric's scores."""
+    return f"{type(metric_instance).__name__}|{metric_instance.get_config_fingerprint()}|{sorted(metric_kwargs.items())!r}"
+
+
+class EvaluationRun:
+    """
+    Raw per-metric scores of one evaluate_dataframe() call, kept apart from the Pass/Fail decisions.
+
+    Each metric's scores (and detail columns) are stored next to a content fingerprint of the row
+    inputs the metric read and a key of the metric's configuration, so a later run over edited
+    data can reuse every score whose inputs and configuration are unchanged.
+    """
+
+    def __init__(self, num_rows: int = 0):
+        self.num_rows = num_rows
+        self.row_keys = {}
+        self.scores = {}
+        self.calc_errors = {}
+        self.skipped = {}
+        self.config_keys = {}
+        self.details = {}
+
+    def add_metric(self, metric_name: str, config_key: str, row_keys: np.ndarray,
+                   scores: np.ndarray, calc_errors: np.ndarray, skipped: np.ndarray = None, details: dict = None):
+        self.config_keys[metric_name] = config_key
+        self.details[metric_name] = details or {}
+        self.row_keys[metric_name] = row_keys
+        self.scores[metric_name] = scores
+        self.calc_errors[metric_name] = calc_errors
+        self.skipped[metric_name] = skipped if skipped is not None else np.zeros(len(scores), dtype=bool)
+
+    def match_rows(self, metric_name: str, config_key: str, row_keys: np.ndarray) -> np.ndarray:
+        """
+        Finds reusable previous scores for the given rows.
+
+        Returns:
+            np.ndarray: For each row, the position of a previous row with the same inputs and metric
+                        configuration whose score can be reused, or -1 if it must be recomputed.
+        """
+        if self.config_keys.get(metric_name) != config_key:
+            return np.full(row_keys.shape[0], -1)
+        # Rows that errored or were skipped last time are computed rather than reused.
+        usable_positions = np.flatnonzero(~self.calc_errors[metric_name] & ~self.skipped[metric_name])
+        if not usable_positions.size:
+            return np.full(row_keys.shape[0], -1)
+        previous_keys = pd.Index(self.row_keys[metric_name][usable_positions])
+        first_occurrence = ~previous_keys.duplicated()
+        matches = previous_keys[first_occurrence].get_indexer(row_keys)
+        return np.where(matches >= 0, usable_positions[first_occurrence][np.maximum(matches, 0)], -1)
+
+
+def format_run_summary(summary: dict) -> str:
+    """Renders Evaluator.last_run_summary as a short multi-line text for the CLI and the UI."""
+    if not summary:
+        return "No evaluation has been run yet."
+    lines = [f"Evaluated {summary['rows']} rows with {len(summary['metrics'])} metric(s) in {summary['elapsed_seconds']:.2f}s."]
+    reused = sum(summary.get("reused_rows", {}).values())
+    skipped = sum(summary.get("skipped_rows", {}).values())
+    if skipped:
+        total = summary['rows'] * len(summary['metrics'])
+        lines.append(f"Short-circuit: skipped {skipped} of {total} row scores whose overall result was already decided.")
+    if reused:
+        total = summary['rows'] * len(summary['metrics'])
+        lines.append(f"Incremental: reused {reused} of {total} row scores from the previous run.")
+    dedup = summary.get("dedup", {})
+    scored_rows = sum(d["rows"] for d in dedup.values())
+    unique_inputs = sum(d["unique"] for d in dedup.values())
+    if unique_inputs and unique_inputs < scored_rows:
+        lines.append(f"Dedup: {scored_rows} row scores computed from {unique_inputs} unique inputs "
+                     f"(dedup ratio {scored_rows / unique_inputs:.2f}x).")
+    text_artifacts = summary.get("text_artifacts", {})
+    if text_artifacts.get("artifacts"):
+        lines.append(f"Text preprocessing: {text_artifacts['unique_texts']} unique texts processed once into "
+                     f"{text_artifacts['artifacts']} shared artifact columns for {text_artifacts['metrics']} lexical metrics.")
+    for metric_name, stats in summary.get("metric_stats", {}).items():
+        hits, misses = stats.get("embedding_cache_hits", 0), stats.get("embedding_cache_misses", 0)
+        if hits or misses:
+            lines.append(f"{metric_name}: embedding cache {hits} hits / {misses} misses "
+                         f"({hits / (hits + misses):.1%} hit rate).")
+        hits, misses = stats.get("token_cache_hits", 0), stats.get("token_cache_misses", 0)
+        if hits or misses:
+            lines.append(f"{metric_name}: lemmatized-text cache {hits} hits / {misses} misses "
+                         f"({hits / (hits + misses):.1%} hit rate).")
+    return "\n".join(lines)
+
 
 class Evaluator:
-    def __init__(self):
-        try:
-            self.metrics_instances = _get_cached_metric_instances_internal()
-            # if self.metrics_instances:
-            #     try: st.toast("Page updated!", icon="🔬")
-            #     except: pass
-        except Exception as e:
-            try: st.error(f"CRITICAL ERROR loading metric models: {e}. Evaluation unavailable.")
-            except: print(f"CRITICAL ERROR loading metric models: {e}")
-            self.metrics_instances = {}
+    def __init__(self, executor: str = EVALUATION_EXECUTOR, workers: int = EVALUATION_WORKERS,
+                 progress_sink: ProgressSink = None):
+        """
+        Args:
+            executor (str): "serial" to score everything in this process, or "process" to score
+                            CPU-bound metrics across a pool of `workers` processes.
+            workers (int, optional): Pool size for executor="process"; defaults to os.cpu_count().
+            progress_sink (ProgressSink, optional): Where progress and messages go; defaults to
+                            core.progress.get_default_sink() at evaluation time.
+        """
+        if executor not in (EXECUTOR_SERIAL, EXECUTOR_PROCESS):
+            raise ValueError(f"Unknown executor '{executor}'. Use '{EXECUTOR_SERIAL}' or '{EXECUTOR_PROCESS}'.")
+        self.executor = executor
+        self.workers = workers
+        self._process_executor = None
+        self.progress_sink = progress_sink
+        # Metrics (and their models) are loaded on first use and shared by every Evaluator in the process.
+        self.metrics_instances = get_metric_registry()
+        self.last_run_summary = {}
+        self.last_run = None
 
     def evaluate_dataframe(self, df: pd.DataFrame, selected_metrics: list,
                            custom_thresholds: dict = None,
                            sensitive_keywords: list = None,
-                           overall_pass_criterion: str = DEFAULT_PASS_CRITERION
+                           overall_pass_criterion: str = DEFAULT_PASS_CRITERION,
+                           previous_run: EvaluationRun = None,
+                           short_circuit: bool = False
                            ) -> pd.DataFrame:
+        """
+        Scores every row of df with the selected metrics and adds Score, Pass/Fail and
+        "Automated Overall Result" columns.
+
+        If previous_run (normally an earlier Evaluator.last_run) is given, rows whose inputs and
+        metric configuration are unchanged reuse their previous scores and only new or edited
+        rows are recomputed. Rows with identical metric inputs are scored once per metric.
+        The raw scores of this call are kept in self.last_run.
+
+        With short_circuit=True, metrics run cheapest-first (BaseMetric.cost) and rows whose overall
+        result is already decided by overall_pass_criterion skip the remaining metrics; those cells
+        are marked 'Skipped'. The overall result then reflects only the metrics that ran, so a
+        skipped metric that would have errored does not turn a "Fail" into an "Error".
+        """
         if df.empty: return df.copy()
         if not selected_metrics: return df.copy()
         if not self.metrics_instances: return df.copy()
 
+        run_started = time.perf_counter()
         current_thresholds = custom_thresholds if custom_thresholds is not None else METRIC_THRESHOLDS.copy()
-        df_copy = df.copy()
+        num_rows = df.shape[0]
+        active_metrics = [m for m in selected_metrics if m in self.metrics_instances]
+
+        # Extract every input column once, as plain Python strings (same coercion as the old per-row path).
+        needed_fields = set(TEXT_INPUT_FIELDS)
+        for metric_name in active_metrics:
+            needed_fields.update(self.metrics_instances[metric_name].input_fields)
+        column_inputs = {
+            field: _text_column(df[field]) if field in df.columns else [''] * num_rows
+            for field in needed_fields
+        }
+        run_kwargs = {"Safety": {'sensitive_keywords': sensitive_keywords}}
+
+        # Shared preprocessing: normalized text, word lists/sets, tokens and the reference coverage
+        # are built per metric for just the rows it scores (after reuse, short-circuit skips and
+        # dedup), memoized per unique text for the run so the lexical metrics share one build.
+        artifact_memo, artifact_names, artifact_metrics = {}, set(), 0
+        artifact_stats = {"unique_texts": 0, "artifacts": 0, "metrics": 0}
+
+        scoring_order = sorted(active_metrics, key=lambda m: self.metrics_instances[m].cost) if short_circuit else active_metrics
+        progress = self.progress_sink or get_default_sink()
+        progress.start(len(scoring_order), "Evaluating metrics")
+
+        run = EvaluationRun(num_rows)
+        metric_stats, reused_rows, dedup_stats, skipped_rows = {}, {}, {}, {}
+        decided = np.zeros(num_rows, dtype=bool)
+        for metric_position, metric_name in enumerate(scoring_order):
+            progress.advance(metric_position, f"Scoring {metric_name} for {num_rows} test cases...")
 
-        for metric_name in selected_metrics:
-            if metric_name in self.metrics_instances:
-                df_copy[f'{metric_name} Score'] = pd.NA
-                df_copy[f'{metric_name} Pass/Fail'] = 'N/A'
-        
-        # RENAMED this column for clarity
-        automated_overall_col_name = "Automated Overall Result" 
-        df_copy[automated_overall_col_name] = 'N/A'
+            metric_instance = self.metrics_instances[metric_name]
+            metric_kwargs = run_kwargs.get(metric_name, {})
+            row_keys = _row_fingerprints(column_inputs, metric_instance.input_fields)
+            config_key = _metric_config_key(metric_instance, metric_kwargs)
 
-        is_streamlit_context = False
-        try: st.get_option("server.headless"); is_streamlit_context = True
-        except: pass
+            scores = np.full(num_rows, np.nan)
+            calc_errors = np.zeros(num_rows, dtype=bool)
+            details = {suffix: np.full(num_rows, '', dtype=object) for suffix in metric_instance.detail_columns}
+            rows_to_compute = np.arange(num_rows)
+            if previous_run is not None:
+                previous_positions = previous_run.match_rows(metric_name, config_key, row_keys)
+                reusable = previous_positions >= 0
+                scores[reusable] = previous_run.scores[metric_name][previous_positions[reusable]]
+                for suffix, previous_details in previous_run.details.get(metric_name, {}).items():
+                    if suffix in details: details[suffix][reusable] = previous_details[previous_positions[reusable]]
+                rows_to_compute = np.flatnonzero(~reusable)
+                reused_rows[metric_name] = int(reusable.sum())
+            skipped = np.zeros(num_rows, dtype=bool)
+            if short_circuit and decided.any():
+                skipped[rows_to_compute] = decided[rows_to_compute]
+                rows_to_compute = rows_to_compute[~decided[rows_to_compute]]
+                skipped_rows[metric_name] = int(skipped.sum())
 
-        iterable_rows = tqdm(df_copy.iterrows(), total=df_copy.shape[0], desc="Evaluating test cases") if not is_streamlit_context else df_copy.iterrows()
-        progress_bar = st.progress(0, text="Initializing evaluation...") if is_streamlit_context else None
+            stats_before = metric_instance.get_stats()
+            if rows_to_compute.size:
+                # Identical inputs (e.g. the same case under several test_config labels) are scored once
+                # and the result is broadcast back to every matching row.
+                input_codes, _ = pd.factorize(row_keys[rows_to_compute])
+                _, first_positions = np.unique(input_codes, return_index=True)
+                unique_rows = rows_to_compute[first_positions]
+                metric_inputs = column_inputs if unique_rows.size == num_rows else \
+                    {f: [values[i] for i in unique_rows] for f, values in column_inputs.items()}
+                if metric_instance.text_artifacts:
+                    artifact_columns, built = build_text_artifacts(metric_inputs, metric_instance.text_artifacts, artifact_memo)
+                    metric_inputs = {**metric_inputs, **artifact_columns}
+                    artifact_names.update(artifact_columns)
+                    artifact_metrics += 1
+                    artifact_stats = {"unique_texts": built["unique_texts"], "artifacts": len(artifact_names),
+                                      "metrics": artifact_metrics}
+                unique_scores, unique_errors, unique_details = self._score_column(metric_instance, metric_inputs, metric_kwargs)
+                scores[rows_to_compute] = unique_scores[input_codes]
+                calc_errors[rows_to_compute] = unique_errors[input_codes]
+                for suffix, values in unique_details.items():
+                    if suffix in details: details[suffix][rows_to_compute] = values[input_codes]
+                dedup_stats[metric_name] = {"rows": int(rows_to_compute.size), "unique": int(unique_rows.size)}
+            stats_after = metric_instance.get_stats()
+            run.add_metric(metric_name, config_key, row_keys, scores, calc_errors, skipped, details)
+            if short_circuit:
+                _, is_pass, _, _ = decide_statuses(
+                    [metric_name], scores[:, None], calc_errors[:, None], current_thresholds, skipped[:, None]
+                )
+                decided |= decided_rows(is_pass, skipped[:, None], overall_pass_criterion)
+            if stats_after:
+                metric_stats[metric_name] = {k: v - stats_before.get(k, 0) for k, v in stats_after.items()}
 
-        for i, row in iterable_rows:
-            if progress_bar:
-                progress_bar.progress((i + 1) / df_copy.shape[0], text=f"Processing test case {i+1}/{df_copy.shape[0]}...")
+        decision_columns = _decision_columns(run, selected_metrics, current_thresholds, overall_pass_criterion)
+        new_columns = {}
+        for metric_name in active_metrics:
+            rounded_scores = np.round(run.scores[metric_name], 4)
+            if run.calc_errors[metric_name].any() or run.skipped[metric_name].any():
+                rounded_scores = rounded_scores.astype(object)
+                rounded_scores[run.calc_errors[metric_name]] = 'Calc Error'
+                rounded_scores[run.skipped[metric_name]] = 'Skipped'
+            new_columns[f'{metric_name} Score'] = rounded_scores
+            new_columns[f'{metric_name} Pass/Fail'] = decision_columns[f'{metric_name} Pass/Fail']
+            for suffix, values in run.details[metric_name].items():
+                values = values.copy()
+                values[run.skipped[metric_name]] = 'Skipped'
+                new_columns[f'{metric_name} {suffix}'] = values
+        new_columns[AUTOMATED_OVERALL_COL] = decision_columns[AUTOMATED_OVERALL_COL]
+        df_evaluated = df.assign(**new_columns)
 
-            query, llm_output, ref_answer, req_facts = str(row.get('query','')), str(row.get('llm_output','')), str(row.get('reference_answer','')), str(row.get('required_facts',''))
-            row_metric_statuses = {}
+        self.last_run_summary = {
+            "rows": num_rows,
+            "metrics": active_metrics,
+            "elapsed_seconds": round(time.perf_counter() - run_started, 3),
+            "metric_stats": metric_stats,
+            "reused_rows": reused_rows,
+            "dedup": dedup_stats,
+            "skipped_rows": skipped_rows,
+            "text_artifacts": artifact_stats,
+        }
+        self.last_run = run
 
+        progress.finish("Evaluation process completed!")
+        return df_evaluated
+
+    def apply_decisions(self, df_evaluated: pd.DataFrame, selected_metrics: list,
+                        custom_thresholds: dict = None,
+                        overall_pass_criterion: str = DEFAULT_PASS_CRITERION,
+                        run: EvaluationRun = None) -> pd.DataFrame:
+        """
+        Re-applies thresholds and the overall pass criterion to already computed scores,
+        without running any metric. Only the Pass/Fail and "Automated Overall Result" columns change.
+
+        For a short-circuited run, rows whose verdict now depends on a skipped metric get the
+        overall result 'Needs Re-evaluation' (with a warning) instead of being decided as if the
+        skipped metric had failed; evaluate_dataframe(..., previous_run=run) computes just those cells.
+
+        Args:
+            df_evaluated (pd.DataFrame): A DataFrame previously returned by evaluate_dataframe().
+            selected_metrics (list): The metrics that were evaluated.
+            custom_thresholds (dict, optional): New thresholds; defaults to METRIC_THRESHOLDS.
+            overall_pass_criterion (str): PASS_CRITERION_ALL_PASS or PASS_CRITERION_ANY_PASS.
+            run (EvaluationRun, optional): The run that produced df_evaluated (e.g. self.last_run).
+                Its unrounded scores are used when given; otherwise scores are read back from
+                the "<metric> Score" columns.
+
+        Returns:
+            pd.DataFrame: A copy of df_evaluated with the decision columns recomputed.
+        """
+        if df_evaluated.empty or not selected_metrics: return df_evaluated.copy()
+        current_thresholds = custom_thresholds if custom_thresholds is not None else METRIC_THRESHOLDS.copy()
+        if run is None or run.num_rows != df_evaluated.shape[0]:
+            run = EvaluationRun(df_evaluated.shape[0])
             for metric_name in selected_metrics:
-                if metric_name not in self.metrics_instances:
-                    row_metric_statuses[metric_name] = 'Error (Not Initialized)'
-                    continue
-                
-                metric_instance, score, individual_status = self.metrics_instances[metric_name], pd.NA, 'Error (Calculation)'
-                try:
-                    kwargs = {'llm_output': llm_output, 'reference_answer': ref_answer, 'query': query}
-                    if metric_name == "Safety": kwargs['sensitive_keywords'] = sensitive_keywords
-                    elif metric_name == "Fact Adherence": kwargs['required_facts'] = req_facts
-                    
-                    score_val = metric_instance.compute(**kwargs)
-                    if not pd.isna(score_val):
-                        score = float(score_val)
-                        df_copy.loc[i, f'{metric_name} Score'] = round(score, 4)
-                        threshold = current_thresholds.get(metric_name)
-                        if threshold is not None:
-                            individual_status = 'Pass' if (metric_name == "Safety" and score == threshold) or \
-                                                        (metric_name != "Safety" and score >= threshold) else 'Fail'
-                        else: individual_status = 'N/A (No Threshold)'
-                    else: individual_status = 'Error (No Score)'
-                except Exception as e:
-                    print(f"ERROR evaluating {metric_name} for row {i}: {e}\n{traceback.format_exc()}")
-                    df_copy.loc[i, f'{metric_name} Score'] = 'Calc Error'
-                
-                df_copy.loc[i, f'{metric_name} Pass/Fail'] = individual_status
-                row_metric_statuses[metric_name] = individual_status
-
-            # Calculate Automated Overall Result
-            if selected_metrics:
-                relevant_statuses = [s for m, s in row_metric_statuses.items() if m in selected_metrics]
-                if not relevant_statuses: df_copy.loc[i, automated_overall_col_name] = 'Error (No Metrics Run)'
-                elif overall_pass_criterion == PASS_CRITERION_ALL_PASS:
-                    if all(s == 'Pass' for s in relevant_statuses): df_copy.loc[i, automated_overall_col_name] = 'Pass'
-                    elif any(s.startswith('Error') for s in relevant_statuses): df_copy.loc[i, automated_overall_col_name] = 'Error'
-                    else: df_copy.loc[i, automated_overall_col_name] = 'Fail'
-                elif overall_pass_criterion == PASS_CRITERION_ANY_PASS:
-                    if any(s == 'Pass' for s in relevant_statuses): df_copy.loc[i, automated_overall_col_name] = 'Pass'
-                    elif all(s.startswith('Error') or s == 'N/A (No Threshold)' for s in relevant_statuses): df_copy.loc[i, automated_overall_col_name] = 'Error'
-                    else: df_copy.loc[i, automated_overall_col_name] = 'Fail'
-            else: df_copy.loc[i, automated_overall_col_name] = 'N/A (No Metrics Selected)'
-
-        if progress_bar: progress_bar.empty()
-        try: st.success("Evaluation process completed!")
-        except: print("Evaluation process completed!")
-        return df_copy
+                score_col = f'{metric_name} Score'
+                if score_col not in df_evaluated.columns: continue
+                raw_scores = df_evaluated[score_col]
+                run.scores[metric_name] = pd.to_numeric(raw_scores, errors='coerce').to_numpy(dtype=float)
+                run.calc_errors[metric_name] = (raw_scores == 'Calc Error').to_numpy(dtype=bool)
+                run.skipped[metric_name] = (raw_scores == 'Skipped').to_numpy(dtype=bool)
+        decision_columns = _decision_columns(run, selected_metrics, current_thresholds, overall_pass_criterion)
+        needs_re_evaluation = int((decision_columns[AUTOMATED_OVERALL_COL] == NEEDS_RE_EVALUATION).sum())
+        if needs_re_evaluation:
+            warnings.warn(f"{needs_re_evaluation} row(s) were short-circuited under different settings and now depend on "
+                          f"skipped metrics; re-run the evaluation with previous_run to score them.")
+        return df_evaluated.assign(**decision_columns)
+
+    def _score_column(self, metric_instance, column_inputs: dict, metric_kwargs: dict):
+        """
+        Scores one metric over the given column inputs. CPU-bound metrics go to the process pool
+        when executor="process"; if the pool cannot be used, the Evaluator switches to serial
+        execution for the rest of its life.
+
+        Returns:
+            tuple: (float scores array with NaN for missing scores, bool array marking calculation errors,
+                    dict of detail-column suffix -> object array)
+        """
+        num_rows = len(column_inputs['llm_output'])
+        if self.executor == EXECUTOR_PROCESS and metric_instance.cpu_bound and num_rows >= PROCESS_POOL_MIN_ROWS:
+            try:
+                process_executor = self._get_process_executor()
+                fields = [f for f in TEXT_INPUT_FIELDS + metric_instance.row_argument_names() if f in column_inputs]
+                return process_executor.score(metric_instance.name, {f: column_inputs[f] for f in fields}, metric_kwargs)
+            except Exception as e:
+                print(f"WARNING: Process pool unavailable ({e}); falling back to serial execution.")
+                self.close()
+                self.executor = EXECUTOR_SERIAL
+        return score_metric_inputs(metric_instance, column_inputs, metric_kwargs)
+
+    def _get_process_executor(self) -> ProcessMetricExecutor:
+        if self._process_executor is None:
+            self._process_executor = ProcessMetricExecutor(self.workers, PROCESS_POOL_MIN_CHUNK_ROWS)
+        return self._process_executor
+
+    def close(self):
+        """Shuts down the worker pool, if one was started."""
+        if self._process_executor is not None:
+            self._process_executor.shutdown()
+            self._process_executor = None
 
     def get_available_metrics(self) -> list: return list(AVAILABLE_METRICS.keys())
     def get_metric_thresholds(self) -> dict: return METRIC_THRESHOLDS.copy()
\ No newline at end of file
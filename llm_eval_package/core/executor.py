@@ -0,0 +1,121 @@
+# llm_eval_package/core/executor.py
+import os
+import traceback
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Row-chunked process-pool execution for CPU-bound metrics (BaseMetric.cpu_bound = True).
+# Each worker keeps its own MetricRegistry, so a metric is built once per worker on its first
+# chunk and reused for every later chunk; chunks are merged back in submission order, so the
+# output is identical to a serial run.
+
+EXECUTOR_SERIAL = "serial"
+EXECUTOR_PROCESS = "process"
+
+_WORKER_METRICS = None
+
+
+def score_metric_inputs(metric_instance, column_inputs: dict, metric_kwargs: dict):
+    """
+    Scores one metric over the given column inputs. Tries the metric's compute_batch_details() first;
+    if that raises, falls back to scoring row by row so a single bad row only errors that row.
+
+    Returns:
+        tuple: (float scores array with NaN for missing scores, bool array marking calculation errors,
+                dict of detail-column suffix -> object array, '' for rows that errored)
+    """
+    num_rows = len(column_inputs['llm_output'])
+    # Text artifacts are optional: a metric computes any that were not built for it.
+    extra_fields = {f: column_inputs[f] for f in metric_instance.row_argument_names() if f in column_inputs}
+    details = {suffix: np.full(num_rows, '', dtype=object) for suffix in metric_instance.detail_columns}
+    try:
+        scores, batch_details = metric_instance.compute_batch_details(
+            column_inputs['llm_output'], column_inputs['reference_answer'], column_inputs['query'],
+            **extra_fields, **metric_kwargs
+        )
+        for suffix, values in details.items():
+            if suffix in batch_details: values[:] = batch_details[suffix]
+        return np.asarray(scores, dtype=float), np.zeros(num_rows, dtype=bool), details
+    except Exception as e:
+        print(f"WARNING: Column scoring failed for {metric_instance.name}, falling back to per-row scoring: {e}")
+
+    scores = np.full(num_rows, np.nan)
+    calc_errors = np.zeros(num_rows, dtype=bool)
+    for pos in range(num_rows):
+        try:
+            if details:
+                # A one-row batch, so the row keeps its details.
+                row_scores, row_details = metric_instance.compute_batch_details(
+                    [column_inputs['llm_output'][pos]], [column_inputs['reference_answer'][pos]], [column_inputs['query'][pos]],
+                    **{f: values[pos:pos + 1] for f, values in extra_fields.items()}, **metric_kwargs
+                )
+                score_val = row_scores[0]
+                for suffix, values in details.items():
+                    if suffix in row_details: values[pos] = row_details[suffix][0]
+            else:
+                score_val = metric_instance.compute(
+                    llm_output=column_inputs['llm_output'][pos], reference_answer=column_inputs['reference_answer'][pos],
+                    query=column_inputs['query'][pos], **{f: values[pos] for f, values in extra_fields.items()}, **metric_kwargs
+                )
+            scores[pos] = np.nan if pd.isna(score_val) else float(score_val)
+        except Exception as e:
+            print(f"ERROR evaluating {metric_instance.name} for row {pos}: {e}\n{traceback.format_exc()}")
+            calc_errors[pos] = True
+    return scores, calc_errors, details
+
+
+def _init_worker():
+    """Pool initializer: gives each worker process its own lazily populated metric registry."""
+    global _WORKER_METRICS
+    from llm_eval_package.core.registry import MetricRegistry
+    _WORKER_METRICS = MetricRegistry()
+
+
+def _score_chunk(metric_name: str, column_inputs: dict, metric_kwargs: dict):
+    if metric_name not in _WORKER_METRICS:
+        raise RuntimeError(f"Metric '{metric_name}' is not available in worker {os.getpid()}.")
+    metric_instance = _WORKER_METRICS[metric_name]
+    return score_metric_inputs(metric_instance, column_inputs, metric_kwargs)
+
+
+class ProcessMetricExecutor:
+    """
+    Scores CPU-bound metrics in a pool of worker processes, split into row chunks.
+    """
+
+    def __init__(self, workers: int = None, min_chunk_rows: int = 64):
+        """
+        Starts the worker pool.
+
+        Args:
+            workers (int, optional): Number of worker processes; defaults to os.cpu_count().
+            min_chunk_rows (int): Lower bound on rows per chunk, so tiny chunks don't drown in IPC overhead.
+        """
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.min_chunk_rows = max(1, int(min_chunk_rows))
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def score(self, metric_name: str, column_inputs: dict, metric_kwargs: dict):
+        """
+        Scores one metric over all rows of column_inputs across the pool.
+
+        Returns:
+            tuple: (float scores array, bool calc-error array, dict of detail arrays), in the original row order.
+        """
+        num_rows = len(column_inputs['llm_output'])
+        # A few chunks per worker keeps the pool busy when some chunks are slower than others.
+        num_chunks = max(1, min(self.workers * 4, num_rows // self.min_chunk_rows))
+        bounds = np.linspace(0, num_rows, num_chunks + 1, dtype=int)
+        futures = [
+            self._pool.submit(_score_chunk, metric_name, {f: values[start:end] for f, values in column_inputs.items()}, metric_kwargs)
+            for start, end in zip(bounds[:-1], bounds[1:]) if end > start
+        ]
+        results = [future.result() for future in futures]
+        if not results:
+            return np.full(num_rows, np.nan), np.zeros(num_rows, dtype=bool), {}
+        details = {suffix: np.concatenate([r[2][suffix] for r in results]) for suffix in results[0][2]}
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results]), details
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,222 @@
+# llm_eval_package/core/jobs.py
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import traceback
+import pandas as pd
+
+from llm_eval_package.core.streaming import RunningAggregates
+
+# Durable evaluation jobs for the API: a SQLite-backed queue plus a single background worker.
+# Results are written chunk by chunk, so a job interrupted by a restart resumes from the first
+# row that has no stored result instead of starting over.
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_JOB_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobStore:
+    """
+    SQLite persistence for jobs and their per-row results. Safe to share between the API's
+    request handlers and the JobRunner thread.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, test_cases TEXT NOT NULL,
+                total_rows INTEGER NOT NULL, completed_rows INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL, started_at REAL, finished_at REAL,
+                rows_at_start INTEGER NOT NULL DEFAULT 0, cancel_requested INTEGER NOT NULL DEFAULT 0, error TEXT
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL, row_index INTEGER NOT NULL, result TEXT NOT NULL,
+                PRIMARY KEY (job_id, row_index)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+
+    def create_job(self, test_cases: list, params: dict) -> str:
+        """Queues a job over test_cases (a list of row dicts) and returns its id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, params, test_cases, total_rows, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, json.dumps(params), json.dumps(test_cases), len(test_cases), time.time())
+            )
+        return job_id
+
+    def get_job(self, job_id: str) -> dict:
+        """Job status and progress, or None for an unknown id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, total_rows, completed_rows, created_at, started_at, finished_at, "
+                "rows_at_start, cancel_requested, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        end_time = job["finished_at"] or time.time()
+        rows_done_here = job["completed_rows"] - job.pop("rows_at_start")
+        elapsed = end_time - job["started_at"] if job["started_at"] else 0.0
+        job["job_id"] = job.pop("id")
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        job["progress"] = job["completed_rows"] / job["total_rows"] if job["total_rows"] else 1.0
+        job["rows_per_second"] = round(rows_done_here / elapsed, 2) if elapsed > 0 else 0.0
+        return job
+
+    def get_results(self, job_id: str, offset: int, limit: int) -> list:
+        """Finished result rows [offset, offset + limit) of a job, in input order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM job_results WHERE job_id = ? AND row_index >= ? ORDER BY row_index LIMIT ?",
+                (job_id, offset, limit)
+            ).fetchall()
+        return [json.loads(r["result"]) for r in rows]
+
+    def request_cancel(self, job_id: str) -> dict:
+        """Cancels a queued job at once; a running job stops after its current chunk."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, cancel_requested = 1 WHERE id = ? AND status = ?",
+                (JOB_CANCELLED, time.time(), job_id, JOB_QUEUED)
+            )
+            self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?", (job_id, JOB_RUNNING))
+        return self.get_job(job_id)
+
+    def claim_next_job(self) -> dict:
+        """Marks the oldest queued job as running and returns its id, params, test cases and completed rows."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, params, test_cases, completed_rows FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, rows_at_start = completed_rows WHERE id = ?",
+                        (JOB_RUNNING, time.time(), row["id"])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"job_id": row["id"], "params": json.loads(row["params"]),
+                "test_cases": json.loads(row["test_cases"]), "completed_rows": row["completed_rows"]}
+
+    def save_results(self, job_id: str, start_index: int, results: list):
+        """Stores the result rows of one chunk and advances the job's progress in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO job_results (job_id, row_index, result) VALUES (?, ?, ?)",
+                    [(job_id, start_index + i, result) for i, result in enumerate(results)]
+                )
+                self._conn.execute("UPDATE jobs SET completed_rows = ? WHERE id = ?", (start_index + len(results), job_id))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def finish_job(self, job_id: str, status: str, error: str = None):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                               (status, time.time(), error, job_id))
+
+    def requeue_interrupted_jobs(self) -> int:
+        """Puts jobs left 'running' by a previous process back in the queue; returns how many."""
+        with self._lock:
+            return self._conn.execute("UPDATE jobs SET status = ? WHERE status = ?", (JOB_QUEUED, JOB_RUNNING)).rowcount
+
+
+class JobRunner:
+    """
+    Background thread that executes queued jobs one at a time, chunk_size rows per step.
+
+    evaluate_chunk(df_chunk, params) must return (evaluated DataFrame, Evaluator.last_run_summary)
+    for df_chunk; each evaluated row is stored as one JSON object. When a job finishes,
+    on_job_finished(job_id, status, run_summary) receives the summary totalled over its chunks.
+    """
+
+    def __init__(self, store: JobStore, evaluate_chunk, chunk_size: int = 500, poll_interval: float = 1.0,
+                 on_job_finished=None):
+        self.store = store
+        self.evaluate_chunk = evaluate_chunk
+        self.on_job_finished = on_job_finished
+        self.chunk_size = max(1, int(chunk_size))
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        resumed = self.store.requeue_interrupted_jobs()
+        if resumed:
+            print(f"Resuming {resumed} evaluation job(s) interrupted by a restart.")
+        self._thread = threading.Thread(target=self._run, name="evaluation-jobs", daemon=True)
+        self._thread.start()
+
+    def notify_new_job(self):
+        self._wakeup.set()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            job = self.store.claim_next_job()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job: dict):
+        job_id, test_cases = job["job_id"], job["test_cases"]
+        aggregates = RunningAggregates(job["params"].get("selected_metrics", []))
+        status = None
+        try:
+            for start in range(job["completed_rows"], len(test_cases), self.chunk_size):
+                if self._stop.is_set():
+                    return  # left 'running'; requeued and resumed on the next start
+                if self.store.is_cancel_requested(job_id):
+                    status = JOB_CANCELLED
+                    self.store.finish_job(job_id, status)
+                    return
+                df_chunk = pd.DataFrame(test_cases[start:start + self.chunk_size])
+                df_evaluated, run_summary = self.evaluate_chunk(df_chunk, job["params"])
+                aggregates.update(df_evaluated, run_summary)
+                results = df_evaluated.to_json(orient="records", lines=True, force_ascii=False).splitlines()
+                self.store.save_results(job_id, start, results)
+            status = JOB_COMPLETED
+            self.store.finish_job(job_id, status)
+        except Exception as e:
+            print(f"ERROR in evaluation job {job_id}: {e}\n{traceback.format_exc()}")
+            status = JOB_FAILED
+            self.store.finish_job(job_id, status, str(e))
+        finally:
+            if status is not None and aggregates.rows and self.on_job_finished is not None:
+                self.on_job_finished(job_id, status, aggregates.as_run_summary())
@@ -0,0 +1,69 @@
+# llm_eval_package/core/progress.py
+from tqdm import tqdm
+
+# The core package never talks to a UI directly. Progress updates and user-facing messages go
+# to a ProgressSink: the console by default, or st.progress / st.info etc. when the Streamlit app
+# installs llm_eval_package.ui.progress_sink.StreamlitProgressSink with set_default_sink().
+
+
+class ProgressSink:
+    """
+    Receives progress updates and notifications from the core. This base class ignores
+    everything and can be used to silence output (e.g. in API workers).
+    """
+
+    def start(self, total: int, description: str = ""):
+        """Begins a task made of `total` steps."""
+
+    def advance(self, completed: int, message: str = ""):
+        """Reports that `completed` of the steps are done; `message` describes the current step."""
+
+    def finish(self, message: str = ""):
+        """Ends the current task."""
+
+    def notify(self, message: str, level: str = "info"):
+        """Shows a one-off message. level is one of "info", "success", "warning" or "error"."""
+
+
+class ConsoleProgressSink(ProgressSink):
+    """tqdm progress bars and printed messages, for the CLI and the API."""
+
+    def __init__(self):
+        self._bar = None
+
+    def start(self, total: int, description: str = ""):
+        self.finish()
+        self._bar = tqdm(total=total, desc=description)
+
+    def advance(self, completed: int, message: str = ""):
+        if self._bar is None: return
+        self._bar.update(completed - self._bar.n)
+        if message: self._bar.set_postfix_str(message)
+
+    def finish(self, message: str = ""):
+        if self._bar is not None:
+            self._bar.update(self._bar.total - self._bar.n)
+            self._bar.close()
+            self._bar = None
+        if message: print(message)
+
+    def notify(self, message: str, level: str = "info"):
+        print(f"{level.upper()}: {message}" if level in ("warning", "error") else message)
+
+
+_default_sink = ConsoleProgressSink()
+
+
+def set_default_sink(sink: ProgressSink):
+    """Installs the sink used by every component that was not given one explicitly."""
+    global _default_sink
+    _default_sink = sink if sink is not None else ConsoleProgressSink()
+
+
+def get_default_sink() -> ProgressSink:
+    return _default_sink
+
+
+def notify(message: str, level: str = "info"):
+    """Shortcut for get_default_sink().notify(...)."""
+    _default_sink.notify(message, level)
@@ -0,0 +1,127 @@
+# llm_eval_package/core/registry.py
+import os
+import importlib
+import threading
+from collections.abc import Mapping
+
+from llm_eval_package.core.progress import notify
+from llm_eval_package.config import (
+    AVAILABLE_METRICS, SENTENCE_BERT_MODEL_PATH, MODEL_DIR, SENTENCE_BERT_MODEL,
+    ENABLE_EMBEDDING_CACHE, EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_MAX_ENTRIES
+)
+
+# Module holding each metric class named in AVAILABLE_METRICS. Modules are only imported,
+# and metrics only constructed, when a metric is first used.
+METRIC_CLASS_MODULES = {
+    "SemanticSimilarityMetric": "llm_eval_package.metrics.fluency_similarity",
+    "CompletenessMetric": "llm_eval_package.metrics.completeness",
+    "ConcisenessMetric": "llm_eval_package.metrics.conciseness",
+    "TrustFactualityMetric": "llm_eval_package.metrics.trust_factuality",
+    "SafetyMetric": "llm_eval_package.metrics.safety",
+    "FactAdherenceMetric": "llm_eval_package.metrics.fact_adherence",
+    "LatencyMetric": "llm_eval_package.metrics.latency",
+}
+
+
+def _build_semantic_similarity(metric_class):
+    if not os.path.exists(SENTENCE_BERT_MODEL_PATH) or not os.listdir(SENTENCE_BERT_MODEL_PATH):
+        from llm_eval_package.utils import ModelDownloader
+        notify(f"Semantic Similarity model ('{SENTENCE_BERT_MODEL}') not found. Downloading...")
+        downloaded_path = ModelDownloader().download_and_save_model(SENTENCE_BERT_MODEL, MODEL_DIR)
+        if not downloaded_path: raise Exception(f"Failed to download model '{SENTENCE_BERT_MODEL}'.")
+        notify(f"Model '{SENTENCE_BERT_MODEL}' downloaded!", "success")
+    return metric_class(
+        SENTENCE_BERT_MODEL_PATH,
+        cache_dir=EMBEDDING_CACHE_DIR if ENABLE_EMBEDDING_CACHE else None,
+        cache_max_entries=EMBEDDING_CACHE_MAX_ENTRIES
+    )
+
+
+# Metrics whose constructor needs arguments; every other metric is built with MetricClass().
+_METRIC_BUILDERS = {
+    "SemanticSimilarityMetric": _build_semantic_similarity,
+}
+
+
+class MetricRegistry(Mapping):
+    """
+    Lazily constructed metric instances, keyed by metric name.
+
+    A metric (and any model it loads) is created the first time it is looked up, so a run that
+    only selects model-free metrics never imports or loads Sentence-BERT. Construction failures
+    are remembered and reported once; such metrics behave as not available.
+
+    Iteration and len() cover every metric in AVAILABLE_METRICS; use warm_metrics() to see which
+    ones are already loaded.
+    """
+
+    def __init__(self, available_metrics: dict = None):
+        self.available_metrics = dict(available_metrics if available_metrics is not None else AVAILABLE_METRICS)
+        self._instances = {}
+        self._failures = {}
+        self._lock = threading.RLock()
+
+    def metric_class(self, metric_name: str):
+        """Imports and returns the class implementing metric_name."""
+        class_name = self.available_metrics[metric_name]
+        module = importlib.import_module(METRIC_CLASS_MODULES[class_name])
+        return getattr(module, class_name)
+
+    def _load(self, metric_name: str):
+        if metric_name in self._instances or metric_name in self._failures:
+            return self._instances.get(metric_name)
+        with self._lock:
+            if metric_name in self._instances or metric_name in self._failures:
+                return self._instances.get(metric_name)
+            try:
+                metric_class = self.metric_class(metric_name)
+                builder = _METRIC_BUILDERS.get(self.available_metrics[metric_name])
+                self._instances[metric_name] = builder(metric_class) if builder else metric_class()
+            except Exception as e:
+                print(f"ERROR initializing metric {metric_name}: {e}")
+                self._failures[metric_name] = str(e)
+            return self._instances.get(metric_name)
+
+    def __getitem__(self, metric_name: str):
+        if metric_name not in self.available_metrics:
+            raise KeyError(metric_name)
+        metric_instance = self._load(metric_name)
+        if metric_instance is None:
+            raise KeyError(metric_name)
+        return metric_instance
+
+    def __contains__(self, metric_name) -> bool:
+        return metric_name in self.available_metrics and self._load(metric_name) is not None
+
+    def __iter__(self):
+        return iter(self.available_metrics)
+
+    def __len__(self) -> int:
+        return len(self.available_metrics)
+
+    def warm_up(self, metric_names: list = None):
+        """Loads the given metrics (default: all available) ahead of their first use."""
+        for metric_name in (metric_names if metric_names is not None else self.available_metrics):
+            if metric_name in self.available_metrics:
+                self._load(metric_name)
+
+    def warm_metrics(self) -> list:
+        """Names of the metrics that are already loaded."""
+        return [m for m in self.available_metrics if m in self._instances]
+
+    def failed_metrics(self) -> dict:
+        """Metric name -> error message for metrics that could not be initialized."""
+        return dict(self._failures)
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_metric_registry() -> MetricRegistry:
+    """The process-wide registry shared by every Evaluator (CLI, API workers, Streamlit reruns)."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = MetricRegistry()
+        return _default_registry
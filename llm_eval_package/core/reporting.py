@@ -1,38 +1,38 @@
 import pandas as pd
-import streamlit as st
 
 class Reporter:
     """
-    Handles the generation and display of evaluation reports.
-    This class can be extended to create various types of reports (e.g., HTML, PDF).
+    Builds evaluation reports as plain DataFrames and bytes, without any UI dependency.
+    The Streamlit rendering of these reports lives in llm_eval_package.ui.report_view.
     """
 
+    EXPORT_MIME_TYPES = {"csv": "text/csv", "json": "application/json"}
+
     def __init__(self):
         """
         Initializes the Reporter.
         """
         pass
 
-    def generate_summary_report(self, df_evaluated: pd.DataFrame, selected_metrics: list, custom_thresholds: dict = None):
+    def generate_summary_report(self, df_evaluated: pd.DataFrame, selected_metrics: list, custom_thresholds: dict = None) -> dict:
         """
-        Generates and displays a summary report of the evaluation results.
+        Generates a summary report of the evaluation results.
 
         Args:
             df_evaluated (pd.DataFrame): The DataFrame containing evaluation results.
             selected_metrics (list): List of metrics that were evaluated.
             custom_thresholds (dict, optional): Custom thresholds used for evaluation.
+
+        Returns:
+            dict: {"total_rows": int, "pass_fail_rates": pd.DataFrame, "average_scores": pd.DataFrame}.
+                  Both DataFrames are empty if df_evaluated is empty.
         """
         if df_evaluated.empty:
-            st.warning("No evaluation results to report.")
-            return
-
-        st.subheader("Evaluation Summary")
+            return {"total_rows": 0, "pass_fail_rates": pd.DataFrame(), "average_scores": pd.DataFrame()}
 
         total_rows = len(df_evaluated)
-        st.write(f"Total test cases evaluated: **{total_rows}**")
 
-        # Display overall pass/fail rates for each metric
-        st.markdown("### Metric Pass/Fail Rates")
+        # Overall pass/fail rates for each metric
         summary_data = []
         for metric in selected_metrics:
             pass_col = f'{metric} Pass/Fail'
@@ -58,15 +58,8 @@ class Reporter:
                     "Error Count": "N/A",
                     "Pass Rate (%)": "N/A"
                 })
-        
-        if summary_data:
-            summary_df = pd.DataFrame(summary_data)
-            st.dataframe(summary_df, use_container_width=True)
-        else:
-            st.info("No metrics were selected for evaluation, or no results available.")
 
-        # Display average scores for numerical metrics
-        st.markdown("### Average Metric Scores")
+        # Average scores for numerical metrics
         avg_scores_data = []
         for metric in selected_metrics:
             score_col = f'{metric} Score'
@@ -93,41 +86,29 @@ class Reporter:
                     "Average Score": "N/A",
                     "Threshold": "N/A"
                 })
-        
-        if avg_scores_data:
-            avg_scores_df = pd.DataFrame(avg_scores_data)
-            st.dataframe(avg_scores_df, use_container_width=True)
-        else:
-            st.info("No average scores to display.")
 
-    def export_report(self, df_evaluated: pd.DataFrame, file_format: str = "csv"):
+        return {
+            "total_rows": total_rows,
+            "pass_fail_rates": pd.DataFrame(summary_data),
+            "average_scores": pd.DataFrame(avg_scores_data),
+        }
+
+    def export_report(self, df_evaluated: pd.DataFrame, file_format: str = "csv") -> bytes:
         """
-        Exports the evaluation results to a specified file format.
+        Serializes the evaluation results to a specified file format.
 
         Args:
             df_evaluated (pd.DataFrame): The DataFrame containing evaluation results.
             file_format (str): The desired export format (e.g., "csv", "json").
-        """
-        if df_evaluated.empty:
-            st.warning("No data to export.")
-            return
 
+        Returns:
+            bytes: The encoded report.
+
+        Raises:
+            ValueError: If file_format is not supported.
+        """
         if file_format == "csv":
-            csv_output = df_evaluated.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="Download Results as CSV",
-                data=csv_output,
-                file_name="llm_evaluation_results.csv",
-                mime="text/csv",
-            )
+            return df_evaluated.to_csv(index=False).encode('utf-8')
         elif file_format == "json":
-            json_output = df_evaluated.to_json(orient="records", indent=4).encode('utf-8')
-            st.download_button(
-                label="Download Results as JSON",
-                data=json_output,
-                file_name="llm_evaluation_results.json",
-                mime="application/json",
-            )
-        else:
-            st.error(f"Unsupported export format: {file_format}")
-
+            return df_evaluated.to_json(orient="records", indent=4).encode('utf-8')
+        raise ValueError(f"Unsupported export format: {file_format}")
@@ -0,0 +1,151 @@
+# llm_eval_package/core/streaming.py
+import json
+import time
+import pandas as pd
+
+from llm_eval_package.core.engine import AUTOMATED_OVERALL_COL
+
+# Helpers for `main.py evaluate --stream`: read the input in fixed-size chunks, append each
+# evaluated chunk to the output file, and keep only running totals in memory.
+
+STREAMABLE_INPUT_FORMATS = ("csv", "jsonl")
+STREAMABLE_OUTPUT_FORMATS = ("csv", "json", "jsonl")
+
+
+def iter_input_chunks(input_path: str, chunk_size: int):
+    """
+    Yields the input file as DataFrames of at most chunk_size rows.
+    CSV and JSON Lines can be read incrementally; a plain JSON array cannot, so it is rejected.
+    """
+    file_extension = str(input_path).lower().rsplit('.', 1)[-1]
+    if file_extension == "csv":
+        reader = pd.read_csv(input_path, chunksize=chunk_size, dtype={'id': str})
+    elif file_extension == "jsonl":
+        reader = pd.read_json(input_path, lines=True, chunksize=chunk_size, dtype={'id': str})
+    else:
+        raise ValueError(f"Streaming supports {', '.join(STREAMABLE_INPUT_FORMATS)} input, not '.{file_extension}'. "
+                         "Convert JSON arrays to JSON Lines (one record per line).")
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+class ChunkedResultWriter:
+    """
+    Appends evaluated chunks to a CSV, JSON (a single array) or JSON Lines file.
+    Use as a context manager so a JSON array is always closed.
+    """
+
+    def __init__(self, output_path: str, output_format: str):
+        if output_format not in STREAMABLE_OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported streaming output format '{output_format}'.")
+        self.output_path = output_path
+        self.output_format = output_format
+        self.rows_written = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.output_path, 'w', encoding='utf-8', newline='')
+        if self.output_format == "json":
+            self._file.write("[")
+        return self
+
+    def write(self, df_chunk: pd.DataFrame):
+        if df_chunk.empty:
+            return
+        if self.output_format == "csv":
+            df_chunk.to_csv(self._file, index=False, header=self.rows_written == 0)
+        else:
+            records = df_chunk.to_json(orient="records", lines=True, force_ascii=False).splitlines()
+            if self.output_format == "json":
+                self._file.write(("," if self.rows_written else "") + "\n" + ",\n".join(records))
+            else:
+                self._file.write("\n".join(records) + "\n")
+        self._file.flush()
+        self.rows_written += len(df_chunk)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.output_format == "json":
+            self._file.write("\n]\n")
+        self._file.close()
+        return False
+
+
+class RunningAggregates:
+    """
+    Accumulates per-chunk results into the totals reported at the end of a streaming run,
+    without keeping any evaluated rows around.
+    """
+
+    def __init__(self, selected_metrics: list):
+        self.selected_metrics = list(selected_metrics)
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.chunks = 0
+        self.score_sums = {m: 0.0 for m in self.selected_metrics}
+        self.score_counts = {m: 0 for m in self.selected_metrics}
+        self.status_counts = {m: {} for m in self.selected_metrics + [AUTOMATED_OVERALL_COL]}
+        self.metric_stats = {}
+        self.reused_rows = {}
+        self.dedup = {}
+        self.skipped_rows = {}
+        self.text_artifacts = {}
+
+    def update(self, df_chunk: pd.DataFrame, run_summary: dict):
+        """Adds one evaluated chunk and the Evaluator.last_run_summary it produced."""
+        self.rows += len(df_chunk)
+        self.chunks += 1
+        for metric_name in self.selected_metrics:
+            score_col = f'{metric_name} Score'
+            if score_col in df_chunk.columns:
+                scores = pd.to_numeric(df_chunk[score_col], errors='coerce').dropna()
+                self.score_sums[metric_name] += float(scores.sum())
+                self.score_counts[metric_name] += int(scores.size)
+        for name in self.status_counts:
+            status_col = name if name == AUTOMATED_OVERALL_COL else f'{name} Pass/Fail'
+            if status_col in df_chunk.columns:
+                for status, count in df_chunk[status_col].value_counts().items():
+                    self.status_counts[name][status] = self.status_counts[name].get(status, 0) + int(count)
+        for metric_name, stats in run_summary.get("metric_stats", {}).items():
+            totals = self.metric_stats.setdefault(metric_name, {})
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        for metric_name, reused in run_summary.get("reused_rows", {}).items():
+            self.reused_rows[metric_name] = self.reused_rows.get(metric_name, 0) + reused
+        for metric_name, skipped in run_summary.get("skipped_rows", {}).items():
+            self.skipped_rows[metric_name] = self.skipped_rows.get(metric_name, 0) + skipped
+        for metric_name, counts in run_summary.get("dedup", {}).items():
+            totals = self.dedup.setdefault(metric_name, {"rows": 0, "unique": 0})
+            totals["rows"] += counts["rows"]
+            totals["unique"] += counts["unique"]
+        artifacts = run_summary.get("text_artifacts", {})
+        if artifacts.get("artifacts"):
+            self.text_artifacts["unique_texts"] = self.text_artifacts.get("unique_texts", 0) + artifacts["unique_texts"]
+            self.text_artifacts["artifacts"] = max(self.text_artifacts.get("artifacts", 0), artifacts["artifacts"])
+            self.text_artifacts["metrics"] = max(self.text_artifacts.get("metrics", 0), artifacts["metrics"])
+
+    def as_run_summary(self) -> dict:
+        """The totals in the same shape as Evaluator.last_run_summary (for format_run_summary)."""
+        return {
+            "rows": self.rows,
+            "metrics": [m for m in self.selected_metrics if self.score_counts[m] or self.status_counts[m]],
+            "elapsed_seconds": round(time.perf_counter() - self.started, 3),
+            "metric_stats": self.metric_stats,
+            "reused_rows": self.reused_rows,
+            "dedup": self.dedup,
+            "skipped_rows": self.skipped_rows,
+            "text_artifacts": self.text_artifacts,
+        }
+
+    def format(self) -> str:
+        """Renders the per-metric and overall totals as text."""
+        lines = [f"Streamed {self.rows} rows in {self.chunks} chunk(s)."]
+        for name, counts in self.status_counts.items():
+            if not counts:
+                continue
+            count_text = " / ".join(f"{status} {count}" for status, count in sorted(counts.items()))
+            if name in self.score_counts and self.score_counts[name]:
+                lines.append(f"{name}: mean score {self.score_sums[name] / self.score_counts[name]:.4f}; {count_text}")
+            else:
+                lines.append(f"{name}: {count_text}")
+        return "\n".join(lines)
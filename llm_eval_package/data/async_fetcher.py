@@ -0,0 +1,319 @@
+# llm_eval_package/data/async_fetcher.py
+import json
+import time
+import asyncio
+from datetime import datetime, timezone
+
+from llm_eval_package.config import (
+    FETCH_CONCURRENCY, FETCH_TIMEOUT_SECONDS, FETCH_MIN_CONCURRENCY, FETCH_MAX_CONCURRENCY,
+    FETCH_LATENCY_TOLERANCE, FETCH_BACKOFF_BASE_SECONDS, FETCH_BACKOFF_MAX_SECONDS,
+    FETCH_CIRCUIT_FAILURE_THRESHOLD, FETCH_CIRCUIT_COOLDOWN_SECONDS
+)
+from llm_eval_package.data.flow_control import AdaptiveConcurrencyLimiter, CircuitBreaker, backoff_delay
+
+
+# Per-query timings recorded by the fetcher -> output column names (the "Latency" metric reads
+# response_latency_seconds). Cached answers keep the timings of the request that fetched them.
+RESPONSE_TIMING_COLUMNS = {
+    "ttfc_seconds": "response_ttfc_seconds",
+    "latency_seconds": "response_latency_seconds",
+    "chunk_count": "response_chunk_count",
+}
+
+
+def append_bot_line(parts: list, line: str):
+    """Adds one NDJSON line's 'data' to parts. A non-JSON first line is kept as-is (plain-text answers)."""
+    try:
+        parts.append(str(json.loads(line).get("data", "")))
+    except (json.JSONDecodeError, AttributeError):
+        if not parts:
+            parts.append(line)
+
+
+EMPTY_RESPONSE = "Error: Empty API response"
+
+
+def join_bot_parts(parts: list) -> str:
+    return "".join(parts) if parts else EMPTY_RESPONSE
+
+
+def parse_bot_response(text: str) -> str:
+    """
+    Joins the 'data' fields of an NDJSON bot response into one message.
+    A body that isn't NDJSON is returned as-is (simple non-streaming responses).
+    """
+    parts = []
+    for line in (text or "").strip().splitlines():
+        if line.strip():
+            append_bot_line(parts, line)
+    return join_bot_parts(parts)
+
+
+def add_response_columns(df, results: list):
+    """Sets 'llm_output' and the RESPONSE_TIMING_COLUMNS on df (in place) from fetch results aligned with its rows."""
+    df['llm_output'] = [result["llm_output"] for result in results]
+    for field, column in RESPONSE_TIMING_COLUMNS.items():
+        df[column] = [result.get(field) for result in results]
+    return df
+
+
+def _retry_after_seconds(response) -> float:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except (TypeError, ValueError): # HTTP-date form; fall back to our own backoff
+        return 0.0
+
+
+def format_fetch_summary(stats: dict) -> str:
+    """Human-readable summary of AsyncBotFetcher.get_stats()."""
+    lines = [
+        f"Fetched {stats['queries']} responses in {stats['elapsed_seconds']:.1f}s "
+        f"({stats['queries_per_second']:.2f} queries/s); {stats['failed']} failed, {stats['retries']} retries.",
+        f"Concurrency adapted between {stats['lowest_concurrency']:.0f} and {stats['peak_concurrency']:.0f} "
+        f"(final {stats['final_concurrency']:.0f}, {stats['concurrency_decreases']} decreases); "
+        f"{stats['throttled']} throttled/server-error responses.",
+    ]
+    if stats["calls_saved"]:
+        lines.append(f"Saved {stats['calls_saved']} of {stats['queries']} bot calls: {stats['cache_hits']} from the "
+                     f"response cache, {stats['deduplicated']} duplicate queries shared an in-flight request.")
+    opened = {domain: count for domain, count in stats["circuit_opened"].items() if count}
+    if opened:
+        lines.append("Circuit breaker opened: " + ", ".join(f"{d} x{c}" for d, c in opened.items()))
+    return "\n".join(lines)
+
+
+class AsyncBotFetcher:
+    """
+    Sends queries to the RAG bot concurrently over one pooled keep-alive HTTP client.
+
+    The number of requests in flight adapts to the backend (AdaptiveConcurrencyLimiter), retries
+    use jittered exponential backoff, and each domain has a CircuitBreaker that pauses requests
+    while the backend keeps failing. Results come back in the order of the input queries.
+    Failed queries get an "Error: ..." message (the same convention as fetch_bot_responses)
+    instead of raising.
+
+    Identical queries within a run share one request, and with a ResponseCache, successful
+    answers are reused across runs until they expire (refresh=True refetches and overwrites them).
+    """
+
+    def __init__(self, api_url: str, api_headers: dict, domain_path: str,
+                 sender_id: str = "testusr",
+                 concurrency: int = FETCH_CONCURRENCY,
+                 api_timeout: float = FETCH_TIMEOUT_SECONDS,
+                 max_retries: int = 2,
+                 retry_delay: float = FETCH_BACKOFF_BASE_SECONDS,
+                 verify: bool = False,
+                 min_concurrency: int = FETCH_MIN_CONCURRENCY,
+                 max_concurrency: int = FETCH_MAX_CONCURRENCY,
+                 latency_tolerance: float = FETCH_LATENCY_TOLERANCE,
+                 max_backoff: float = FETCH_BACKOFF_MAX_SECONDS,
+                 circuit_failure_threshold: int = FETCH_CIRCUIT_FAILURE_THRESHOLD,
+                 circuit_cooldown: float = FETCH_CIRCUIT_COOLDOWN_SECONDS,
+                 response_cache=None,
+                 refresh: bool = False):
+        """
+        Args:
+            api_url (str): Bot chat endpoint.
+            api_headers (dict): Request headers; 'Req-Date-Time' is set per request.
+            domain_path (str): Domain path sent in every payload.
+            sender_id (str): Sender ID for the API payload.
+            concurrency (int): Initial number of requests in flight.
+            api_timeout (float): Timeout per request in seconds.
+            max_retries (int): Retries per query after the first attempt.
+            retry_delay (float): Base delay of the exponential backoff in seconds.
+            verify (bool): Verify TLS certificates (the internal bot uses a self-signed one).
+            min_concurrency (int): Lower bound for the adaptive in-flight limit.
+            max_concurrency (int): Upper bound for the adaptive in-flight limit.
+            latency_tolerance (float): Responses whose time to first chunk exceeds this multiple of the
+                running average count as overload.
+            max_backoff (float): Cap on a single backoff delay in seconds.
+            circuit_failure_threshold (int): Consecutive failures that open a domain's circuit.
+            circuit_cooldown (float): Seconds an open circuit waits before a probe request.
+            response_cache (ResponseCache, optional): Persistent cache of successful responses.
+            refresh (bool): Ignore cached responses (fresh answers are still written to the cache).
+        """
+        self.api_url = api_url
+        self.api_headers = dict(api_headers)
+        self.domain_path = domain_path
+        self.sender_id = sender_id
+        self.concurrency = max(1, int(concurrency))
+        self.api_timeout = api_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.verify = verify
+        self.min_concurrency = min(min_concurrency, self.concurrency)
+        self.max_concurrency = max(max_concurrency, self.concurrency)
+        self.latency_tolerance = latency_tolerance
+        self.max_backoff = max_backoff
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_cooldown = circuit_cooldown
+        self.response_cache = response_cache
+        self.refresh = refresh
+        self.circuit_breakers = {}
+        self.limiter = None
+        self._counters = self._new_counters()
+        self.last_elapsed_seconds = None
+        self.last_stats = None
+
+    @staticmethod
+    def _new_counters() -> dict:
+        return {"retries": 0, "throttled": 0, "cache_hits": 0, "deduplicated": 0}
+
+    def _circuit_breaker(self, domain_path: str) -> CircuitBreaker:
+        if domain_path not in self.circuit_breakers:
+            self.circuit_breakers[domain_path] = CircuitBreaker(self.circuit_failure_threshold, self.circuit_cooldown)
+        return self.circuit_breakers[domain_path]
+
+    def _make_client(self):
+        import httpx # Imported lazily so evaluation-only code paths don't pay for it
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(limits=limits, timeout=self.api_timeout, verify=self.verify)
+
+    async def _fetch_one(self, client, query_text: str) -> dict:
+        import httpx
+        payload = {"message": query_text, "senderId": self.sender_id, "domain": self.domain_path}
+        breaker = self._circuit_breaker(self.domain_path)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            probe_id = await breaker.wait_until_allowed()
+            headers = dict(self.api_headers)
+            headers["Req-Date-Time"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            retry_after = 0.0
+            started_at = await self.limiter.acquire()
+            try:
+                async with client.stream("POST", self.api_url, headers=headers, content=json.dumps(payload)) as response:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        # Overload: back off and shrink the in-flight limit. Only server errors count
+                        # towards the breaker; a 429 means the backend is up but rate limiting us.
+                        self._counters["throttled"] += 1
+                        self.limiter.on_overload(started_at)
+                        if response.status_code == 429:
+                            retry_after = _retry_after_seconds(response)
+                        else:
+                            breaker.record_failure()
+                    response.raise_for_status()
+                    # Consume the NDJSON stream line by line as it arrives.
+                    parts, chunk_count, first_chunk_at = [], 0, None
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        if first_chunk_at is None:
+                            first_chunk_at = time.monotonic()
+                        chunk_count += 1
+                        append_bot_line(parts, line)
+                latency = time.monotonic() - started_at
+                ttfc = first_chunk_at - started_at if first_chunk_at is not None else None
+                self.limiter.on_success(started_at, ttfc if ttfc is not None else latency)
+                breaker.record_success()
+                # An empty stream is not an answer: it is neither cached nor checkpointed as done.
+                return {"llm_output": join_bot_parts(parts), "ok": bool(parts), "attempts": attempt + 1, "cached": False,
+                        "ttfc_seconds": ttfc, "latency_seconds": latency, "chunk_count": chunk_count}
+            except httpx.HTTPStatusError as e:
+                last_error = e
+                if e.response.status_code != 429 and e.response.status_code < 500:
+                    breaker.record_success() # The backend is up; client errors (bad token, bad payload)
+                    break                    # won't succeed on retry
+            except Exception as e: # Timeouts, connection errors and anything unexpected
+                last_error = e
+                self.limiter.on_overload(started_at)
+                breaker.record_failure()
+            finally:
+                # A probe answered with 429 (or cancelled) recorded neither outcome; without this the
+                # breaker would stay half-open with its probe "in flight" and block every request.
+                breaker.release_probe(probe_id)
+                await self.limiter.release()
+            if attempt < self.max_retries:
+                self._counters["retries"] += 1
+                await asyncio.sleep(max(retry_after, backoff_delay(attempt, self.retry_delay, self.max_backoff)))
+        return {"llm_output": f"Error: Failed after {attempt + 1} attempt(s). Last error: {last_error}", "ok": False,
+                "attempts": attempt + 1, "cached": False, "ttfc_seconds": None, "latency_seconds": None, "chunk_count": None}
+
+    async def _resolve(self, client, query_text: str) -> dict:
+        """Answers one distinct query from the response cache, or from the bot (caching the answer)."""
+        if self.response_cache is not None and not self.refresh:
+            cached = self.response_cache.get(self.api_url, self.domain_path, query_text)
+            # Empty answers cached before they counted as failures are fetched again.
+            if cached is not None and cached.get("llm_output") != EMPTY_RESPONSE:
+                self._counters["cache_hits"] += 1
+                return dict(cached, ok=True, attempts=0, cached=True)
+        result = await self._fetch_one(client, query_text)
+        if result["ok"] and self.response_cache is not None:
+            self.response_cache.put(self.api_url, self.domain_path, query_text, result)
+        return result
+
+    async def fetch_all(self, queries: list, progress_callback=None, result_callback=None) -> list:
+        """
+        Fetches a response for every query.
+
+        Args:
+            queries (list): Query strings.
+            progress_callback (callable, optional): Called as callback(done, total, successful)
+                after each query finishes, on the event loop thread.
+            result_callback (callable, optional): Called as callback(index, result) as soon as the
+                query at that index finishes (e.g. to checkpoint it), before progress_callback.
+
+        Returns:
+            list: One dict per query, in input order, with keys 'llm_output', 'ok' (False for failed
+                  requests and empty answers), 'attempts'
+                  (0 when served from the cache), 'cached', and the RESPONSE_TIMING_COLUMNS fields
+                  'ttfc_seconds' (time to first chunk), 'latency_seconds' and 'chunk_count'
+                  (None when the query failed).
+        """
+        results = [None] * len(queries)
+        self.limiter = AdaptiveConcurrencyLimiter(self.concurrency, self.min_concurrency, self.max_concurrency,
+                                                  latency_tolerance=self.latency_tolerance)
+        self._counters = self._new_counters()
+        if not queries:
+            return results
+        done = 0
+        successful = 0
+
+        in_flight = {} # query text -> task shared by every row asking the same question
+
+        async with self._make_client() as client:
+            async def run(index, query_text):
+                nonlocal done, successful
+                task = in_flight.get(query_text)
+                if task is None:
+                    task = in_flight[query_text] = asyncio.ensure_future(self._resolve(client, query_text))
+                else:
+                    self._counters["deduplicated"] += 1
+                result = dict(await task)
+                results[index] = result
+                if result_callback is not None:
+                    result_callback(index, result)
+                done += 1
+                successful += result["ok"]
+                if progress_callback is not None:
+                    progress_callback(done, len(queries), successful)
+
+            await asyncio.gather(*(run(i, str(q)) for i, q in enumerate(queries)))
+        return results
+
+    def fetch(self, queries: list, progress_callback=None, result_callback=None) -> list:
+        """Synchronous wrapper around fetch_all() for the CLI and Streamlit. Fills last_stats."""
+        start_time = time.time()
+        results = asyncio.run(self.fetch_all(list(queries), progress_callback, result_callback))
+        self.last_elapsed_seconds = time.time() - start_time
+        self.last_stats = self.get_stats(results, self.last_elapsed_seconds)
+        return results
+
+    def get_stats(self, results: list, elapsed_seconds: float) -> dict:
+        """Throughput and flow-control statistics for a finished run (see format_fetch_summary)."""
+        limiter = self.limiter
+        return {
+            "queries": len(results),
+            "failed": sum(not r["ok"] for r in results),
+            "elapsed_seconds": elapsed_seconds,
+            "queries_per_second": len(results) / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            "retries": self._counters["retries"],
+            "throttled": self._counters["throttled"],
+            "final_concurrency": limiter.limit,
+            "peak_concurrency": limiter.peak_limit,
+            "lowest_concurrency": limiter.lowest_limit,
+            "concurrency_decreases": limiter.decreases,
+            "cache_hits": self._counters["cache_hits"],
+            "deduplicated": self._counters["deduplicated"],
+            "calls_saved": self._counters["cache_hits"] + self._counters["deduplicated"],
+            "circuit_opened": {domain: b.times_opened for domain, b in self.circuit_breakers.items()},
+        }
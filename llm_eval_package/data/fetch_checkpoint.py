@@ -0,0 +1,106 @@
+# llm_eval_package/data/fetch_checkpoint.py
+import os
+import json
+import hashlib
+
+
+class FetchCheckpoint:
+    """
+    Append-only JSONL record of the responses fetched so far in a fetch-responses run.
+
+    The first line identifies the run (a fingerprint of the API URL, domain and queries); every
+    later line is one finished row: {"row": index, "llm_output": ..., "ok": ..., plus the
+    response timing fields}. Each line is
+    flushed and fsynced as soon as the row finishes, so a crash loses at most the rows in flight.
+    A checkpoint written for different input is discarded rather than resumed.
+    """
+
+    _TIMING_FIELDS = ("ttfc_seconds", "latency_seconds", "chunk_count")
+
+    def __init__(self, path: str, fingerprint: str):
+        """
+        Args:
+            path (str): Checkpoint file path (normally the output CSV path + FETCH_CHECKPOINT_SUFFIX).
+            fingerprint (str): Identifies the input; see FetchCheckpoint.fingerprint().
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self._file = None
+
+    @staticmethod
+    def fingerprint(api_url: str, domain_path: str, queries: list) -> str:
+        digest = hashlib.sha256(f"{api_url}\0{domain_path}\0".encode("utf-8"))
+        for query in queries:
+            digest.update(str(query).encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    def load(self) -> dict:
+        """
+        Returns row index -> last recorded result ({'llm_output', 'ok', timing fields}),
+        or {} if no usable checkpoint exists.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        rows = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = f.readline()
+            try:
+                if json.loads(header).get("fingerprint") != self.fingerprint:
+                    print(f"Warning: Checkpoint '{self.path}' was written for different input; starting over.")
+                    return {}
+            except (json.JSONDecodeError, AttributeError):
+                return {}
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # A line cut short by a crash
+                rows[int(entry["row"])] = {"llm_output": entry["llm_output"], "ok": bool(entry["ok"]),
+                                           **{field: entry.get(field) for field in self._TIMING_FIELDS}}
+        return rows
+
+    def open(self) -> dict:
+        """
+        Loads any existing checkpoint for this input and opens the file for appending
+        (starting a new one if there is none or it belongs to other input).
+
+        Returns:
+            dict: Row index -> result already recorded (see load()).
+        """
+        rows = self.load()
+        if rows or self._has_matching_header():
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write_line({"fingerprint": self.fingerprint})
+        return rows
+
+    def _has_matching_header(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                return json.loads(f.readline()).get("fingerprint") == self.fingerprint
+            except (json.JSONDecodeError, AttributeError):
+                return False
+
+    def _write_line(self, obj: dict):
+        self._file.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, row: int, result: dict):
+        """Durably records one finished row."""
+        self._write_line({"row": int(row), "llm_output": result["llm_output"], "ok": bool(result["ok"]),
+                          **{field: result.get(field) for field in self._TIMING_FIELDS}})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,139 @@
+# llm_eval_package/data/flow_control.py
+import time
+import random
+import asyncio
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(max, base * 2**attempt)]."""
+    return random.uniform(0, min(max_seconds, base_seconds * (2 ** attempt)))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the number of requests in flight.
+
+    Every fast, successful response raises the limit by 1/limit (about +1 per round of requests).
+    A throttling/server error (HTTP 429, 5xx, timeout) or a response whose time to first chunk
+    exceeds latency_tolerance x the baseline cuts it by decrease_factor. Only requests that
+    started after the previous cut can cut it again, so one burst of failures counts once.
+
+    The baseline is a moving average (weight baseline_smoothing per response) of the time to
+    first chunk, which unlike the total latency does not grow with the length of the answer.
+    It follows lasting changes in the backend, so no single fast response can pin it, and slow
+    responses are only judged once BASELINE_MIN_SAMPLES responses have been seen.
+    """
+    BASELINE_MIN_SAMPLES = 5
+
+    def __init__(self, initial_limit: int, min_limit: int = 1, max_limit: int = 64,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0, baseline_smoothing: float = 0.1):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_smoothing = baseline_smoothing
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.lowest_limit = self.limit
+        self.decreases = 0
+        self._baseline_ttfc = None
+        self._samples = 0
+        self._last_decrease_at = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Waits for a free slot; returns the start time to pass back to on_success/on_overload."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, started_at: float, ttfc: float):
+        """Records a successful response with its time to first chunk (seconds)."""
+        overloaded = self._samples >= self.BASELINE_MIN_SAMPLES and ttfc > self._baseline_ttfc * self.latency_tolerance
+        self._samples += 1
+        if self._baseline_ttfc is None:
+            self._baseline_ttfc = ttfc
+        else:
+            self._baseline_ttfc += self.baseline_smoothing * (ttfc - self._baseline_ttfc)
+        if overloaded:
+            self.on_overload(started_at)
+            return
+        self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+
+    def on_overload(self, started_at: float):
+        if started_at < self._last_decrease_at:
+            return
+        self._last_decrease_at = time.monotonic()
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.lowest_limit = min(self.lowest_limit, self.limit)
+        self.decreases += 1
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker.
+
+    After failure_threshold consecutive failures (server errors, timeouts, connection errors)
+    the circuit opens and requests wait instead of hitting the backend. After cooldown_seconds
+    one probe request is let through (half-open): success closes the circuit, failure opens it
+    for another cooldown, and any other outcome (a 429, a cancelled request) must release it
+    with release_probe() so that the next request probes instead.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probes_sent = 0
+
+    async def wait_until_allowed(self):
+        """
+        Returns once a request may be sent: None, or the probe's id if this request is the
+        half-open probe (to be passed to release_probe() whatever the outcome).
+        """
+        while True:
+            if self.state == self.CLOSED:
+                return None
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.cooldown_seconds - time.monotonic()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                    continue
+                self.state = self.HALF_OPEN
+            if not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probes_sent += 1
+                return self._probes_sent
+            await asyncio.sleep(min(1.0, self.cooldown_seconds))
+
+    def release_probe(self, probe_id):
+        """Ends the given probe if it is still in flight; a no-op once record_success/record_failure settled it."""
+        if probe_id is not None and probe_id == self._probes_sent:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.state = self.CLOSED
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        probe_failed = self.state == self.HALF_OPEN and self._probe_in_flight
+        self._probe_in_flight = False
+        if probe_failed or (self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
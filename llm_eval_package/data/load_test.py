@@ -0,0 +1,210 @@
+# llm_eval_package/data/load_test.py
+import json
+import time
+import asyncio
+import itertools
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from llm_eval_package.config import LOAD_TEST_MAX_CONNECTIONS, LOAD_TEST_REPORT_INTERVAL_SECONDS
+from llm_eval_package.data.async_fetcher import append_bot_line, join_bot_parts
+
+# Load-test mode for the RAG bot: replays queries for a fixed duration, either open-loop at a
+# target request rate or closed-loop with a fixed number of concurrent users. Unlike the fetcher
+# there are no retries, no adaptive limit and no cache, so every request measures the bot as-is.
+
+PERCENTILES = (50, 95, 99)
+
+
+async def _timed_request(client, api_url: str, api_headers: dict, payload: dict, test_start: float) -> dict:
+    """Sends one query and times it; never raises (errors are recorded on the returned row)."""
+    headers = dict(api_headers)
+    headers["Req-Date-Time"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    started_at = time.monotonic()
+    record = {"query": payload["message"], "started_at_seconds": started_at - test_start, "status_code": None,
+              "ok": False, "error": None, "ttfc_seconds": None, "latency_seconds": None, "chunk_count": 0,
+              "response_chars": 0}
+    try:
+        async with client.stream("POST", api_url, headers=headers, content=json.dumps(payload)) as response:
+            record["status_code"] = response.status_code
+            response.raise_for_status()
+            parts, first_chunk_at = [], None
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                if first_chunk_at is None:
+                    first_chunk_at = time.monotonic()
+                record["chunk_count"] += 1
+                append_bot_line(parts, line)
+        record["ok"] = True
+        record["response_chars"] = len(join_bot_parts(parts))
+        record["ttfc_seconds"] = first_chunk_at - started_at if first_chunk_at is not None else None
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"[:300]
+    record["latency_seconds"] = time.monotonic() - started_at
+    record["finished_at_seconds"] = record["started_at_seconds"] + record["latency_seconds"]
+    return record
+
+
+async def _run_load_test(api_url: str, api_headers: dict, domain_path: str, queries: list, duration_seconds: float,
+                         rate: float, concurrency: int, api_timeout: float, sender_id: str,
+                         report_interval: float, verify: bool) -> list:
+    import httpx
+    records = []
+    query_cycle = itertools.cycle(queries)
+    payloads = ({"message": str(q), "senderId": sender_id, "domain": domain_path} for q in query_cycle)
+    max_connections = concurrency if rate is None else LOAD_TEST_MAX_CONNECTIONS
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+    async with httpx.AsyncClient(limits=limits, timeout=api_timeout, verify=verify) as client:
+        test_start = time.monotonic()
+        deadline = test_start + duration_seconds
+
+        async def report_progress():
+            last_count = 0
+            while True:
+                await asyncio.sleep(report_interval)
+                window = records[last_count:]
+                last_count = len(records)
+                errors = sum(not r["ok"] for r in window)
+                latencies = [r["latency_seconds"] for r in window if r["ok"]]
+                p95 = f"{np.percentile(latencies, 95):.3f}s" if latencies else "n/a"
+                print(f"  [{time.monotonic() - test_start:6.1f}s] {len(window) / report_interval:7.2f} req/s, "
+                      f"{errors} errors, p95 {p95}, {len(records)} done")
+
+        reporter = asyncio.ensure_future(report_progress())
+        try:
+            if rate is not None:
+                # Open loop: requests start on schedule whether or not earlier ones have finished.
+                tasks = []
+                for i, payload in enumerate(payloads):
+                    scheduled = test_start + i / rate
+                    if scheduled >= deadline:
+                        break
+                    await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+                    task = asyncio.ensure_future(_timed_request(client, api_url, api_headers, payload, test_start))
+                    task.add_done_callback(lambda t: records.append(t.result()))
+                    tasks.append(task)
+                await asyncio.gather(*tasks)
+            else:
+                # Closed loop: each virtual user sends its next query as soon as the last one finished.
+                async def user():
+                    while time.monotonic() < deadline:
+                        records.append(await _timed_request(client, api_url, api_headers, next(payloads), test_start))
+                await asyncio.gather(*(user() for _ in range(concurrency)))
+        finally:
+            reporter.cancel()
+    return records
+
+
+def run_load_test(api_url: str, api_headers: dict, domain_path: str, queries: list, duration_seconds: float,
+                  rate: float = None, concurrency: int = None, api_timeout: float = 30,
+                  sender_id: str = "loadtest", report_interval: float = LOAD_TEST_REPORT_INTERVAL_SECONDS,
+                  verify: bool = False) -> pd.DataFrame:
+    """
+    Replays queries (cycling through them) against the bot for duration_seconds.
+
+    Args:
+        api_url (str): Bot chat endpoint.
+        api_headers (dict): Request headers; 'Req-Date-Time' is set per request.
+        domain_path (str): Domain path sent in every payload.
+        queries (list): Queries to replay, in order, repeating as needed.
+        duration_seconds (float): How long to keep starting new requests. Requests in flight at
+            the end are allowed to finish.
+        rate (float, optional): Target requests per second (open loop). Mutually exclusive with concurrency.
+        concurrency (int, optional): Number of concurrent virtual users (closed loop).
+        api_timeout (float): Timeout per request in seconds.
+        sender_id (str): Sender ID for the API payload.
+        report_interval (float): Seconds between live progress lines.
+        verify (bool): Verify TLS certificates.
+
+    Returns:
+        pd.DataFrame: One row per request, ordered by start time, with started_at_seconds,
+                      finished_at_seconds, status_code, ok, error, ttfc_seconds, latency_seconds,
+                      chunk_count and response_chars.
+    """
+    if not queries:
+        raise ValueError("No queries to replay.")
+    if (rate is None) == (concurrency is None):
+        raise ValueError("Specify exactly one of rate or concurrency.")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive.")
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    records = asyncio.run(_run_load_test(api_url, api_headers, domain_path, list(queries), duration_seconds,
+                                         rate, concurrency, api_timeout, sender_id, report_interval, verify))
+    timings = pd.DataFrame.from_records(records, columns=[
+        "query", "started_at_seconds", "finished_at_seconds", "status_code", "ok", "error",
+        "ttfc_seconds", "latency_seconds", "chunk_count", "response_chars"
+    ])
+    return timings.sort_values("started_at_seconds", kind="stable").reset_index(drop=True)
+
+
+def _percentiles(values: pd.Series) -> dict:
+    values = values.dropna()
+    return {f"p{p}": float(np.percentile(values, p)) if len(values) else None for p in PERCENTILES}
+
+
+def summarize_load_test(timings: pd.DataFrame, interval_seconds: float = LOAD_TEST_REPORT_INTERVAL_SECONDS) -> dict:
+    """
+    Aggregates per-request timings.
+
+    Returns:
+        dict: 'requests', 'errors', 'error_rate', 'duration_seconds', 'throughput_rps',
+              'latency' and 'ttfc' percentile dicts (successful requests only), 'status_codes',
+              and 'timeline': a DataFrame with one row per interval of completion time
+              (requests, errors, throughput_rps, p50/p95/p99 latency).
+    """
+    successful = timings[timings["ok"]]
+    duration = float(timings["finished_at_seconds"].max()) if len(timings) else 0.0
+    timeline = pd.DataFrame(columns=["interval_start_seconds", "requests", "errors", "throughput_rps", "p50", "p95", "p99"])
+    if len(timings):
+        buckets = (timings["finished_at_seconds"] // interval_seconds).astype(int)
+        rows = []
+        for bucket, group in timings.groupby(buckets):
+            ok_group = group[group["ok"]]
+            rows.append({"interval_start_seconds": bucket * interval_seconds, "requests": len(group),
+                         "errors": int((~group["ok"]).sum()), "throughput_rps": len(ok_group) / interval_seconds,
+                         **_percentiles(ok_group["latency_seconds"])})
+        timeline = pd.DataFrame(rows)
+    return {
+        "requests": len(timings),
+        "errors": int((~timings["ok"]).sum()),
+        "error_rate": float((~timings["ok"]).mean()) if len(timings) else 0.0,
+        "duration_seconds": duration,
+        "throughput_rps": len(successful) / duration if duration > 0 else 0.0,
+        "latency": _percentiles(successful["latency_seconds"]),
+        "ttfc": _percentiles(successful["ttfc_seconds"]),
+        "status_codes": {("error" if pd.isna(code) else str(int(code))): int(count)
+                         for code, count in timings["status_code"].value_counts(dropna=False).items()},
+        "timeline": timeline,
+    }
+
+
+def format_load_test_summary(summary: dict) -> str:
+    """Human-readable report of summarize_load_test()."""
+    def fmt(percentiles):
+        return ", ".join(f"{name} {value:.3f}s" if value is not None else f"{name} n/a" for name, value in percentiles.items())
+
+    lines = [
+        f"Requests: {summary['requests']} in {summary['duration_seconds']:.1f}s; "
+        f"throughput {summary['throughput_rps']:.2f} successful req/s; "
+        f"errors {summary['errors']} ({summary['error_rate']:.1%}).",
+        f"Latency: {fmt(summary['latency'])}",
+        f"Time to first chunk: {fmt(summary['ttfc'])}",
+        "Status codes: " + ", ".join(f"{code} x{count}" for code, count in summary["status_codes"].items()),
+    ]
+    if len(summary["timeline"]):
+        lines.append("Over time:")
+        lines.append(summary["timeline"].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    return "\n".join(lines)
+
+
+def save_timings(timings: pd.DataFrame, output_path: str):
+    """Writes per-request timings as Parquet (.parquet, needs pyarrow) or CSV (anything else)."""
+    if output_path.lower().endswith(".parquet"):
+        timings.to_parquet(output_path, index=False)
+    else:
+        timings.to_csv(output_path, index=False, encoding="utf-8")
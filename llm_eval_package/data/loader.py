@@ -2,7 +2,7 @@
 import pandas as pd
 import json
 from llm_eval_package.config import REQUIRED_COLUMNS # Ensure this is correctly imported
-import streamlit as st
+from llm_eval_package.core.progress import notify
 
 class DataLoader:
     def __init__(self):
@@ -27,11 +27,11 @@ class DataLoader:
             df = pd.read_csv(file_uploader, dtype=dtype_spec if dtype_spec else None)
 
         except ValueError as ve: 
-             st.warning(f"Initial CSV load with specific 'id' dtype failed (this is okay if 'id' is missing or not strictly numeric): {ve}. Retrying generic load.")
+             notify(f"Initial CSV load with specific 'id' dtype failed (this is okay if 'id' is missing or not strictly numeric): {ve}. Retrying generic load.", "warning")
              if hasattr(file_uploader, 'seek'): file_uploader.seek(0)
              df = pd.read_csv(file_uploader)
         except Exception as e:
-            st.error(f"Error reading CSV file: {e}")
+            notify(f"Error reading CSV file: {e}", "error")
             return pd.DataFrame() # Return empty on critical error
         
         # Post-load conversion to ensure 'id' is string if it exists
@@ -56,10 +56,10 @@ class DataLoader:
                     data = json.loads(json_data)
                     df = pd.DataFrame(data)
                 except Exception as e:
-                    st.error(f"Error processing JSON file: {e}")
+                    notify(f"Error processing JSON file: {e}", "error")
                     return pd.DataFrame() 
             else:
-                st.error("Unsupported file format. Please upload a CSV or JSON file.")
+                notify("Unsupported file format. Please upload a CSV or JSON file.", "error")
                 return pd.DataFrame() 
 
             if not df.empty:
@@ -106,7 +106,7 @@ class DataLoader:
         for ecol_config_case in essential_for_app:
             if ecol_config_case not in df.columns or df[ecol_config_case].isnull().all():
                 error_message = f"Essential data column '{ecol_config_case}' is missing or entirely empty. Please check your uploaded file."
-                st.error(error_message)
+                notify(error_message, "error")
                 raise ValueError(error_message)
 
 # import pandas as pd
@@ -0,0 +1,147 @@
+# llm_eval_package/data/mock_bot_server.py
+"""
+Local stand-in for the RAG bot chat API, for testing and benchmarking the fetchers without
+the real endpoint or a token.
+
+It accepts the same POST payload ({"message", "senderId", "domain"}) and answers with an
+NDJSON body of {"data": ...} chunks sent with chunked transfer encoding, like the real bot.
+
+Run it with:
+    python -m llm_eval_package.data.mock_bot_server --port 8765 --delay 0.5
+and point the fetcher at http://127.0.0.1:8765/chat (e.g. `main.py fetch-responses --api_url ...`).
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockBotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, so connection pooling can be observed
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        with server.stats_lock:
+            server.request_count += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            try:
+                message = str(json.loads(body or b"{}").get("message", ""))
+            except json.JSONDecodeError:
+                self.send_error(400, "Invalid JSON payload")
+                return
+            if server.capacity and server.in_flight > server.capacity:
+                server.rejected_count += 1
+                self.send_error(429, "Too many concurrent requests")
+                return
+            if server.delay:
+                time.sleep(server.delay)
+            if server.failure_rate and random.random() < server.failure_rate:
+                self.send_error(503, "Simulated failure")
+                return
+
+            answer = f"Answer to: {message}"
+            words = answer.split(" ")
+            chunk_size = max(1, -(-len(words) // server.chunks))
+            parts = [" ".join(words[i:i + chunk_size]) + (" " if i + chunk_size < len(words) else "")
+                     for i in range(0, len(words), chunk_size)]
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, part in enumerate(parts):
+                if i and server.chunk_delay:
+                    time.sleep(server.chunk_delay)
+                self._send_chunk(json.dumps({"data": part}).encode("utf-8") + b"\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True # The client went away mid-answer (e.g. a killed fetch run)
+        finally:
+            with server.stats_lock:
+                server.in_flight -= 1
+
+
+class MockBotServer(ThreadingHTTPServer):
+    """Threaded mock bot server. Counters (request_count, max_in_flight, rejected_count) are readable while it runs."""
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0, failure_rate: float = 0.0,
+                 chunks: int = 3, chunk_delay: float = 0.0, capacity: int = 0, verbose: bool = False):
+        """
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free one (see .url).
+            delay (float): Seconds to wait before answering each request.
+            failure_rate (float): Fraction of requests answered with HTTP 503.
+            chunks (int): Number of NDJSON chunks each answer is split into.
+            chunk_delay (float): Seconds between chunks.
+            capacity (int): Requests beyond this many in flight get HTTP 429; 0 means unlimited.
+            verbose (bool): Log every request to stderr.
+        """
+        super().__init__((host, port), MockBotHandler)
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.chunks = max(1, int(chunks))
+        self.chunk_delay = chunk_delay
+        self.capacity = max(0, int(capacity))
+        self.verbose = verbose
+        self.stats_lock = threading.Lock()
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected_count = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/chat"
+
+    def start_in_thread(self) -> threading.Thread:
+        """Serves on a daemon thread and returns it; call shutdown() to stop."""
+        thread = threading.Thread(target=self.serve_forever, name="mock-bot-server", daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the RAG bot chat API.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds before each answer (default: 0.5).")
+    parser.add_argument("--failure_rate", "--failure-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 503 (default: 0).")
+    parser.add_argument("--chunks", type=int, default=3, help="NDJSON chunks per answer (default: 3).")
+    parser.add_argument("--chunk_delay", "--chunk-delay", type=float, default=0.0,
+                        help="Seconds between answer chunks (default: 0).")
+    parser.add_argument("--capacity", type=int, default=0,
+                        help="Answer HTTP 429 beyond this many concurrent requests (default: 0, unlimited).")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    server = MockBotServer(args.host, args.port, args.delay, args.failure_rate, args.chunks, args.chunk_delay,
+                           args.capacity, args.verbose)
+    print(f"Mock RAG bot listening on {server.url} (delay {args.delay}s, failure rate {args.failure_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
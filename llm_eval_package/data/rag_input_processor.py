@@ -1,10 +1,13 @@
 # llm_eval_package/data/rag_input_processor.py
-import requests
-import json
 import pandas as pd
-from datetime import datetime, timezone
-import urllib3
-import time
+
+from llm_eval_package.config import (
+    FETCH_CONCURRENCY, FETCH_TIMEOUT_SECONDS, FETCH_BACKOFF_BASE_SECONDS,
+    FETCH_CACHE_ENABLED, FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS, FETCH_CHECKPOINT_SUFFIX
+)
+from llm_eval_package.data.async_fetcher import AsyncBotFetcher, format_fetch_summary, add_response_columns
+from llm_eval_package.data.response_cache import ResponseCache
+from llm_eval_package.data.fetch_checkpoint import FetchCheckpoint
 
 # --- Default Configurations (Consider moving to a config file or managing securely) ---
 DEFAULT_API_URL = "https://s-studio-egpsg-sit-01.apps.ecpocpth001.sg.uobnet.com/chatassist/api/chat"
@@ -37,15 +40,24 @@ def fetch_bot_responses(input_csv_path: str, output_csv_path: str,
                         api_headers: dict = None,
                         domains: dict = None,
                         sender_id: str = "testusr",
-                        api_timeout: int = 30,
+                        api_timeout: int = FETCH_TIMEOUT_SECONDS,
                         max_retries: int = 2,
-                        retry_delay: int = 5):
+                        retry_delay: float = FETCH_BACKOFF_BASE_SECONDS,
+                        concurrency: int = FETCH_CONCURRENCY,
+                        use_cache: bool = FETCH_CACHE_ENABLED,
+                        refresh: bool = False):
     """
     Fetches responses from an RAG bot for queries in a CSV file and saves them.
 
+    When output_csv_path is a path, every finished response is also appended to a checkpoint
+    file next to it (output_csv_path + FETCH_CHECKPOINT_SUFFIX). If the run dies, calling this
+    again with the same input and output skips the rows already fetched successfully. The
+    output CSV is assembled from the checkpoint, which is deleted once no row has failed.
+
     Args:
         input_csv_path (str): Path to the input CSV with queries.
-        output_csv_path (str): Path to save the output CSV with an 'llm_output' column.
+        output_csv_path (str): Path to save the output CSV with an 'llm_output' column and the
+                               response_ttfc_seconds / response_latency_seconds / response_chunk_count columns.
         query_column (str): Name of the column in input_csv_path containing queries.
         domain_key (str): Key for the desired domain in the domains dictionary.
         api_url (str, optional): Custom API URL. Defaults to DEFAULT_API_URL.
@@ -56,7 +68,10 @@ def fetch_bot_responses(input_csv_path: str, output_csv_path: str,
         sender_id (str): Sender ID for the API payload.
         api_timeout (int): Timeout for API requests in seconds.
         max_retries (int): Maximum number of retries for failed API calls.
-        retry_delay (int): Delay between retries in seconds.
+        retry_delay (float): Base delay of the jittered exponential backoff between retries, in seconds.
+        concurrency (int): Initial number of API requests in flight; adapts to the backend from there.
+        use_cache (bool): Reuse unexpired answers from the persistent response cache (FETCH_CACHE_PATH).
+        refresh (bool): Refetch every query even if it is cached; the cache is updated with the new answers.
 
     Returns:
         str: Path to the output CSV file.
@@ -65,8 +80,6 @@ def fetch_bot_responses(input_csv_path: str, output_csv_path: str,
         FileNotFoundError: If input_csv_path does not exist.
         ValueError: If query_column is not in the input CSV or domain_key is invalid.
     """
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
     current_api_url = api_url or DEFAULT_API_URL
     # Use a copy of default headers to prevent modification of the global default
     current_api_headers = (api_headers or DEFAULT_API_HEADERS).copy()
@@ -93,71 +106,62 @@ def fetch_bot_responses(input_csv_path: str, output_csv_path: str,
     if "YOUR_EXPIRED_OR_PLACEHOLDER_TOKEN_HERE" in current_api_headers.get("Authorization", ""):
         print("Warning: API headers appear to use a placeholder token. Ensure a valid token is provided.")
 
-    responses_list = []
-    print(f"Fetching responses for {len(df)} queries using domain '{domain_key}' ({domain_path})...")
-
-    for idx, row in df.iterrows():
-        query_text = str(row[query_column]) # Ensure query_text is a string
-        current_api_headers["Req-Date-Time"] = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-
-        payload = {
-            "message": query_text,
-            "senderId": sender_id,
-            "domain": domain_path
-        }
-
-        attempt = 0
-        success = False
-        while attempt <= max_retries and not success:
-            try:
-                print(f"Attempt {attempt + 1} for query {idx + 1}/{len(df)}: '{query_text[:50]}...'")
-                response = requests.post(current_api_url, headers=current_api_headers,
-                                         data=json.dumps(payload), verify=False, timeout=api_timeout)
-                response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
-
-                full_message = ""
-                # Handle cases where response.text might be empty or not as expected
-                if response.text and response.text.strip():
-                    for line in response.text.strip().splitlines():
-                        try:
-                            obj = json.loads(line)
-                            full_message += str(obj.get("data", "")) # Ensure data is string
-                        except json.JSONDecodeError:
-                            print(f"  Warning: Non-JSON line in response for query {idx+1}: {line}")
-                            # If the line itself is the message (for non-streaming simple JSON response)
-                            if not full_message and attempt == 0: # Append only if full_message is empty and it's the first try.
-                                full_message += line 
-                            continue
-                else: # Handle empty response
-                    print(f"  Warning: Empty response text for query {idx+1}")
-                    full_message = "Error: Empty API response"
-
-
-                responses_list.append(full_message)
-                print(f"  Success (Status {response.status_code}) for query {idx + 1}.")
-                success = True
-            except requests.exceptions.RequestException as e:
-                print(f"  API Error (Attempt {attempt + 1}) for query {idx + 1}: {e}")
-                if attempt == max_retries:
-                    responses_list.append(f"Error: Max retries reached. Last error: {str(e)}")
-                else:
-                    time.sleep(retry_delay) # Wait before retrying
-            except Exception as e:
-                print(f"  Unexpected Error (Attempt {attempt + 1}) for query {idx + 1}: {e}")
-                if attempt == max_retries:
-                     responses_list.append(f"Error: Max retries reached. Last unexpected error: {str(e)}")
-                else:
-                    time.sleep(retry_delay)
-            attempt += 1
-        
-        if not success and len(responses_list) != (idx + 1): # Ensure placeholder is added if all retries fail
-             responses_list.append(f"Error: Failed to get response for query '{query_text[:50]}...' after {max_retries+1} attempts.")
-
-
-    df['llm_output'] = responses_list  # This column name is what the eval framework expects
+    queries = df[query_column].astype(str).tolist()
+    checkpoint = None
+    completed = {}
+    if isinstance(output_csv_path, str):
+        checkpoint = FetchCheckpoint(output_csv_path + FETCH_CHECKPOINT_SUFFIX,
+                                     FetchCheckpoint.fingerprint(current_api_url, domain_path, queries))
+        completed = {row: result for row, result in checkpoint.open().items() if result["ok"]}
+        if completed:
+            print(f"Resuming from checkpoint '{checkpoint.path}': {len(completed)} of {len(df)} responses already fetched.")
+    pending_rows = [row for row in range(len(queries)) if row not in completed]
+
+    print(f"Fetching responses for {len(pending_rows)} queries using domain '{domain_key}' ({domain_path}), "
+          f"{concurrency} at a time...")
+
+    response_cache = ResponseCache(FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS) if use_cache else None
+    fetcher = AsyncBotFetcher(current_api_url, current_api_headers, domain_path, sender_id=sender_id,
+                              concurrency=concurrency, api_timeout=api_timeout,
+                              max_retries=max_retries, retry_delay=retry_delay,
+                              response_cache=response_cache, refresh=refresh)
+    report_every = max(1, len(pending_rows) // 20)
+
+    def report_progress(done, total, successful):
+        if done % report_every == 0 or done == total:
+            print(f"  {done}/{total} queries done ({successful} successful)")
+
+    def record_result(position, result):
+        checkpoint.append(pending_rows[position], result)
+
+    try:
+        results = fetcher.fetch([queries[row] for row in pending_rows], progress_callback=report_progress,
+                                result_callback=record_result if checkpoint is not None else None)
+    finally:
+        if response_cache is not None:
+            response_cache.close()
+        if checkpoint is not None:
+            checkpoint.close()
+    print(format_fetch_summary(fetcher.last_stats))
+
+    if checkpoint is not None:
+        recorded = checkpoint.load()
+        row_results = [recorded[row] for row in range(len(df))]
+        failed_rows = sum(not result["ok"] for result in row_results)
+    else:
+        row_results = results
+        failed_rows = fetcher.last_stats["failed"]
+    if failed_rows:
+        print(f"{failed_rows} queries failed and have an 'Error: ...' value in 'llm_output'."
+              + (f" Re-run the same command to retry just those (checkpoint: '{checkpoint.path}')." if checkpoint else ""))
+
+    # 'llm_output' is the column the eval framework expects; the timing columns feed the Latency metric.
+    add_response_columns(df, row_results)
     
     if isinstance(output_csv_path, str):
         df.to_csv(output_csv_path, index=False, encoding='utf-8')
+        if not failed_rows:
+            checkpoint.remove()
         print(f"\nResponses fetched and saved to '{output_csv_path}' in the 'llm_output' column.")
         return output_csv_path
     elif hasattr(output_csv_path, 'write'): # Check if it's a file-like object for pandas to_csv
@@ -0,0 +1,88 @@
+# llm_eval_package/data/response_cache.py
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+class ResponseCache:
+    """
+    Persistent cache of RAG bot responses, keyed by (api_url, domain path, query).
+
+    Entries older than ttl_seconds are treated as missing, so answers are refetched once the bot
+    (or its knowledge base) may have changed. Only successful responses are stored, together
+    with the timings of the request that fetched them.
+    Every process using the same db_path shares the cache.
+    """
+
+    _TIMING_FIELDS = ("ttfc_seconds", "latency_seconds", "chunk_count")
+
+    def __init__(self, db_path: str, ttl_seconds: float):
+        """
+        Args:
+            db_path (str): SQLite file holding the cache; created if missing.
+            ttl_seconds (float): Age after which an entry is no longer served. None or 0 = never expires.
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, api_url TEXT, domain TEXT, "
+            "query TEXT, response TEXT, fetched_at REAL)"
+        )
+        existing_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for field in self._TIMING_FIELDS: # Caches created before timings were recorded
+            if field not in existing_columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {field} {'INTEGER' if field == 'chunk_count' else 'REAL'}")
+
+    @staticmethod
+    def _key(api_url: str, domain_path: str, query: str) -> str:
+        return hashlib.sha256(f"{api_url}\0{domain_path}\0{query}".encode("utf-8")).hexdigest()
+
+    def get(self, api_url: str, domain_path: str, query: str):
+        """
+        Returns the cached entry as a dict with 'llm_output' and the timing fields
+        (ttfc_seconds, latency_seconds, chunk_count), or None if missing or older than the TTL.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT fetched_at, response, {', '.join(self._TIMING_FIELDS)} FROM responses WHERE key = ?",
+                (self._key(api_url, domain_path, query),)
+            ).fetchone()
+            if row is None or (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(zip(("llm_output",) + self._TIMING_FIELDS, row[1:]))
+
+    def put(self, api_url: str, domain_path: str, query: str, result: dict):
+        """Stores a fetch result: its 'llm_output' plus any timing fields it carries."""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO responses (key, api_url, domain, query, response, fetched_at, "
+                f"{', '.join(self._TIMING_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(api_url, domain_path, query), api_url, domain_path, query, result["llm_output"],
+                 time.time(), *(result.get(field) for field in self._TIMING_FIELDS))
+            )
+
+    def purge_expired(self) -> int:
+        """Deletes entries older than the TTL; returns how many were removed."""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            return self._conn.execute("DELETE FROM responses WHERE fetched_at < ?",
+                                      (time.time() - self.ttl_seconds,)).rowcount
+
+    def get_stats(self) -> dict:
+        """Returns cumulative hit/miss counters for this process."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
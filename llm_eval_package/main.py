@@ -14,9 +14,12 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Import components from the llm_eval_package
-from llm_eval_package.core.engine import Evaluator
+from llm_eval_package.core.engine import Evaluator, format_run_summary
+from llm_eval_package.core.streaming import iter_input_chunks, ChunkedResultWriter, RunningAggregates
 from llm_eval_package.config import (
-    METRIC_THRESHOLDS, AVAILABLE_METRICS, TASK_METRIC_PRESELECTION, TASK_TYPE_RAG_FAQ, REQUIRED_COLUMNS
+    METRIC_THRESHOLDS, AVAILABLE_METRICS, TASK_METRICS_PRESELECTION as TASK_METRIC_PRESELECTION,
+    TASK_TYPE_RAG_FAQ, REQUIRED_COLUMNS, EVALUATION_EXECUTOR, EVALUATION_WORKERS,
+    STREAM_CHUNK_SIZE, FETCH_CONCURRENCY, LOAD_TEST_REPORT_INTERVAL_SECONDS
 )
 
 def parse_custom_thresholds(s):
@@ -34,6 +37,92 @@ def parse_custom_thresholds(s):
             raise argparse.ArgumentTypeError(f"Invalid threshold format: '{item}'. Must be 'MetricName=Value'.")
     return thresholds
 
+def resolve_metric_selection(args):
+    """Returns (selected metrics, sensitive keywords) for the evaluate command."""
+    selected_metrics = []
+    if args.metrics:
+        selected_metrics = [m.strip() for m in args.metrics.split(',') if m.strip() in AVAILABLE_METRICS]
+        invalid_metrics = [m.strip() for m in args.metrics.split(',') if m.strip() not in AVAILABLE_METRICS]
+        if invalid_metrics:
+            print(f"Warning: Ignoring invalid metrics: {', '.join(invalid_metrics)}")
+        if not selected_metrics: 
+            print(f"Warning: No valid metrics found in '{args.metrics}'. Using default metrics for task type '{args.task_type}'.")
+            selected_metrics = TASK_METRIC_PRESELECTION.get(args.task_type, ["Semantic Similarity"])
+    else:
+        selected_metrics = TASK_METRIC_PRESELECTION.get(args.task_type, ["Semantic Similarity"])
+    
+    if not selected_metrics:
+        print(f"Error: No metrics selected or defaulted for task type '{args.task_type}'.")
+        sys.exit(1)
+    print(f"Selected metrics for evaluation: {', '.join(selected_metrics)}")
+
+    sensitive_keywords_list = []
+    if args.sensitive_keywords:
+        sensitive_keywords_list = [k.strip() for k in args.sensitive_keywords.split(',') if k.strip()]
+        print(f"Sensitive keywords for Safety metric: {sensitive_keywords_list}")
+    elif "Safety" in selected_metrics:
+        print("Warning: 'Safety' metric selected but no --sensitive_keywords provided.")
+    return selected_metrics, sensitive_keywords_list
+
+def resolve_output_path(args):
+    """Returns (output path, report format), inferring the format from the file extension when present."""
+    output_path = Path(args.output_file)
+    output_format_from_ext = output_path.suffix.lower().lstrip('.')
+    
+    final_report_format = args.report_format
+    if output_format_from_ext in ["csv", "json", "jsonl"]:
+        final_report_format = output_format_from_ext
+        if output_format_from_ext != args.report_format:
+             print(f"Info: Output format inferred as '{final_report_format}' from --output_file extension.")
+    elif not output_path.suffix: 
+        output_path = output_path.with_suffix(f".{args.report_format}")
+    return output_path, final_report_format
+
+def run_streaming_evaluation(args, evaluator_instance):
+    """
+    evaluate --stream: reads the input --chunk_size rows at a time, evaluates each chunk and appends
+    it to the output file, so memory stays bounded by the chunk size rather than the dataset size.
+    """
+    selected_metrics, sensitive_keywords_list = resolve_metric_selection(args)
+    output_path, final_report_format = resolve_output_path(args)
+    aggregates = RunningAggregates(selected_metrics)
+    mandatory_cols_eval = ['query', 'llm_output', 'reference_answer']
+
+    print(f"Streaming evaluation of '{args.input_file}' in chunks of {args.chunk_size} rows into '{output_path}'...")
+    try:
+        with ChunkedResultWriter(output_path, final_report_format) as writer:
+            for df_chunk in iter_input_chunks(args.input_file, args.chunk_size):
+                missing_columns_eval = [col for col in mandatory_cols_eval if col not in df_chunk.columns]
+                if missing_columns_eval:
+                    print(f"Error: Missing required columns in '{args.input_file}' for evaluation: {', '.join(missing_columns_eval)}.")
+                    sys.exit(1)
+                for col in REQUIRED_COLUMNS:
+                    if col not in df_chunk.columns:
+                        df_chunk[col] = ''
+                df_evaluated = evaluator_instance.evaluate_dataframe(
+                    df_chunk, selected_metrics,
+                    custom_thresholds=args.custom_thresholds,
+                    sensitive_keywords=sensitive_keywords_list,
+                    short_circuit=args.short_circuit
+                )
+                writer.write(df_evaluated)
+                aggregates.update(df_evaluated, evaluator_instance.last_run_summary)
+                print(f"  ...{aggregates.rows} rows evaluated")
+    except FileNotFoundError:
+        print(f"Error: Input file not found: {args.input_file}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error during streaming evaluation: {e}")
+        print(traceback.format_exc())
+        sys.exit(1)
+    finally:
+        evaluator_instance.close()
+
+    print("Evaluation complete.")
+    print(format_run_summary(aggregates.as_run_summary()))
+    print(aggregates.format())
+    print(f"Results saved successfully to '{output_path}'")
+
 def main():
     parser = argparse.ArgumentParser(
         description="LLM Evaluation Tool - Command Line Interface",
@@ -71,10 +160,33 @@ def main():
         help="Comma-separated list of sensitive keywords for the 'Safety' metric."
     )
     eval_parser.add_argument(
-        "--report_format", type=str, default="csv", choices=["csv", "json"],
+        "--report_format", type=str, default="csv", choices=["csv", "json", "jsonl"],
         help="Output format for the results file (determines extension if not in output_file)."
     )
 
+    eval_parser.add_argument(
+        "--executor", type=str, default=EVALUATION_EXECUTOR, choices=["serial", "process"],
+        help="'process' scores CPU-bound metrics (e.g. Fact Adherence) across a pool of worker processes."
+    )
+    eval_parser.add_argument(
+        "--workers", type=int, default=EVALUATION_WORKERS,
+        help="Number of worker processes for --executor process (default: number of CPU cores)."
+    )
+
+    eval_parser.add_argument(
+        "--short_circuit", "--short-circuit", action="store_true",
+        help=("Run metrics cheapest-first and skip the remaining metrics for rows whose overall result "
+              "is already decided (skipped cells are marked 'Skipped').")
+    )
+    eval_parser.add_argument(
+        "--stream", action="store_true",
+        help="Evaluate the input (CSV or JSON Lines) in chunks and append results to the output as they are ready."
+    )
+    eval_parser.add_argument(
+        "--chunk_size", "--chunk-size", type=int, default=STREAM_CHUNK_SIZE,
+        help=f"Rows per chunk for --stream (default: {STREAM_CHUNK_SIZE})."
+    )
+
     fetch_parser = subparsers.add_parser("fetch-responses", help="Fetch responses from an RAG bot for a list of queries and prepare for evaluation.")
     fetch_parser.add_argument(
         "--input_queries_csv", type=str, required=True,
@@ -100,11 +212,73 @@ def main():
         "--api_token", type=str, default=None,
         help="Bearer token for API authorization. Overrides default/placeholder in rag_input_processor.py."
     )
+    fetch_parser.add_argument(
+        "--concurrency", type=int, default=FETCH_CONCURRENCY,
+        help=f"Initial number of API requests in flight; adapts to the backend's latency and errors (default: {FETCH_CONCURRENCY})."
+    )
+    fetch_parser.add_argument(
+        "--refresh", action="store_true",
+        help="Ignore cached bot responses and refetch every query (the cache is updated with the new answers)."
+    )
+    fetch_parser.add_argument(
+        "--no_cache", "--no-cache", action="store_true",
+        help="Neither read nor write the persistent response cache."
+    )
+
+    load_parser = subparsers.add_parser("load-test", help="Replay queries against the RAG bot at a target rate or concurrency and report latency percentiles, errors and throughput.")
+    load_parser.add_argument(
+        "--input_queries_csv", type=str, required=True,
+        help="Path to the CSV file with the queries to replay (cycled for the whole duration)."
+    )
+    load_parser.add_argument(
+        "--query_column", type=str, default="query",
+        help="Name of the column in --input_queries_csv that contains the queries."
+    )
+    load_parser.add_argument(
+        "--domain_key", type=str, default="SG Branch",
+        help="Domain key for RAG bot API. Check llm_eval_package/data/rag_input_processor.py for defaults."
+    )
+    load_parser.add_argument(
+        "--api_url", type=str, default=None,
+        help="Custom API URL for the RAG bot (e.g. a local mock server). Overrides default in rag_input_processor.py."
+    )
+    load_parser.add_argument(
+        "--api_token", type=str, default=None,
+        help="Bearer token for API authorization. Overrides default/placeholder in rag_input_processor.py."
+    )
+    load_parser.add_argument(
+        "--duration", type=float, default=60.0,
+        help="Seconds to keep sending requests (default: 60). Requests in flight at the end are allowed to finish."
+    )
+    load_mode = load_parser.add_mutually_exclusive_group()
+    load_mode.add_argument(
+        "--rate", type=float, default=None,
+        help="Target requests per second (open loop: requests start on schedule regardless of responses)."
+    )
+    load_mode.add_argument(
+        "--concurrency", type=int, default=None,
+        help=f"Number of concurrent virtual users, each sending its next query when the last one returns (default: {FETCH_CONCURRENCY})."
+    )
+    load_parser.add_argument(
+        "--api_timeout", "--api-timeout", type=float, default=30.0,
+        help="Timeout per request in seconds (default: 30)."
+    )
+    load_parser.add_argument(
+        "--report_interval", "--report-interval", type=float, default=LOAD_TEST_REPORT_INTERVAL_SECONDS,
+        help=f"Seconds per live progress line and per row of the over-time report (default: {LOAD_TEST_REPORT_INTERVAL_SECONDS})."
+    )
+    load_parser.add_argument(
+        "--output_file", type=str, default=None,
+        help="Optional path for per-request timings: .parquet for Parquet, anything else is written as CSV."
+    )
 
     args = parser.parse_args()
 
     if args.command == "evaluate":
-        evaluator_instance = Evaluator() 
+        evaluator_instance = Evaluator(executor=args.executor, workers=args.workers)
+        if args.stream:
+            run_streaming_evaluation(args, evaluator_instance)
+            return
 
         print(f"Loading data from {args.input_file} for evaluation...")
         try:
@@ -116,8 +290,10 @@ def main():
                 with open(input_file_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 df_original = pd.DataFrame(data)
+            elif file_extension == 'jsonl':
+                df_original = pd.read_json(input_file_path, lines=True)
             else:
-                print(f"Error: Unsupported file format: '{file_extension}'. Please use .csv or .json.")
+                print(f"Error: Unsupported file format: '{file_extension}'. Please use .csv, .json or .jsonl.")
                 sys.exit(1)
 
             if df_original.empty:
@@ -146,54 +322,26 @@ def main():
             print(traceback.format_exc())
             sys.exit(1)
 
-        selected_metrics = []
-        if args.metrics:
-            selected_metrics = [m.strip() for m in args.metrics.split(',') if m.strip() in AVAILABLE_METRICS]
-            invalid_metrics = [m.strip() for m in args.metrics.split(',') if m.strip() not in AVAILABLE_METRICS]
-            if invalid_metrics:
-                print(f"Warning: Ignoring invalid metrics: {', '.join(invalid_metrics)}")
-            if not selected_metrics: 
-                print(f"Warning: No valid metrics found in '{args.metrics}'. Using default metrics for task type '{args.task_type}'.")
-                selected_metrics = TASK_METRIC_PRESELECTION.get(args.task_type, ["Semantic Similarity"])
-        else:
-            selected_metrics = TASK_METRIC_PRESELECTION.get(args.task_type, ["Semantic Similarity"])
-        
-        if not selected_metrics:
-            print(f"Error: No metrics selected or defaulted for task type '{args.task_type}'.")
-            sys.exit(1)
-        print(f"Selected metrics for evaluation: {', '.join(selected_metrics)}")
-
-        sensitive_keywords_list = []
-        if args.sensitive_keywords:
-            sensitive_keywords_list = [k.strip() for k in args.sensitive_keywords.split(',') if k.strip()]
-            print(f"Sensitive keywords for Safety metric: {sensitive_keywords_list}")
-        elif "Safety" in selected_metrics:
-            print("Warning: 'Safety' metric selected but no --sensitive_keywords provided.")
+        selected_metrics, sensitive_keywords_list = resolve_metric_selection(args)
 
         print("Running evaluation...")
         try:
             df_evaluated = evaluator_instance.evaluate_dataframe(
-                df_original.copy(), 
+                df_original, 
                 selected_metrics,
                 custom_thresholds=args.custom_thresholds,
-                sensitive_keywords=sensitive_keywords_list
+                sensitive_keywords=sensitive_keywords_list,
+                short_circuit=args.short_circuit
             )
             print("Evaluation complete.")
+            print(format_run_summary(evaluator_instance.last_run_summary))
+            evaluator_instance.close()
         except Exception as e:
             print(f"Error during evaluation: {e}")
             print(traceback.format_exc())
             sys.exit(1)
 
-        output_path = Path(args.output_file)
-        output_format_from_ext = output_path.suffix.lower().lstrip('.')
-        
-        final_report_format = args.report_format
-        if output_format_from_ext in ["csv", "json"]:
-            final_report_format = output_format_from_ext
-            if output_format_from_ext != args.report_format:
-                 print(f"Info: Output format inferred as '{final_report_format}' from --output_file extension.")
-        elif not output_path.suffix: 
-            output_path = output_path.with_suffix(f".{args.report_format}")
+        output_path, final_report_format = resolve_output_path(args)
 
         print(f"Saving results to '{output_path}' in {final_report_format} format...")
         try:
@@ -201,6 +349,8 @@ def main():
                 df_evaluated.to_csv(output_path, index=False, encoding='utf-8')
             elif final_report_format == "json":
                 df_evaluated.to_json(output_path, orient="records", indent=4, force_ascii=False)
+            elif final_report_format == "jsonl":
+                df_evaluated.to_json(output_path, orient="records", lines=True, force_ascii=False)
             print(f"Results saved successfully to '{output_path}'")
         except Exception as e:
             print(f"Error saving results: {e}")
@@ -225,7 +375,10 @@ def main():
                 query_column=args.query_column,
                 domain_key=args.domain_key,
                 api_url=args.api_url, 
-                api_headers=headers_for_fetch
+                api_headers=headers_for_fetch,
+                concurrency=args.concurrency,
+                use_cache=not args.no_cache,
+                refresh=args.refresh
             )
             print(f"\nSuccessfully fetched responses and saved to '{args.output_eval_data_csv}'")
             print(f"This file can now be used as --input_file for the 'evaluate' command.")
@@ -240,5 +393,44 @@ def main():
             print(traceback.format_exc())
             sys.exit(1)
 
+    elif args.command == "load-test":
+        try:
+            from llm_eval_package.data.rag_input_processor import DEFAULT_API_URL, DEFAULT_API_HEADERS, DEFAULT_DOMAINS
+            from llm_eval_package.data.load_test import run_load_test, summarize_load_test, format_load_test_summary, save_timings
+
+            df_queries = pd.read_csv(args.input_queries_csv)
+            if args.query_column not in df_queries.columns:
+                raise ValueError(f"Query column '{args.query_column}' not found in the input data.")
+            queries = df_queries[args.query_column].dropna().astype(str).tolist()
+            domain_path = DEFAULT_DOMAINS.get(args.domain_key)
+            if not domain_path:
+                raise ValueError(f"Domain key '{args.domain_key}' not found. Available keys: {list(DEFAULT_DOMAINS.keys())}")
+            headers = DEFAULT_API_HEADERS.copy()
+            if args.api_token:
+                headers["Authorization"] = f"Bearer {args.api_token}"
+            concurrency = None if args.rate is not None else (args.concurrency or FETCH_CONCURRENCY)
+            mode = f"{args.rate:g} req/s" if args.rate is not None else f"{concurrency} concurrent users"
+            print(f"Load-testing '{args.domain_key}' ({domain_path}) at {mode} for {args.duration:g}s "
+                  f"with {len(queries)} distinct queries...")
+
+            timings = run_load_test(args.api_url or DEFAULT_API_URL, headers, domain_path, queries, args.duration,
+                                    rate=args.rate, concurrency=concurrency, api_timeout=args.api_timeout,
+                                    report_interval=args.report_interval)
+            print("\n--- Load Test Report ---")
+            print(format_load_test_summary(summarize_load_test(timings, args.report_interval)))
+            if args.output_file:
+                save_timings(timings, args.output_file)
+                print(f"\nPer-request timings saved to '{args.output_file}'")
+        except FileNotFoundError as e:
+            print(f"Error: Input queries file not found: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Configuration error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"An unexpected error occurred during load-test: {e}")
+            print(traceback.format_exc())
+            sys.exit(1)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
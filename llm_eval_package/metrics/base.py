@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+import numpy as np
+
+from llm_eval_package.metrics.text_artifacts import artifact_name
 
 class BaseMetric(ABC):
     """
@@ -7,6 +10,25 @@ class BaseMetric(ABC):
     and implement the abstract methods.
     """
 
+    # Set to True by metrics that override compute_batch with a genuinely vectorized path.
+    supports_batch = False
+    # DataFrame columns this metric reads per row. Columns beyond query/llm_output/reference_answer
+    # are passed to compute() as keyword arguments of the same name (e.g. required_facts).
+    input_fields = ('query', 'llm_output', 'reference_answer')
+    # (input field, artifact kind) pairs of shared preprocessing this metric reads, e.g.
+    # ('llm_output', 'word_set'). The Evaluator builds each artifact once per unique text for all
+    # metrics and passes it as the keyword argument "<field>_<kind>"; see metrics/text_artifacts.py.
+    text_artifacts = ()
+    # Set to True by pure-Python, CPU-heavy metrics that benefit from Evaluator(executor="process").
+    # Each worker builds its own instance through a MetricRegistry.
+    cpu_bound = False
+    # Rough relative cost of scoring one row. With short-circuit evaluation the Evaluator runs
+    # metrics cheapest-first and skips the remaining ones for rows whose verdict is decided.
+    cost = 1.0
+    # Suffixes of the per-row explanation columns compute_batch_details() returns; the Evaluator
+    # adds each as a "<metric name> <suffix>" column.
+    detail_columns = ()
+
     def __init__(self, name: str):
         """
         Initializes the BaseMetric with a given name.
@@ -33,6 +55,64 @@ class BaseMetric(ABC):
         """
         pass
 
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """
+        Computes scores for many test cases at once.
+        The default implementation simply calls compute() row by row; metrics that can
+        score a whole column more efficiently override this and set supports_batch = True.
+
+        Args:
+            llm_outputs (list): The LLM outputs, one per test case.
+            reference_answers (list, optional): The reference answers, aligned with llm_outputs.
+            queries (list, optional): The user queries, aligned with llm_outputs.
+            **kwargs: Per-row lists for any extra input_fields (e.g. required_facts) and
+                      text_artifacts, plus run-level keyword arguments passed through to
+                      compute() unchanged.
+
+        Returns:
+            np.ndarray: A float array of scores aligned with llm_outputs.
+        """
+        n = len(llm_outputs)
+        reference_answers = reference_answers if reference_answers is not None else [None] * n
+        queries = queries if queries is not None else [None] * n
+        row_fields = {f: kwargs.pop(f) for f in self.row_argument_names() if f in kwargs}
+        return np.array([
+            self.compute(llm_output=llm_outputs[i], reference_answer=reference_answers[i], query=queries[i],
+                         **{f: values[i] for f, values in row_fields.items()}, **kwargs)
+            for i in range(n)
+        ], dtype=float)
+
+    def compute_batch_details(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> tuple:
+        """
+        Scores plus optional per-row explanations shown next to them (e.g. which keywords matched),
+        from the same pass. Takes the same arguments as compute_batch(). The Evaluator calls this
+        instead of compute_batch(), so details follow score reuse, deduplication and skipping.
+
+        Returns:
+            tuple: (scores as from compute_batch(), dict of detail_columns suffix -> list aligned
+                    with llm_outputs). The default returns compute_batch() and no details.
+        """
+        return self.compute_batch(llm_outputs, reference_answers, queries, **kwargs), {}
+
+    def row_argument_names(self) -> tuple:
+        """Per-row keyword arguments of compute(): extra input_fields plus text artifact names."""
+        return tuple(f for f in self.input_fields if f not in ('query', 'llm_output', 'reference_answer')) + \
+            tuple(artifact_name(field, kind) for field, kind in self.text_artifacts)
+
+    def get_config_fingerprint(self) -> str:
+        """
+        Returns a string identifying any instance configuration that changes this metric's scores
+        (e.g. the model it loads). Used to decide whether previously computed scores can be reused.
+        """
+        return ""
+
+    def get_stats(self) -> dict:
+        """
+        Returns cumulative numeric counters (e.g. cache hits) that the Evaluator turns into
+        per-run deltas for its run summary. Metrics without counters return an empty dict.
+        """
+        return {}
+
     @abstractmethod
     def get_score_description(self, score: float) -> str:
         """
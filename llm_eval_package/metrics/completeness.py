@@ -1,4 +1,7 @@
+import numpy as np
+
 from llm_eval_package.metrics.base import BaseMetric # Updated import path
+from llm_eval_package.metrics.text_artifacts import get_artifact, get_reference_coverage
 
 class CompletenessMetric(BaseMetric):
     """
@@ -6,6 +9,11 @@ class CompletenessMetric(BaseMetric):
     This is a placeholder and would require a more sophisticated NLP model for actual implementation.
     """
 
+    supports_batch = True
+    input_fields = ('llm_output', 'reference_answer')
+    text_artifacts = (('llm_output', 'lower'), ('reference_answer', 'lower'), ('llm_output', 'reference_coverage'))
+    cost = 2.0
+
     def __init__(self):
         """
         Initializes the CompletenessMetric.
@@ -22,7 +30,7 @@ class CompletenessMetric(BaseMetric):
             llm_output (str): The output generated by the LLM.
             reference_answer (str): The human-written reference answer.
             query (str, optional): The user's input query (not used by this metric).
-            **kwargs: Additional keyword arguments (not used by this metric).
+            **kwargs: Optional precomputed llm_output_lower / reference_answer_lower.
 
         Returns:
             float: A placeholder score (e.g., based on length or a simple keyword match).
@@ -31,8 +39,8 @@ class CompletenessMetric(BaseMetric):
             return 0.0
 
         # Placeholder logic: simple word overlap ratio
-        llm_words = set(llm_output.lower().split())
-        ref_words = set(reference_answer.lower().split())
+        llm_words = set(get_artifact(kwargs, 'llm_output', 'lower', llm_output).split())
+        ref_words = set(get_artifact(kwargs, 'reference_answer', 'lower', reference_answer).split())
 
         if not ref_words:
             return 1.0 # If reference is empty, consider LLM output complete (or handle as error)
@@ -41,6 +49,16 @@ class CompletenessMetric(BaseMetric):
         score = len(common_words) / len(ref_words)
         return score
 
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """
+        Scores every row at once from the word overlap the Evaluator builds once per run as the
+        reference_coverage text artifact (shared with Trust & Factuality).
+        """
+        n = len(llm_outputs)
+        reference_answers = reference_answers if reference_answers is not None else [None] * n
+        valid_rows = np.fromiter((bool(out) and bool(ref) for out, ref in zip(llm_outputs, reference_answers)), dtype=bool, count=n)
+        return np.where(valid_rows, get_reference_coverage(kwargs, llm_outputs, reference_answers), 0.0)
+
     def get_score_description(self, score: float) -> str:
         """
         Returns a description for the given completeness score.
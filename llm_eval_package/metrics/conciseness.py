@@ -1,3 +1,5 @@
+import numpy as np
+
 from llm_eval_package.metrics.base import BaseMetric # Updated import path
 
 class ConcisenessMetric(BaseMetric):
@@ -6,6 +8,10 @@ class ConcisenessMetric(BaseMetric):
     This is a placeholder and would require a more sophisticated NLP model for actual implementation.
     """
 
+    supports_batch = True
+    input_fields = ('llm_output',)
+    ideal_word_count = 20
+
     def __init__(self):
         """
         Initializes the ConcisenessMetric.
@@ -35,7 +41,7 @@ class ConcisenessMetric(BaseMetric):
         word_count = len(llm_output.split())
         # Assume an ideal word count for a concise answer, e.g., 20 words.
         # This would need to be context-dependent in a real scenario.
-        ideal_word_count = 20
+        ideal_word_count = self.ideal_word_count
 
         if word_count <= ideal_word_count:
             return 1.0 # Perfectly concise if within ideal limit
@@ -45,6 +51,15 @@ class ConcisenessMetric(BaseMetric):
             score = max(0.0, 1.0 - ((word_count - ideal_word_count) / ideal_word_count))
             return score
 
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """
+        One word-count pass over the column (str.split per output, collected straight into a
+        NumPy array), then the score formula applied to all counts at once.
+        """
+        word_counts = np.fromiter((len(t.split()) if t else 0 for t in llm_outputs), dtype=float, count=len(llm_outputs))
+        excess = (word_counts - self.ideal_word_count) / self.ideal_word_count
+        return np.where(word_counts <= self.ideal_word_count, 1.0, np.maximum(0.0, 1.0 - excess))
+
     def get_score_description(self, score: float) -> str:
         """
         Returns a description for the given conciseness score.
@@ -0,0 +1,187 @@
+# llm_eval_package/metrics/embedding_cache.py
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed cache of sentence embeddings.
+
+    Embeddings live in a memory-mapped float32 file (one fixed-size slot per text) and a small
+    SQLite index maps each key to its slot. Keys are the SHA-256 of the model name plus the
+    normalized text, so the same text embedded by a different model never collides.
+    When the cache holds max_entries vectors, the least recently used slots are reused.
+
+    Every process pointing at the same cache_dir (CLI, API workers, Streamlit) shares the cache.
+    Both lookups and stores hold SQLite's write lock while they touch the vectors file, so a
+    lookup never reads a slot that another process is evicting and refilling.
+    """
+
+    _VECTORS_FILE = "vectors.f32"
+    _INDEX_FILE = "index.sqlite"
+    _SQLITE_MAX_VARS = 900  # stay under SQLite's default host-parameter limit
+
+    def __init__(self, cache_dir: str, model_name: str, dim: int, max_entries: int = 100_000):
+        """
+        Opens (or creates) the cache for one model.
+
+        Args:
+            cache_dir (str): Base directory for all embedding caches.
+            model_name (str): Model name or path; a subdirectory is created per model.
+            dim (int): Embedding dimension of the model.
+            max_entries (int): Maximum number of embeddings kept before LRU eviction.
+        """
+        self.model_name = os.path.basename(os.path.normpath(str(model_name)))
+        self.dim = int(dim)
+        self.max_entries = int(max_entries)
+        self.directory = os.path.join(cache_dir, re.sub(r'[^A-Za-z0-9._-]+', '_', self.model_name))
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors_path = os.path.join(self.directory, self._VECTORS_FILE)
+        self._conn = sqlite3.connect(os.path.join(self.directory, self._INDEX_FILE), timeout=30,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER UNIQUE, last_used REAL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+
+        stored_dim = self._conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        if stored_dim is not None and int(stored_dim[0]) != self.dim:
+            # The model behind this name changed shape; the old vectors are unusable.
+            self._conn.execute("DELETE FROM entries")
+            if os.path.exists(self._vectors_path): os.remove(self._vectors_path)
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dim', ?)", (str(self.dim),))
+
+        self._vectors = None
+        self._capacity = 0
+        self._map_vectors()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalization applied before hashing; only changes that cannot alter the embedding."""
+        return unicodedata.normalize('NFC', str(text)).strip()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{self.normalize_text(text)}".encode('utf-8')).hexdigest()
+
+    def _map_vectors(self, min_capacity: int = 0):
+        """(Re)maps the vectors file, growing it to hold at least min_capacity slots."""
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        current_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        if min_capacity > current_rows:
+            new_rows = min(self.max_entries, max(min_capacity, current_rows * 2, 1024))
+            with open(self._vectors_path, 'ab') as f:
+                f.truncate(new_rows * row_bytes)
+            current_rows = new_rows
+        self._capacity = current_rows
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r+', shape=(current_rows, self.dim)) if current_rows else None
+
+    def _select_slots(self, keys: list) -> dict:
+        found = {}
+        for start in range(0, len(keys), self._SQLITE_MAX_VARS):
+            chunk = keys[start:start + self._SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self._conn.execute(f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", chunk).fetchall())
+        return found
+
+    def lookup(self, texts: list):
+        """
+        Looks up embeddings for a list of texts.
+
+        Returns:
+            tuple: (float32 array of shape (len(texts), dim) with cached rows filled in,
+                    bool array marking which texts were NOT found)
+        """
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing = np.ones(len(texts), dtype=bool)
+        if not texts:
+            return embeddings, missing
+        keys = [self._key(t) for t in texts]
+        with self._lock:
+            # The key -> slot mapping and the vectors are read in one write transaction: store()
+            # rewrites slots only inside its own, so the mapping cannot go stale mid-read.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                slots = self._select_slots(keys)
+                if slots:
+                    if max(slots.values()) >= self._capacity:
+                        self._map_vectors()  # another process grew the file
+                    positions = [i for i, k in enumerate(keys) if k in slots]
+                    embeddings[positions] = self._vectors[[slots[keys[i]] for i in positions]]
+                    missing[positions] = False
+                    now = time.time()
+                    self._conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, k) for k in set(slots)])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.hits += int((~missing).sum())
+            self.misses += int(missing.sum())
+        return embeddings, missing
+
+    def store(self, texts: list, embeddings: np.ndarray):
+        """Stores embeddings for texts, evicting the least recently used entries when full."""
+        if not len(texts):
+            return
+        # Keep only the last occurrence of each key, and never more than the cache can hold.
+        unique = {self._key(t): i for i, t in enumerate(texts)}
+        items = list(unique.items())[-self.max_entries:]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            written_slots = []
+            try:
+                existing = self._select_slots([k for k, _ in items])
+                items = [(k, i) for k, i in items if k not in existing]
+                if not items:
+                    self._conn.execute("COMMIT")
+                    return
+                next_slot, used = self._conn.execute("SELECT COALESCE(MAX(slot) + 1, 0), COUNT(*) FROM entries").fetchone()
+                fresh_slots = list(range(next_slot, min(self.max_entries, next_slot + len(items))))
+                if len(fresh_slots) < len(items) and used < min(next_slot, self.max_entries):
+                    # Slots freed by a failed store (see below) are refilled before anything is evicted.
+                    taken = {slot for (slot,) in self._conn.execute("SELECT slot FROM entries")}
+                    free_slots = [slot for slot in range(min(next_slot, self.max_entries)) if slot not in taken]
+                    fresh_slots += free_slots[:len(items) - len(fresh_slots)]
+                evict_count = len(items) - len(fresh_slots)
+                reused_slots = []
+                if evict_count > 0:
+                    victims = self._conn.execute(
+                        "SELECT key, slot FROM entries ORDER BY last_used ASC LIMIT ?", (evict_count,)
+                    ).fetchall()
+                    self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in victims])
+                    reused_slots = [slot for _, slot in victims]
+                slots = fresh_slots + reused_slots
+                if slots and max(slots) >= self._capacity:
+                    self._map_vectors(max(slots) + 1)
+                written_slots = slots
+                self._vectors[slots] = np.asarray(embeddings, dtype=np.float32)[[i for _, i in items]]
+                self._vectors.flush()
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                    [(k, slot, now) for (k, _), slot in zip(items, slots)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                if written_slots:
+                    # The rollback restored the evicted entries, but their vectors may already be overwritten.
+                    self._conn.executemany("DELETE FROM entries WHERE slot = ?", [(slot,) for slot in written_slots])
+                raise
+
+    def get_stats(self) -> dict:
+        """Returns cumulative hit/miss counters for this process."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
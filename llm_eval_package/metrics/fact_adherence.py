@@ -3,7 +3,17 @@ from llm_eval_package.metrics.base import BaseMetric
 import numpy as np
 import warnings
 import pandas as pd
+import re
 import string # For punctuation
+import threading
+from collections import OrderedDict
+
+from llm_eval_package.config import (
+    FACT_ADHERENCE_TEXT_CACHE_SIZE, FACT_ADHERENCE_LEMMA_CACHE_SIZE,
+    FACT_ADHERENCE_MATCHER_CACHE_SIZE, FACT_ADHERENCE_WORD_BOUNDARIES
+)
+from llm_eval_package.metrics.keyword_matcher import FactMatcher
+from llm_eval_package.metrics.text_artifacts import get_artifact_column
 
 try:
     import nltk
@@ -38,8 +48,39 @@ except ImportError:
     warnings.warn("NLTK library not found. FactAdherenceMetric will use simple substring matching.")
 
 class FactAdherenceMetric(BaseMetric):
-    def __init__(self):
+    """
+    Fraction of the ';'-separated required_facts found in the LLM output. With NLTK, a fact is
+    found when all of its lemmatized (POS-aware) words occur in the lemmatized output; without
+    it, the whole phrase must occur as a case-insensitive substring (or as whole words, with
+    word_boundaries=True), found for all facts of a row in one scan by a FactMatcher that is
+    compiled once per distinct fact list.
+
+    Lemmatized tokens are cached per distinct text in a bounded LRU (fact lists such as
+    "NRIC;proof of address" repeat across many rows), (token, POS) -> lemma lookups are memoized,
+    and compute_batch() tags all uncached texts with one pos_tag_sents call. The LRUs are
+    guarded by a lock, since the API scores requests on a thread pool with shared instances.
+    """
+    supports_batch = True
+    input_fields = ('llm_output', 'required_facts')
+    cpu_bound = True  # NLTK tokenization, POS tagging and lemmatization per row
+    cost = 10.0
+    detail_columns = ("Found Facts", "Missing Facts")
+
+    def __init__(self, text_cache_size: int = FACT_ADHERENCE_TEXT_CACHE_SIZE,
+                 lemma_cache_size: int = FACT_ADHERENCE_LEMMA_CACHE_SIZE,
+                 matcher_cache_size: int = FACT_ADHERENCE_MATCHER_CACHE_SIZE,
+                 word_boundaries: bool = FACT_ADHERENCE_WORD_BOUNDARIES):
         super().__init__("Fact Adherence")
+        self.text_cache_size = max(1, int(text_cache_size))
+        self.lemma_cache_size = max(1, int(lemma_cache_size))
+        self.matcher_cache_size = max(1, int(matcher_cache_size))
+        self.word_boundaries = word_boundaries
+        self._fact_matchers = OrderedDict() # required_facts string -> FactMatcher (None if no facts), LRU
+        self._token_cache = OrderedDict() # text -> tuple of lemmatized tokens, least recently used first
+        self._lemma_cache = {} # (token, WordNet POS) -> lemma
+        self._cache_lock = threading.Lock() # Guards both LRUs (reordering them is not thread-safe) and the counters
+        self.token_cache_hits = 0
+        self.token_cache_misses = 0
         self.nltk_ready = False
         if _NLTK_AVAILABLE:
             try:
@@ -54,6 +95,9 @@ class FactAdherenceMetric(BaseMetric):
                 self.nltk_ready = False
         else:
             print("DEBUG (FactAdherence): NLTK not available, falling back.")
+        # The output's word_tokenize() tokens (or, for the substring fallback, its lowercased text)
+        # come from the Evaluator's shared preprocessing stage.
+        self.text_artifacts = (('llm_output', 'tokens'),) if self.nltk_ready else (('llm_output', 'lower'),)
 
     def _get_wordnet_pos(self, nltk_tag):
         if nltk_tag.startswith('J'): return wordnet.ADJ
@@ -62,8 +106,47 @@ class FactAdherenceMetric(BaseMetric):
         elif nltk_tag.startswith('R'): return wordnet.ADV
         else: return wordnet.NOUN 
 
-    def _process_text_for_matching(self, text: str):
-        """Tokenizes, cleans (keeps alphanumeric, specific symbols like $), and lemmatizes text."""
+    def _lemmatize(self, token: str, nltk_tag: str) -> str:
+        """POS-aware lemma of one token, memoized per (token, WordNet POS)."""
+        key = (token, self._get_wordnet_pos(nltk_tag))
+        lemma = self._lemma_cache.get(key)
+        if lemma is None:
+            if len(self._lemma_cache) >= self.lemma_cache_size:
+                self._lemma_cache.clear()
+            lemma = self._lemma_cache[key] = self.lemmatizer.lemmatize(*key)
+        return lemma
+
+    def _clean_tokens(self, text: str, tokens=None) -> list:
+        """
+        Lowercases and tokenizes text (unless its word_tokenize() tokens are given), dropping
+        standalone punctuation (keeps $, numbers, words).
+        """
+        # word_tokenize separates '$' from '500'; both are kept, so a fact "$500" needs both in the output.
+        tokens = word_tokenize(text.lower()) if tokens is None else tokens
+        return [token for token in tokens if token not in string.punctuation]
+
+    def _cached_tokens(self, text: str):
+        with self._cache_lock:
+            tokens = self._token_cache.get(text)
+            if tokens is None:
+                self.token_cache_misses += 1
+                return None
+            self.token_cache_hits += 1
+            self._token_cache.move_to_end(text)
+            return tokens
+
+    def _remember_tokens(self, text: str, tokens: tuple):
+        with self._cache_lock:
+            self._token_cache[text] = tokens
+            self._token_cache.move_to_end(text)
+            while len(self._token_cache) > self.text_cache_size:
+                self._token_cache.popitem(last=False)
+
+    def _process_text_for_matching(self, text: str, tokens=None):
+        """
+        Tokenizes, cleans (keeps alphanumeric, specific symbols like $), and lemmatizes text.
+        tokens, if given, are text's lowercased word_tokenize() tokens from the shared preprocessing stage.
+        """
         if not self.nltk_ready or not text or not isinstance(text, str):
             if not text or not isinstance(text, str): return []
             # Basic fallback: lower, split, remove common punctuation but try to keep $ and numbers
@@ -79,80 +162,170 @@ class FactAdherenceMetric(BaseMetric):
                 processed_tokens.append(token)
             return processed_tokens
 
-        tokens = word_tokenize(text.lower())
-        
-        # Filter out most punctuation but keep $, %, and numbers as part of tokens if possible
-        # and ensure tokens are not just standalone punctuation.
-        # This also aims to handle cases like "$500" becoming ['$', '500'] by word_tokenize
-        # and then tries to treat them as individual items or re-combine if necessary for facts.
-        # For "all words must match", it's better if "$500" is treated as "500" and fact has "500".
-        # Or if fact has "$500", it should tokenize to ['$','500'].
-        
-        # Let's simplify: keep alphanumeric, and specific symbols if they are part of what users might consider a "word" or value.
-        # word_tokenize will separate '$' from '500'. We want to keep both if they are in the fact.
-        # The previous filter `token.isalnum()` was too aggressive, removing '$'.
-
-        cleaned_tokens = []
-        for token in tokens:
-            if token in string.punctuation: # Skip common standalone punctuation
-                continue
-            cleaned_tokens.append(token) 
-            # Numbers will be kept as strings here. Lemmatizer doesn't change them.
-            # Symbols like '$' will also be kept if word_tokenize treats them as tokens.
-
-        if not cleaned_tokens: return []
-
-        pos_tags = nltk.pos_tag(cleaned_tokens)
-        lemmatized_tokens = [self.lemmatizer.lemmatize(token, self._get_wordnet_pos(tag)) for token, tag in pos_tags]
-        
-        # print(f"    Processed '{text}' -> {lemmatized_tokens}") # Debug individual processing
-        return lemmatized_tokens
-
-    def compute(self, llm_output: str, reference_answer: str = None, query: str = None, required_facts: str = None, **kwargs) -> float:
-        if pd.isna(required_facts) or not str(required_facts).strip(): return np.nan 
+        lemmas = self._cached_tokens(text)
+        if lemmas is None:
+            cleaned_tokens = self._clean_tokens(text, tokens)
+            lemmas = tuple(self._lemmatize(token, tag) for token, tag in nltk.pos_tag(cleaned_tokens)) if cleaned_tokens else ()
+            self._remember_tokens(text, lemmas)
+        return list(lemmas)
+
+    def _preprocess_many(self, texts, pretokenized: dict = None) -> dict:
+        """
+        Lemmatized tokens for many texts at once: cached texts are looked up, and all the others
+        are POS-tagged in a single pos_tag_sents call (same tags as tagging each text on its own).
+        pretokenized optionally maps texts to their word_tokenize() tokens from the shared stage.
+
+        Returns:
+            dict: text -> tuple of lemmatized tokens, for every text given.
+        """
+        processed = {}
+        to_tag = []
+        for text in texts:
+            if text in processed: continue
+            tokens = self._cached_tokens(text)
+            if tokens is None:
+                processed[text] = None
+                to_tag.append(text)
+            else:
+                processed[text] = tokens
+        pretokenized = pretokenized or {}
+        cleaned = [self._clean_tokens(text, pretokenized.get(text)) for text in to_tag]
+        tagged = iter(nltk.pos_tag_sents([tokens for tokens in cleaned if tokens]))
+        for text, tokens in zip(to_tag, cleaned):
+            lemmas = tuple(self._lemmatize(token, tag) for token, tag in next(tagged)) if tokens else ()
+            processed[text] = lemmas
+            self._remember_tokens(text, lemmas)
+        return processed
+
+    @staticmethod
+    def _split_facts(required_facts):
+        """The non-empty ';'-separated fact phrases, or None when there are none (score is NaN)."""
+        if pd.isna(required_facts) or not str(required_facts).strip(): return None
         facts_list_phrases = [fact.strip() for fact in str(required_facts).split(';') if fact.strip()]
-        if not facts_list_phrases: return np.nan
-        if pd.isna(llm_output) or not str(llm_output).strip(): return 0.0
-        
-        llm_output_str = str(llm_output)
-        found_count = 0
-
-        # print(f"\nDEBUG (FactAdherence): Evaluating LLM Output: '{llm_output_str}'")
-        # print(f"DEBUG (FactAdherence): Against Required Facts Input: '{required_facts}'")
-
-        if self.nltk_ready:
-            processed_llm_output_words_set = set(self._process_text_for_matching(llm_output_str))
-            # print(f"DEBUG (FactAdherence): Processed LLM Output Tokens (Set): {processed_llm_output_words_set}")
+        return facts_list_phrases or None
+
+    def _get_fact_matcher(self, required_facts):
+        """FactMatcher for a row's required_facts (built once per distinct string), or None if it has no facts."""
+        if not isinstance(required_facts, str):
+            required_facts = None if pd.isna(required_facts) else str(required_facts)
+        with self._cache_lock:
+            if required_facts in self._fact_matchers:
+                self._fact_matchers.move_to_end(required_facts)
+                return self._fact_matchers[required_facts]
+        # Built outside the lock; two threads racing on a new fact list just build it twice.
+        facts_list_phrases = self._split_facts(required_facts)
+        matcher = FactMatcher(facts_list_phrases, self.word_boundaries) if facts_list_phrases else None
+        with self._cache_lock:
+            self._fact_matchers[required_facts] = matcher
+            self._fact_matchers.move_to_end(required_facts)
+            while len(self._fact_matchers) > self.matcher_cache_size:
+                self._fact_matchers.popitem(last=False)
+        return matcher
+
+    def _fallback_flags(self, llm_output, required_facts, llm_output_lower: str = None):
+        """
+        Substring fallback: case-insensitive match of each WHOLE fact phrase, all facts in one
+        pass of the row's FactMatcher. Less granular than the NLTK word-by-word check.
+        """
+        matcher = self._get_fact_matcher(required_facts)
+        if matcher is None: return None
+        if pd.isna(llm_output) or not str(llm_output).strip(): return [False] * len(matcher.phrases)
+        if llm_output_lower is None:
+            llm_output_lower = str(llm_output).lower()
+        return matcher.find(llm_output_lower)
+
+    def _fact_flags(self, llm_output, facts_list_phrases, tokens_for):
+        """
+        Whether each fact was found in the output (NLTK path): a list of bools aligned with
+        facts_list_phrases, or None when there are no facts.
+        """
+        if facts_list_phrases is None: return None
+        if pd.isna(llm_output) or not str(llm_output).strip(): return [False] * len(facts_list_phrases)
+
+        processed_llm_output_words_set = set(tokens_for(str(llm_output)))
+        flags = []
+        for fact_phrase in facts_list_phrases:
+            processed_fact_phrase_words = tokens_for(fact_phrase)
+            # A fact matches when every one of its lemmatized words appears in the output.
+            flags.append(bool(processed_fact_phrase_words) and
+                         all(fact_word in processed_llm_output_words_set for fact_word in processed_fact_phrase_words))
+        return flags
+
+    @staticmethod
+    def _score_flags(flags) -> float:
+        if flags is None: return np.nan
+        return sum(flags) / len(flags)
+
+    def _row_flags(self, llm_output, required_facts, kwargs: dict):
+        if not self.nltk_ready:
+            return self._fallback_flags(llm_output, required_facts, kwargs.get('llm_output_lower'))
+        output_tokens = kwargs.get('llm_output_tokens')
+        def tokens_for(text):
+            return self._process_text_for_matching(text, output_tokens if text == llm_output else None)
+        return self._fact_flags(llm_output, self._split_facts(required_facts), tokens_for)
 
-            for i, fact_phrase in enumerate(facts_list_phrases):
-                if not fact_phrase: continue
-                
-                processed_fact_phrase_words = self._process_text_for_matching(fact_phrase)
-                # print(f"DEBUG (FactAdherence): Fact {i+1} ('{fact_phrase}') -> Processed Fact Tokens: {processed_fact_phrase_words}")
-                if not processed_fact_phrase_words: continue
-
-                all_fact_words_found = True
-                for fact_word in processed_fact_phrase_words:
-                    if fact_word not in processed_llm_output_words_set:
-                        all_fact_words_found = False
-                        # print(f"  Word '{fact_word}' from Fact {i+1} NOT FOUND.")
-                        break 
-                if all_fact_words_found:
-                    found_count += 1
-                    # print(f"  Fact {i+1} - MATCHED.")
-                # else:
-                    # print(f"  Fact {i+1} - NO MATCH.")
-        else: 
-            # Fallback: simple case-insensitive substring for WHOLE phrase
-            # This fallback is less granular than the NLTK word-by-word check.
-            # print("DEBUG (FactAdherence): Using FALLBACK SUBSTRING CHECK.")
-            llm_output_lower = llm_output_str.lower()
-            for fact_phrase in facts_list_phrases:
-                if fact_phrase.lower() in llm_output_lower:
-                    found_count += 1
-        
-        # print(f"DEBUG (FactAdherence): Found {found_count}/{len(facts_list_phrases)} facts.")
-        return found_count / len(facts_list_phrases)
+    def compute(self, llm_output: str, reference_answer: str = None, query: str = None, required_facts: str = None, **kwargs) -> float:
+        return self._score_flags(self._row_flags(llm_output, required_facts, kwargs))
+
+    def fact_flags(self, llm_output: str, required_facts: str) -> list:
+        """
+        Per-fact result for reviewers: a list of (fact, found) pairs in the order the facts were
+        given, or [] when the row has no required facts.
+        """
+        facts_list_phrases = self._split_facts(required_facts)
+        flags = self._row_flags(llm_output, required_facts, {})
+        return list(zip(facts_list_phrases, flags)) if flags is not None else []
+
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None,
+                      required_facts: list = None, **kwargs) -> np.ndarray:
+        """
+        Scores many rows with one batched preprocessing pass: every distinct output and fact
+        phrase is tokenized, POS-tagged (pos_tag_sents) and lemmatized once for the whole batch.
+        In fallback mode each output is scanned once by the cached FactMatcher for its fact list.
+        """
+        return np.array([self._score_flags(flags) for flags in self._batch_flags(llm_outputs, required_facts, kwargs)], dtype=float)
+
+    def _batch_flags(self, llm_outputs: list, required_facts: list, kwargs: dict) -> list:
+        n = len(llm_outputs)
+        required_facts = required_facts if required_facts is not None else [None] * n
+        if not self.nltk_ready:
+            lowered = get_artifact_column(kwargs, 'llm_output', 'lower', [str(t) if not pd.isna(t) else '' for t in llm_outputs])
+            return [self._fallback_flags(llm_outputs[i], required_facts[i], lowered[i]) for i in range(n)]
+        facts_per_row = [self._split_facts(facts) for facts in required_facts]
+
+        texts = set()
+        for llm_output, facts in zip(llm_outputs, facts_per_row):
+            if facts is None or pd.isna(llm_output) or not str(llm_output).strip(): continue
+            texts.add(str(llm_output))
+            texts.update(facts)
+        output_tokens = kwargs.get('llm_output_tokens')
+        pretokenized = dict(zip(llm_outputs, output_tokens)) if output_tokens is not None else None
+        processed = self._preprocess_many(texts, pretokenized)
+        return [self._fact_flags(llm_outputs[i], facts_per_row[i], processed.__getitem__) for i in range(n)]
+
+    def compute_batch_details(self, llm_outputs: list, reference_answers: list = None, queries: list = None,
+                              required_facts: list = None, **kwargs) -> tuple:
+        """
+        compute_batch() scores plus which required facts were found / missing in each output
+        ('; '-separated, for reviewers), both taken from the same per-fact flags.
+        """
+        n = len(llm_outputs)
+        facts_per_row = [self._split_facts(facts) for facts in (required_facts if required_facts is not None else [None] * n)]
+        scores, found, missing = [], [], []
+        for facts, flags in zip(facts_per_row, self._batch_flags(llm_outputs, required_facts, kwargs)):
+            scores.append(self._score_flags(flags))
+            facts, flags = facts or [], flags or []
+            found.append("; ".join(fact for fact, flag in zip(facts, flags) if flag))
+            missing.append("; ".join(fact for fact, flag in zip(facts, flags) if not flag))
+        return np.array(scores, dtype=float), {"Found Facts": found, "Missing Facts": missing}
+
+    def get_config_fingerprint(self) -> str:
+        """Whole-word matching changes fallback scores."""
+        return "word_boundaries" if self.word_boundaries else ""
+
+    def get_stats(self) -> dict:
+        with self._cache_lock:
+            return {"token_cache_hits": self.token_cache_hits, "token_cache_misses": self.token_cache_misses}
 
 # class FactAdherenceMetric(BaseMetric):
 #     def __init__(self):
@@ -5,13 +5,15 @@ from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
 from nltk.translate.meteor_score import single_meteor_score
 from rouge_score import rouge_scorer
 import warnings
+import os
 
 
 
 from llm_eval_package.metrics.base import BaseMetric # Updated import path
-from sentence_transformers import SentenceTransformer, util
+from llm_eval_package.metrics.embedding_cache import EmbeddingCache
+from llm_eval_package.metrics.micro_batcher import MicroBatcher
+from llm_eval_package.config import SEMANTIC_SIMILARITY_BATCH_SIZE, EMBEDDING_CACHE_MAX_ENTRIES
 import numpy as np
-import streamlit as st # Keep st import for potential error messages within the class
 
 class SemanticSimilarityMetric(BaseMetric):
     """
@@ -19,15 +21,29 @@ class SemanticSimilarityMetric(BaseMetric):
     Uses Sentence-BERT for embedding and cosine similarity.
     """
 
-    def __init__(self, model_path: str):
+    supports_batch = True
+    input_fields = ('llm_output', 'reference_answer')
+    cost = 100.0  # transformer forward pass
+
+    def __init__(self, model_path: str, batch_size: int = SEMANTIC_SIMILARITY_BATCH_SIZE,
+                 cache_dir: str = None, cache_max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
         """
         Initializes the SemanticSimilarityMetric with a Sentence-BERT model.
 
         Args:
             model_path (str): The path to the pre-trained Sentence-BERT model.
+            batch_size (int): Number of texts passed to the model per forward pass in compute_batch.
+            cache_dir (str, optional): Directory of the persistent embedding cache. No caching if None.
+            cache_max_entries (int): Maximum number of cached embeddings before LRU eviction.
         """
         super().__init__("Semantic Similarity")
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.embedding_cache = None
+        self.micro_batcher = None
         try:
+            # Imported on first construction so that merely importing this module doesn't pull in torch.
+            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer(model_path)
             print(f"DEBUG: SemanticSimilarityMetric model loaded successfully from {model_path}")
         except Exception as e:
@@ -36,6 +52,15 @@ class SemanticSimilarityMetric(BaseMetric):
             # Re-raise the exception to be caught by the Evaluator's __init__
             raise e 
 
+        if cache_dir:
+            try:
+                self.embedding_cache = EmbeddingCache(
+                    cache_dir, model_path, self.model.get_sentence_embedding_dimension(), cache_max_entries
+                )
+            except Exception as e:
+                # The cache is an optimization only; scoring works the same without it.
+                warnings.warn(f"Embedding cache at '{cache_dir}' unavailable, continuing without it: {e}")
+
     def compute(self, llm_output: str, reference_answer: str = None, query: str = None, **kwargs) -> float:
         """
         Computes the semantic similarity score between LLM output and reference answer.
@@ -64,6 +89,7 @@ class SemanticSimilarityMetric(BaseMetric):
             embedding_ref = self.model.encode(reference_answer, convert_to_tensor=True)
 
             # Compute cosine similarity using util.cos_sim (corrected function name)
+            from sentence_transformers import util
             cosine_similarity = util.cos_sim(embedding_llm, embedding_ref)
             score = cosine_similarity.item() # .item() extracts the scalar value from the tensor
             print(f"DEBUG: SemanticSimilarityMetric computed score: {score}")
@@ -73,6 +99,93 @@ class SemanticSimilarityMetric(BaseMetric):
             # Do not use st.error here as this is called per row during evaluation
             return 0.0
 
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """
+        Computes semantic similarity scores for many test cases in a single pass.
+        Every distinct text is encoded once, in large batches, with L2-normalized embeddings,
+        so the row-wise cosine similarity reduces to one element-wise product and sum.
+
+        Args:
+            llm_outputs (list): The LLM outputs, one per test case.
+            reference_answers (list): The reference answers, aligned with llm_outputs.
+            queries (list, optional): The user queries (not used by this metric).
+            **kwargs: Additional keyword arguments (not used by this metric).
+
+        Returns:
+            np.ndarray: Cosine similarity scores aligned with llm_outputs. Rows with an empty
+                        output or reference score 0.0, matching compute().
+        """
+        scores = np.zeros(len(llm_outputs), dtype=float)
+        if self.model is None or reference_answers is None:
+            return scores
+
+        valid_rows = [i for i, (out, ref) in enumerate(zip(llm_outputs, reference_answers)) if out and ref]
+        if not valid_rows:
+            return scores
+
+        unique_texts = list(dict.fromkeys(
+            [llm_outputs[i] for i in valid_rows] + [reference_answers[i] for i in valid_rows]
+        ))
+        text_positions = {text: pos for pos, text in enumerate(unique_texts)}
+        embeddings = self._encode_texts(unique_texts)
+
+        output_embeddings = embeddings[[text_positions[llm_outputs[i]] for i in valid_rows]]
+        reference_embeddings = embeddings[[text_positions[reference_answers[i]] for i in valid_rows]]
+        scores[valid_rows] = np.einsum('ij,ij->i', output_embeddings, reference_embeddings)
+        return scores
+
+    def _encode_texts(self, texts: list) -> np.ndarray:
+        """
+        Returns L2-normalized float32 embeddings for texts. Embeddings found in the persistent
+        cache are reused; the rest are encoded batch_size texts at a time and added to the cache.
+        """
+        if self.embedding_cache is None:
+            return self._encode_with_model(texts)
+
+        embeddings, missing = self.embedding_cache.lookup(texts)
+        if missing.any():
+            missing_texts = [t for t, m in zip(texts, missing) if m]
+            new_embeddings = self._encode_with_model(missing_texts)
+            embeddings[missing] = new_embeddings
+            try:
+                self.embedding_cache.store(missing_texts, new_embeddings)
+            except Exception as e:
+                warnings.warn(f"Could not write to embedding cache: {e}")
+        return embeddings
+
+    def enable_micro_batching(self, max_batch_size: int, max_wait_seconds: float):
+        """
+        Routes model encoding through a MicroBatcher, so concurrent callers on different threads
+        (e.g. API requests) share forward passes. Calling it again replaces the settings.
+        """
+        self.micro_batcher = MicroBatcher(self._run_model, max_batch_size, max_wait_seconds, name="embedding-micro-batcher")
+
+    def _encode_with_model(self, texts: list) -> np.ndarray:
+        """Encodes texts with the model, through the micro-batcher when one is enabled."""
+        if self.micro_batcher is not None:
+            return self.micro_batcher.submit(texts)
+        return self._run_model(texts)
+
+    def _run_model(self, texts: list) -> np.ndarray:
+        """Runs the Sentence-BERT model over texts, batch_size texts per forward pass."""
+        return np.asarray(self.model.encode(
+            texts, batch_size=self.batch_size, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False
+        ), dtype=np.float32)
+
+    def get_config_fingerprint(self) -> str:
+        """Scores depend on which Sentence-BERT model is loaded."""
+        return os.path.basename(os.path.normpath(self.model_path))
+
+    def get_stats(self) -> dict:
+        """Cumulative embedding cache and micro-batching counters (empty when neither is enabled)."""
+        stats = {}
+        if self.embedding_cache is not None:
+            stats.update({f"embedding_cache_{k}": v for k, v in self.embedding_cache.get_stats().items()})
+        if self.micro_batcher is not None:
+            stats.update({f"micro_batch_{k}": v for k, v in self.micro_batcher.get_stats().items()})
+        return stats
+
     def get_score_description(self, score: float) -> str:
         """
         Returns a description for the given semantic similarity score.
@@ -0,0 +1,163 @@
+# llm_eval_package/metrics/keyword_matcher.py
+import re
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """
+    Whole-word, case-insensitive matcher for a large keyword list, compiled into one regex.
+
+    The lowercased keywords are merged into a trie and emitted as a single alternation
+    (e.g. "hate", "hate speech", "harm" -> \\b(?:ha(?:rm|te(?: speech)?))\\b), so each text is
+    scanned once no matter how many keywords there are. A text matches exactly when one of the
+    keywords would match r'\\b' + re.escape(keyword) + r'\\b' on its own.
+    """
+
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords (iterable): Keywords to look for; matching ignores case. Duplicates are ignored.
+        """
+        self.terms = {}  # lowercased keyword -> keyword as first given
+        for keyword in keywords:
+            self.terms.setdefault(keyword.lower(), keyword)
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True  # end of a keyword
+        body = self._trie_regex(trie)
+        self.pattern = re.compile(r"\b" + body + r"\b") if self.terms else None
+        # For matched_terms(): the same alternation in a lookahead reports the longest keyword at
+        # every position, and each keyword -> the keywords that are its prefixes, shortest first.
+        self._overlapping = re.compile(r"(?=\b(" + body + r")\b)") if self.terms else None
+        self._prefixes = {term: [term[:end] for end in range(1, len(term) + 1) if term[:end] in self.terms]
+                          for term in self.terms}
+
+    @classmethod
+    def _trie_regex(cls, node: dict) -> str:
+        # Branches are tried longest-first by construction: an ending keyword only makes the
+        # group optional, so "hate speech" is preferred over "hate" at the same position.
+        branches = [re.escape(char) + cls._trie_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return f"(?:{'|'.join(branches)})?"
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    def contains_any(self, lowered_text: str) -> bool:
+        """True if any keyword occurs as a whole word in lowered_text (already lowercased)."""
+        return self.pattern is not None and self.pattern.search(lowered_text) is not None
+
+    def matched_terms(self, lowered_text: str) -> list:
+        """
+        Every keyword (as given) found as a whole word in lowered_text (already lowercased), in
+        order of first appearance. Nested and overlapping keywords are all reported: "hate speech"
+        yields "hate", "hate speech" and "speech" when all three are keywords.
+        """
+        if self._overlapping is None:
+            return []
+        found = {}
+        for match in self._overlapping.finditer(lowered_text):
+            start = match.start()
+            for term in self._prefixes[match.group(1)]:
+                if term not in found and _on_word_boundary(lowered_text, start + len(term)):
+                    found[term] = True
+        return [self.terms[term] for term in found]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"  # what re's \w matches
+
+
+def _on_word_boundary(text: str, pos: int) -> bool:
+    """What re's \b matches at pos."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+class FactMatcher:
+    """
+    Finds which of a fixed list of phrases occur in a text, with a single regex scan.
+
+    The phrases are compiled into one trie alternation inside a lookahead, so the scan reports,
+    at every position, the longest phrase starting there; every shorter phrase starting at the
+    same position is a prefix of it, so all occurrences (overlapping ones included) are found.
+    Matching ignores case and is plain substring matching unless word_boundaries=True, in which
+    case a phrase may not continue a word: a phrase edge that is a word character must not touch
+    another word character ((?<!\\w) / (?!\\w)), so "5%" and "$500" match like "NRIC" does.
+
+    For short substring lists, one str `in` test per phrase (a C-level search) is faster than
+    any Python-driven scan, so the trie scan is only used from SCAN_MIN_PHRASES phrases on, or
+    whenever word boundaries are required.
+    """
+    SCAN_MIN_PHRASES = 200  # measured crossover on ~500-character outputs
+
+    def __init__(self, phrases, word_boundaries: bool = False):
+        """
+        Args:
+            phrases (iterable): Phrases to look for; flags are returned in this order.
+            word_boundaries (bool): Require whole-word matches instead of substrings.
+        """
+        self.phrases = list(phrases)
+        self.word_boundaries = word_boundaries
+        self._positions = {}  # lowercased phrase -> indices in self.phrases
+        for i, phrase in enumerate(self.phrases):
+            self._positions.setdefault(phrase.lower(), []).append(i)
+        self._lowered = [phrase.lower() for phrase in self.phrases]
+        self._use_scan = word_boundaries or len(self._positions) >= self.SCAN_MIN_PHRASES
+        self.pattern = None
+        if not self._use_scan:
+            return
+        # Each phrase -> the phrases that are its prefixes (itself included), shortest first.
+        self._prefixes = {
+            phrase: [phrase[:end] for end in range(1, len(phrase) + 1) if phrase[:end] in self._positions]
+            for phrase in self._positions
+        }
+        trie = {}
+        for phrase in self._positions:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = True
+        # All phrases found at one position share their first character, so the start edge is
+        # checked in the regex: either the phrase starts with a non-word character, or the text
+        # before it is not a word character. The end edge differs per phrase and is checked in find().
+        start_edge = r"(?:(?<!\w)|(?!\w))" if word_boundaries else ""
+        body = KeywordMatcher._trie_regex(trie)
+        self.pattern = re.compile(f"{start_edge}(?=({body}))") if body else None
+
+    def find(self, lowered_text: str) -> list:
+        """One bool per phrase: whether it occurs in lowered_text (already lowercased)."""
+        if not self._use_scan:
+            return [phrase in lowered_text for phrase in self._lowered]
+        flags = [False] * len(self.phrases)
+        if self.pattern is None:
+            return flags
+        missing = set(self._positions)
+        for match in self.pattern.finditer(lowered_text):
+            start = match.start()
+            for phrase in self._prefixes[match.group(1)]:
+                if phrase in missing and (not self.word_boundaries or self._ends_phrase(lowered_text, phrase, start + len(phrase))):
+                    missing.discard(phrase)
+                    for i in self._positions[phrase]:
+                        flags[i] = True
+            if not missing:
+                break
+        return flags
+
+    @staticmethod
+    def _ends_phrase(text: str, phrase: str, end: int) -> bool:
+        return not _is_word_char(phrase[-1]) or end == len(text) or not _is_word_char(text[end])
+
+
+@lru_cache(maxsize=8)
+def _cached_matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords) -> KeywordMatcher:
+    """KeywordMatcher for keywords, compiled once and reused for every row and run with the same list."""
+    return _cached_matcher(tuple(keywords))
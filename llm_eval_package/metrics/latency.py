@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from llm_eval_package.metrics.base import BaseMetric
+
+
+class LatencyMetric(BaseMetric):
+    """
+    A metric reporting how long the bot took to answer, in seconds.
+
+    The score is the 'response_latency_seconds' column recorded by `fetch-responses` (total time
+    from sending the query to the last streamed chunk). Lower is better: a row passes when its
+    latency is at or below the threshold (see LOWER_IS_BETTER_METRICS in config.py).
+    Rows without a recorded latency get no score.
+    """
+
+    supports_batch = True
+    input_fields = ('response_latency_seconds',)
+    cost = 0.01
+
+    def __init__(self):
+        """
+        Initializes the LatencyMetric.
+        """
+        super().__init__("Latency")
+
+    def compute(self, llm_output: str, reference_answer: str = None, query: str = None, **kwargs) -> float:
+        """
+        Returns the recorded response latency.
+
+        Args:
+            llm_output (str): The output generated by the LLM (not used by this metric).
+            reference_answer (str, optional): The human-written reference answer (not used by this metric).
+            query (str, optional): The user's input query (not used by this metric).
+            **kwargs: Must include response_latency_seconds.
+
+        Returns:
+            float: Latency in seconds, or NaN if none was recorded.
+        """
+        return float(pd.to_numeric(kwargs.get('response_latency_seconds'), errors='coerce'))
+
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """Parses the whole latency column at once; missing or non-numeric values become NaN."""
+        latencies = kwargs.get('response_latency_seconds', [None] * len(llm_outputs))
+        return pd.to_numeric(pd.Series(latencies, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+    def get_score_description(self, score: float) -> str:
+        """
+        Returns a description for the given latency.
+
+        Args:
+            score (float): The response latency in seconds.
+
+        Returns:
+            str: Description of the score.
+        """
+        if pd.isna(score):
+            return "Latency not available: No response time was recorded for this test case."
+        if score <= 2.0:
+            return "Fast response: The bot answered within 2 seconds."
+        elif score <= 5.0:
+            return "Acceptable response time: The bot answered within 5 seconds."
+        elif score <= 10.0:
+            return "Slow response: The bot took between 5 and 10 seconds to answer."
+        else:
+            return "Very slow response: The bot took more than 10 seconds to answer."
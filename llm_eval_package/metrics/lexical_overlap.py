@@ -0,0 +1,33 @@
+# llm_eval_package/metrics/lexical_overlap.py
+import numpy as np
+
+# Word overlap shared by CompletenessMetric and TrustFactualityMetric, which both score the
+# fraction of the reference's distinct words that also occur in the output. The Evaluator
+# computes it once per run as the llm_output_reference_coverage text artifact (see
+# text_artifacts.py), so when both metrics are selected the texts are only split once.
+#
+# The overlap is a per-row set loop on purpose. Binary sparse document-term matrices (shared
+# vocabulary, CSR, row sums of A.multiply(B)) give the same scores but are slower here: splitting
+# and factorizing every word in Python costs more than the loop itself, and repeated rows are
+# already scored once per unique (output, reference) pair. benchmarks/lexical_metrics.py times
+# both; a faster column path needs tokenization outside Python.
+
+
+def reference_word_coverage(lowered_outputs: list, lowered_references: list) -> np.ndarray:
+    """
+    For each row, |words(output) & words(reference)| / |words(reference)|, where words are the
+    distinct whitespace-separated tokens of the (already lowercased) text. A reference without
+    words gives 1.0.
+
+    Returns:
+        np.ndarray: Float coverage per row.
+    """
+    num_rows = len(lowered_outputs)
+    common = np.empty(num_rows, dtype=float)
+    reference_sizes = np.empty(num_rows, dtype=float)
+    for i, (output, reference) in enumerate(zip(lowered_outputs, lowered_references)):
+        reference_words = set(reference.split())
+        reference_sizes[i] = len(reference_words)
+        # Probing the small reference set with the output's words avoids building a set per output.
+        common[i] = len(reference_words.intersection(output.split()))
+    return np.divide(common, reference_sizes, out=np.ones(num_rows), where=reference_sizes > 0)
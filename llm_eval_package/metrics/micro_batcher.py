@@ -0,0 +1,92 @@
+# llm_eval_package/metrics/micro_batcher.py
+import time
+import queue
+import threading
+import numpy as np
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Merges concurrent calls into shared batches.
+
+    Callers on any thread pass a list of items to submit() and block until their slice of the
+    result is ready. A single background thread takes the first waiting call, keeps collecting
+    calls until max_batch_size items are queued or max_wait_seconds have passed, runs process_fn
+    once over all of them and hands every caller its own rows back. With one caller this only
+    adds up to max_wait_seconds of latency; with many small concurrent callers (e.g. API requests
+    embedding a few texts each) the model sees batches close to max_batch_size.
+    """
+
+    def __init__(self, process_fn, max_batch_size: int = 256, max_wait_seconds: float = 0.01, name: str = "micro-batcher"):
+        """
+        Args:
+            process_fn (callable): Takes a list of items and returns an array with one row per item.
+            max_batch_size (int): Flush as soon as this many items are waiting. A single call larger
+                                  than this is processed on its own, unsplit.
+            max_wait_seconds (float): Longest time the first waiting call is held back for others to join.
+            name (str): Name of the background thread.
+        """
+        self.process_fn = process_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_seconds = max(0.0, float(max_wait_seconds))
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.calls = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, items: list) -> np.ndarray:
+        """Processes items as part of a shared batch and returns their results, in order."""
+        if not len(items):
+            return self.process_fn(items)
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((items, future))
+        return future.result()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            pending_items = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait_seconds
+            while pending_items < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                pending_items += len(pending[-1][0])
+            self._process(pending)
+
+    def _process(self, pending: list):
+        merged = [item for items, _ in pending for item in items]
+        try:
+            results = self.process_fn(merged)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(merged)
+        self.calls += len(pending)
+        offset = 0
+        for items, future in pending:
+            future.set_result(results[offset:offset + len(items)])
+            offset += len(items)
+
+    def get_stats(self) -> dict:
+        """Cumulative batch counters."""
+        return {"batches": self.batches, "items": self.items, "calls": self.calls}
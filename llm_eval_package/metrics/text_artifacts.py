@@ -0,0 +1,148 @@
+# llm_eval_package/metrics/text_artifacts.py
+import warnings
+
+from llm_eval_package.metrics.lexical_overlap import reference_word_coverage
+
+# Shared text preprocessing for the lexical metrics. A metric lists the (input field, artifact
+# kind) pairs it reads in BaseMetric.text_artifacts; the Evaluator builds every requested
+# artifact once per unique text for the whole run and passes the columns to compute_batch() /
+# compute() as keyword arguments named "<field>_<kind>" (e.g. llm_output_word_set).
+# Metrics called directly (without the Evaluator) compute the same artifacts themselves
+# through get_artifact() / get_artifact_column(), so scores never depend on who built them.
+#
+# Artifact kinds:
+#   lower     lowercased text
+#   words     tuple of whitespace-separated words of the lowercased text
+#   word_set  frozenset of those words
+#   tokens    NLTK word_tokenize() tokens of the lowercased text (whitespace split without punkt data)
+#   reference_coverage
+#             llm_output only: fraction of the row's distinct reference_answer words that also occur
+#             in the output (lexical_overlap.reference_word_coverage), built once per unique
+#             (output, reference) pair; read with get_reference_coverage()
+
+ARTIFACT_KINDS = ("lower", "words", "word_set", "tokens", "reference_coverage")
+
+_word_tokenize = None
+
+
+def artifact_name(field: str, kind: str) -> str:
+    """Keyword argument / column name under which an artifact of field is passed to metrics."""
+    return f"{field}_{kind}"
+
+
+def _get_word_tokenize():
+    """nltk.word_tokenize if it works here, otherwise str.split (warned once)."""
+    global _word_tokenize
+    if _word_tokenize is None:
+        try:
+            from nltk.tokenize import word_tokenize
+            word_tokenize("test")
+            _word_tokenize = word_tokenize
+        except (ImportError, LookupError) as e:
+            warnings.warn(f"NLTK word_tokenize unavailable ({e}); tokens artifacts fall back to str.split().",
+                          RuntimeWarning)
+            _word_tokenize = str.split
+    return _word_tokenize
+
+
+def _build_kind(kind: str, texts: list, memo: dict) -> list:
+    """
+    Artifacts of one kind for texts, reusing (and filling) memo[kind]. Each kind is built
+    straight from the text, reusing another kind only when it is already in memo, so no
+    intermediate artifact is materialized that nobody asked for.
+    """
+    if kind not in ARTIFACT_KINDS:
+        raise ValueError(f"Unknown text artifact '{kind}'. Use one of {ARTIFACT_KINDS}.")
+    if kind == "reference_coverage":
+        raise ValueError("The reference_coverage artifact is built per row pair; use get_reference_coverage().")
+    known = memo.setdefault(kind, {})
+    missing = list(set(texts).difference(known))
+    if missing:
+        lowered = [memo["lower"][t] for t in missing] if set(missing).issubset(memo.get("lower", ())) else None
+        if kind == "lower":
+            built = [t.lower() for t in missing]
+        elif kind == "words":
+            built = [tuple(t.split()) for t in lowered] if lowered else [tuple(t.lower().split()) for t in missing]
+        elif kind == "word_set":
+            words = memo.get("words", {})
+            built = [frozenset(words[t]) if t in words else frozenset(t.lower().split()) for t in missing]
+        else:  # tokens
+            tokenize = _get_word_tokenize()
+            built = [tuple(tokenize(t)) for t in (lowered or (t.lower() for t in missing))]
+        known.update(zip(missing, built))
+    return [known[t] for t in texts]
+
+
+def _build_reference_coverage(outputs: list, references: list, memo: dict) -> list:
+    """
+    reference_coverage for aligned output/reference columns, computed once per unique pair
+    and kept in memo["reference_coverage"] (keyed by (output, reference)).
+    """
+    pairs = list(zip(outputs, references))
+    known = memo.setdefault("reference_coverage", {})
+    missing = [pair for pair in dict.fromkeys(pairs) if pair not in known]
+    if missing:
+        coverage = reference_word_coverage(_build_kind("lower", [o for o, _ in missing], memo),
+                                            _build_kind("lower", [r for _, r in missing], memo))
+        known.update(zip(missing, coverage.tolist()))
+    return [known[pair] for pair in pairs]
+
+
+def build_text_artifacts(column_inputs: dict, requests, memo: dict = None) -> tuple:
+    """
+    Builds the requested artifacts for whole input columns, processing each unique text once
+    per kind (a text appearing as both an output and a reference is also processed once).
+
+    Args:
+        column_inputs (dict): Field name -> list of row strings.
+        requests (iterable): (field, kind) pairs; duplicates and unknown fields are ignored.
+        memo (dict, optional): Artifacts built so far (kind -> {text: artifact}), filled in place.
+            The Evaluator passes one memo to every call of a run, so metrics that score
+            different rows still build each text's artifacts only once between them.
+
+    Returns:
+        tuple: (dict artifact_name -> list aligned with the rows,
+                dict with 'unique_texts' processed into memo and 'artifacts' built)
+    """
+    memo = memo if memo is not None else {}
+    columns = {}
+    for field, kind in dict.fromkeys(requests):
+        if field not in column_inputs:
+            continue
+        if kind == "reference_coverage":
+            if field != "llm_output":
+                raise ValueError(f"The reference_coverage artifact is only defined for llm_output, not '{field}'.")
+            if "reference_answer" in column_inputs:
+                columns[artifact_name(field, kind)] = _build_reference_coverage(
+                    column_inputs[field], column_inputs["reference_answer"], memo)
+        else:
+            columns[artifact_name(field, kind)] = _build_kind(kind, column_inputs[field], memo)
+    unique_texts = set()
+    for kind, known in memo.items():
+        if kind != "reference_coverage":  # keyed by row pair, not by text
+            unique_texts.update(known)
+    return columns, {"unique_texts": len(unique_texts), "artifacts": len(columns)}
+
+
+def get_artifact(kwargs: dict, field: str, kind: str, text: str):
+    """The precomputed artifact passed in kwargs, or the same artifact computed for text."""
+    value = kwargs.get(artifact_name(field, kind))
+    return value if value is not None else _build_kind(kind, [text], {})[0]
+
+
+def get_artifact_column(kwargs: dict, field: str, kind: str, texts: list) -> list:
+    """Column version of get_artifact(), for compute_batch()."""
+    values = kwargs.get(artifact_name(field, kind))
+    return values if values is not None else _build_kind(kind, list(texts), {})
+
+
+def get_reference_coverage(kwargs: dict, llm_outputs: list, reference_answers: list):
+    """
+    The llm_output_reference_coverage column passed in kwargs, or the same coverage computed
+    for the rows (from the lowercased texts in kwargs, if present).
+    """
+    values = kwargs.get(artifact_name("llm_output", "reference_coverage"))
+    if values is not None:
+        return values
+    return reference_word_coverage(get_artifact_column(kwargs, "llm_output", "lower", [t or '' for t in llm_outputs]),
+                                   get_artifact_column(kwargs, "reference_answer", "lower", [t or '' for t in reference_answers]))
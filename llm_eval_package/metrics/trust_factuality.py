@@ -1,4 +1,7 @@
+import numpy as np
+
 from llm_eval_package.metrics.base import BaseMetric # Updated import path
+from llm_eval_package.metrics.text_artifacts import get_artifact, get_reference_coverage
 
 class TrustFactualityMetric(BaseMetric):
     """
@@ -6,6 +9,11 @@ class TrustFactualityMetric(BaseMetric):
     This is a placeholder and would require a sophisticated NLP model or external knowledge base.
     """
 
+    supports_batch = True
+    input_fields = ('llm_output', 'reference_answer')
+    text_artifacts = (('llm_output', 'lower'), ('reference_answer', 'lower'), ('llm_output', 'reference_coverage'))
+    cost = 2.0
+
     def __init__(self):
         """
         Initializes the TrustFactualityMetric.
@@ -22,7 +30,7 @@ class TrustFactualityMetric(BaseMetric):
             llm_output (str): The output generated by the LLM.
             reference_answer (str): The human-written reference answer (used as ground truth for factuality).
             query (str, optional): The user's input query (not used by this metric).
-            **kwargs: Additional keyword arguments (not used by this metric).
+            **kwargs: Optional precomputed llm_output_lower / reference_answer_lower.
 
         Returns:
             float: A placeholder score (e.g., based on simple keyword presence).
@@ -32,8 +40,8 @@ class TrustFactualityMetric(BaseMetric):
 
         # Placeholder logic: simple check if reference answer content is present in LLM output.
         # This is a very weak proxy for factuality.
-        reference_lower = reference_answer.lower()
-        llm_output_lower = llm_output.lower()
+        reference_lower = get_artifact(kwargs, 'reference_answer', 'lower', reference_answer)
+        llm_output_lower = get_artifact(kwargs, 'llm_output', 'lower', llm_output)
 
         # Check if a significant portion of the reference answer's unique words are in the LLM output
         ref_words = set(reference_lower.split())
@@ -46,6 +54,16 @@ class TrustFactualityMetric(BaseMetric):
         score = len(common_words) / len(ref_words)
         return score
 
+    def compute_batch(self, llm_outputs: list, reference_answers: list = None, queries: list = None, **kwargs) -> np.ndarray:
+        """
+        Scores every row at once from the word overlap the Evaluator builds once per run as the
+        reference_coverage text artifact (shared with Completeness).
+        """
+        n = len(llm_outputs)
+        reference_answers = reference_answers if reference_answers is not None else [None] * n
+        valid_rows = np.fromiter((bool(out) and bool(ref) for out, ref in zip(llm_outputs, reference_answers)), dtype=bool, count=n)
+        return np.where(valid_rows, get_reference_coverage(kwargs, llm_outputs, reference_answers), 0.0)
+
     def get_score_description(self, score: float) -> str:
         """
         Returns a description for the given trust and factuality score.
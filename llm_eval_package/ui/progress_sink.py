@@ -0,0 +1,29 @@
+# llm_eval_package/ui/progress_sink.py
+import streamlit as st
+
+from llm_eval_package.core.progress import ProgressSink
+
+
+class StreamlitProgressSink(ProgressSink):
+    """Shows core progress as st.progress and notifications as st.info / st.success / st.warning / st.error."""
+
+    def __init__(self):
+        self._bar = None
+        self._total = 0
+
+    def start(self, total: int, description: str = ""):
+        self._total = max(total, 1)
+        self._bar = st.progress(0, text=description or "Initializing evaluation...")
+
+    def advance(self, completed: int, message: str = ""):
+        if self._bar is None: return
+        self._bar.progress(min(completed / self._total, 1.0), text=message or None)
+
+    def finish(self, message: str = ""):
+        if self._bar is not None:
+            self._bar.empty()
+            self._bar = None
+        if message: st.success(message)
+
+    def notify(self, message: str, level: str = "info"):
+        getattr(st, level if level in ("info", "success", "warning", "error") else "info")(message)
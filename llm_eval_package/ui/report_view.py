@@ -0,0 +1,61 @@
+# llm_eval_package/ui/report_view.py
+import pandas as pd
+import streamlit as st
+
+from llm_eval_package.core.reporting import Reporter
+
+class ReportView:
+    """
+    Streamlit rendering of the reports built by core.reporting.Reporter.
+    """
+
+    def __init__(self, reporter: Reporter = None):
+        self.reporter = reporter or Reporter()
+
+    def render_summary_report(self, df_evaluated: pd.DataFrame, selected_metrics: list, custom_thresholds: dict = None):
+        """
+        Displays a summary report of the evaluation results.
+
+        Args:
+            df_evaluated (pd.DataFrame): The DataFrame containing evaluation results.
+            selected_metrics (list): List of metrics that were evaluated.
+            custom_thresholds (dict, optional): Custom thresholds used for evaluation.
+        """
+        if df_evaluated.empty:
+            st.warning("No evaluation results to report.")
+            return
+
+        report = self.reporter.generate_summary_report(df_evaluated, selected_metrics, custom_thresholds)
+        st.subheader("Evaluation Summary")
+        st.write(f"Total test cases evaluated: **{report['total_rows']}**")
+
+        st.markdown("### Metric Pass/Fail Rates")
+        if not report["pass_fail_rates"].empty:
+            st.dataframe(report["pass_fail_rates"], use_container_width=True)
+        else:
+            st.info("No metrics were selected for evaluation, or no results available.")
+
+        st.markdown("### Average Metric Scores")
+        if not report["average_scores"].empty:
+            st.dataframe(report["average_scores"], use_container_width=True)
+        else:
+            st.info("No average scores to display.")
+
+    def render_export_button(self, df_evaluated: pd.DataFrame, file_format: str = "csv"):
+        """
+        Shows a download button for the evaluation results in the given format.
+        """
+        if df_evaluated.empty:
+            st.warning("No data to export.")
+            return
+        try:
+            data = self.reporter.export_report(df_evaluated, file_format)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        st.download_button(
+            label=f"Download Results as {file_format.upper()}",
+            data=data,
+            file_name=f"llm_evaluation_results.{file_format}",
+            mime=Reporter.EXPORT_MIME_TYPES[file_format],
+        )
@@ -1,6 +1,5 @@
 import os
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
 
 class ModelDownloader:
     """
@@ -27,6 +26,7 @@ class ModelDownloader:
         print(f"Attempting to download and save model '{model_name}' to '{save_path}'...")
 
         try:
+            from sentence_transformers import SentenceTransformer # Imported here so importing utils stays cheap
             # Initialize the model from the Hub (this will trigger download if not cached)
             model = SentenceTransformer(model_name)
             # Save the model to the specified path
@@ -16,6 +16,8 @@ if project_root_path not in sys.path:
 
 from llm_eval_package.data.loader import DataLoader
 from llm_eval_package.core.engine import Evaluator
+from llm_eval_package.core.progress import set_default_sink
+from llm_eval_package.ui.progress_sink import StreamlitProgressSink
 from llm_eval_package.ui.sidebar_view import SidebarView, BOT_DOMAIN_MAPPING
 from llm_eval_package.ui.data_view import DataManagementView
 from llm_eval_package.ui.results_view import ResultsView
@@ -23,11 +25,14 @@ from llm_eval_package.ui.tutorial_view import TutorialView
 from llm_eval_package.config import (
     METRIC_THRESHOLDS, AVAILABLE_METRICS, TASK_METRICS_PRESELECTION,
     DEFAULT_PASS_CRITERION, PASS_CRITERION_ALL_PASS, PASS_CRITERION_ANY_PASS,
-    TASK_TYPE_RAG_FAQ, DEVELOPER_MODE, REQUIRED_COLUMNS 
+    TASK_TYPE_RAG_FAQ, DEVELOPER_MODE, REQUIRED_COLUMNS, FETCH_CONCURRENCY, LOWER_IS_BETTER_METRICS,
+    FETCH_CACHE_ENABLED, FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS
 )
 from llm_eval_package.data.rag_input_processor import (
     DEFAULT_API_URL, DEFAULT_API_HEADERS, DEFAULT_DOMAINS
 )
+from llm_eval_package.data.async_fetcher import AsyncBotFetcher, add_response_columns
+from llm_eval_package.data.response_cache import ResponseCache
 
 # fetch_bot_responses_for_df_streamlit_with_progress (from previous response)
 def fetch_bot_responses_for_df_streamlit_with_progress(
@@ -38,42 +43,26 @@ def fetch_bot_responses_for_df_streamlit_with_progress(
     output_df = input_df.copy()
     if 'llm_output' not in output_df.columns: output_df['llm_output'] = pd.NA
     output_df['llm_output'] = output_df['llm_output'].astype('object')
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     api_url, api_headers, domains_map = DEFAULT_API_URL, DEFAULT_API_HEADERS.copy(), DEFAULT_DOMAINS
     domain_path = domains_map.get(selected_domain_key)
     if not domain_path: st.error(f"Domain key '{selected_domain_key}' invalid."); return input_df.copy()
     if "YOUR_EXPIRED_OR_PLACEHOLDER_TOKEN_HERE" in api_headers.get("Authorization",""):
         st.error("FATAL: API token is a placeholder in config. Update it.", icon="🚫"); return input_df.copy()
     total_q, progress_bar, status_text = len(output_df), st.progress(0.0), st.empty()
-    status_text.text("Initializing API calls..."); responses, fetched_ok = [pd.NA]*total_q, 0
+    status_text.text("Initializing API calls...")
     
-    for i in range(total_q):
-        original_df_index = output_df.index[i] 
-        query = str(output_df.loc[original_df_index, query_column]) if query_column in output_df.columns else ''
-        
-        api_headers["Req-Date-Time"] = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00","Z")
-        payload = {"message": query, "senderId": "st_user_v3", "domain": domain_path}
-        resp_msg = pd.NA; max_r, delay_r = 1, 1
-        for attempt in range(max_r + 1):
-            try:
-                api_resp = requests.post(api_url, headers=api_headers, data=json.dumps(payload), verify=False, timeout=25)
-                api_resp.raise_for_status(); msg_full = ""
-                if api_resp.text and api_resp.text.strip():
-                    for line in api_resp.text.strip().splitlines():
-                        try: obj = json.loads(line); msg_full += str(obj.get("data",""))
-                        except: 
-                            if not msg_full: msg_full += line; continue
-                else: msg_full = "Error: Empty API response"
-                resp_msg = msg_full; fetched_ok += 1; break
-            except requests.exceptions.RequestException as e_req: resp_msg = f"Error (API Attempt {attempt+1}): {str(e_req)[:100]}"
-            except Exception as e_other: resp_msg = f"Unexpected Error (Attempt {attempt+1}): {str(e_other)[:100]}"
-            if attempt < max_r: time.sleep(delay_r) 
-        
-        output_df.loc[original_df_index, 'llm_output'] = resp_msg
-        
-        progress_bar.progress(float((i+1)/total_q)); status_text.text(f"Processed: {i+1}/{total_q}. Fetched OK: {fetched_ok}")
+    def update_progress(done, total, ok):
+        progress_bar.progress(float(done/total)); status_text.text(f"Processed: {done}/{total}. Fetched OK: {ok}")
+    # Concurrent requests over a pooled keep-alive client; results come back in row order.
+    cache = ResponseCache(FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS) if FETCH_CACHE_ENABLED else None
+    fetcher = AsyncBotFetcher(api_url, api_headers, domain_path, sender_id="st_user_v3", concurrency=FETCH_CONCURRENCY,
+                              api_timeout=25, max_retries=1, response_cache=cache)
+    try: results = fetcher.fetch([str(q) for q in output_df[query_column].fillna('')], progress_callback=update_progress)
+    finally:
+        if cache is not None: cache.close()
+    add_response_columns(output_df, results); fetched_ok = sum(r["ok"] for r in results)
     
-    status_text.text(f"All {total_q} processed. Fetched OK: {fetched_ok}.")
+    status_text.text(f"All {total_q} processed. Fetched OK: {fetched_ok} ({fetcher.last_stats['queries_per_second']:.2f} queries/s, {fetcher.last_stats['calls_saved']} calls saved).")
     if fetched_ok < total_q: st.warning(f"{total_q-fetched_ok} errors. Check 'llm_output'.")
     else: st.success("All responses fetched!")
     return output_df
@@ -141,7 +130,9 @@ def run_evaluation_logic(df_input_for_eval: pd.DataFrame, evaluator: Evaluator):
 def main():
     st.set_page_config(page_title="BYOB Evaluator by Genius AI", page_icon="✨", layout="wide")
 
-    data_loader, evaluator = DataLoader(), Evaluator()
+    # Core messages (model downloads, load errors) and evaluation progress are shown in the page.
+    progress_sink = StreamlitProgressSink(); set_default_sink(progress_sink)
+    data_loader, evaluator = DataLoader(), Evaluator(progress_sink=progress_sink)
     sidebar_view, data_mgmt_view, results_view, tutorial_view = SidebarView(), DataManagementView(), ResultsView(), TutorialView()
 
     default_session_state = {
@@ -228,6 +219,7 @@ def main():
                     default_thresh = METRIC_THRESHOLDS.get(metric, 0.5)
                     current_val = float(temp_custom_thresholds.get(metric, default_thresh))
                     if metric == "Safety": temp_custom_thresholds[metric] = 1.0; st.markdown(f"↳ **{metric}**: Threshold fixed at 1.0")
+                    elif metric in LOWER_IS_BETTER_METRICS: temp_custom_thresholds[metric] = st.number_input(f"Max. for {metric} (s)", 0.0, None, current_val, 0.5, key=f"main_thresh_{metric}")
                     else: temp_custom_thresholds[metric] = st.number_input(f"Thresh. for {metric}", 0.0, 1.0, current_val, 0.01, key=f"main_thresh_{metric}")
                 st.session_state.main_custom_thresholds = temp_custom_thresholds
             if "Safety" in st.session_state.main_selected_metrics and DEVELOPER_MODE:
@@ -16,7 +16,9 @@ if project_root_path not in sys.path:
     sys.path.insert(0, project_root_path)
 
 from llm_eval_package.data.loader import DataLoader
-from llm_eval_package.core.engine import Evaluator
+from llm_eval_package.core.engine import Evaluator, format_run_summary
+from llm_eval_package.core.progress import set_default_sink
+from llm_eval_package.ui.progress_sink import StreamlitProgressSink
 from llm_eval_package.ui.sidebar_view import SidebarView, BOT_DOMAIN_MAPPING
 from llm_eval_package.ui.data_view import DataManagementView
 from llm_eval_package.ui.results_view import ResultsView
@@ -24,12 +26,15 @@ from llm_eval_package.ui.tutorial_view import TutorialView
 from llm_eval_package.config import (
     METRIC_THRESHOLDS, AVAILABLE_METRICS, TASK_METRICS_PRESELECTION,
     DEFAULT_PASS_CRITERION, PASS_CRITERION_ALL_PASS, PASS_CRITERION_ANY_PASS,
-    TASK_TYPE_RAG_FAQ, DEVELOPER_MODE, REQUIRED_COLUMNS # Added REQUIRED_COLUMNS
+    TASK_TYPE_RAG_FAQ, DEVELOPER_MODE, REQUIRED_COLUMNS, # Added REQUIRED_COLUMNS
+    LOWER_IS_BETTER_METRICS, FETCH_CONCURRENCY, FETCH_CACHE_ENABLED, FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS
 )
 
 from llm_eval_package.data.rag_input_processor import (
     DEFAULT_API_URL, DEFAULT_API_HEADERS, DEFAULT_DOMAINS
 )
+from llm_eval_package.data.async_fetcher import AsyncBotFetcher, add_response_columns
+from llm_eval_package.data.response_cache import ResponseCache
 
 
 # Corrected fetch_bot_responses_for_df_streamlit_with_progress
@@ -49,7 +54,6 @@ def fetch_bot_responses_for_df_streamlit_with_progress(
     output_df = input_df.copy() 
     
     # API call setup (adapted from rag_input_processor.py)
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     current_api_url = DEFAULT_API_URL
     current_api_headers = DEFAULT_API_HEADERS.copy() # Use a copy
     current_domains_map = DEFAULT_DOMAINS 
@@ -76,65 +80,29 @@ def fetch_bot_responses_for_df_streamlit_with_progress(
     status_text_area = st.empty() 
     status_text_area.text("Initializing API calls...") 
     
-    # Initialize an empty list for responses. We will append to this.
-    responses_collected = [] 
-    successful_fetches = 0
-
-    # Iterate using a counter for progress and for appending to responses_collected
-    for i, (original_df_index, row_data) in enumerate(output_df.iterrows()):
-        # original_df_index is the actual index from the DataFrame (could be sparse)
-        # i is the 0-based iteration counter (0, 1, 2, ...)
-        
-        query_text = str(row_data.get(query_column, ''))
-        current_api_headers["Req-Date-Time"] = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
-        payload = {"message": query_text, "senderId": "streamlit_app_user_v2", "domain": domain_path}
-        
-        response_message_for_df = pd.NA 
-        max_retries_ui = 1 
-        retry_delay_ui = 1 
-
-        for attempt in range(max_retries_ui + 1):
-            try:
-                api_response = requests.post(
-                    current_api_url, headers=current_api_headers,
-                    data=json.dumps(payload), verify=False, timeout=25 
-                )
-                api_response.raise_for_status() 
-                
-                full_message = ""
-                if api_response.text and api_response.text.strip():
-                    for line in api_response.text.strip().splitlines():
-                        try:
-                            obj = json.loads(line)
-                            full_message += str(obj.get("data", ""))
-                        except json.JSONDecodeError:
-                            if not full_message : full_message += line 
-                            continue
-                else: 
-                    full_message = "Error: Empty API response"
-                
-                response_message_for_df = full_message
-                successful_fetches += 1
-                break 
-            except requests.exceptions.RequestException as e_req:
-                response_message_for_df = f"Error (API Attempt {attempt+1}): {str(e_req)[:100]}"
-            except Exception as e_other: 
-                response_message_for_df = f"Unexpected Error (Attempt {attempt+1}): {str(e_other)[:100]}"
-            if attempt < max_retries_ui:
-                time.sleep(retry_delay_ui) 
-        
-        responses_collected.append(response_message_for_df) # Append to the list
-
-        # Update progress based on the iteration counter `i`
-        progress_value = (i + 1) / total_queries
-        progress_bar.progress(float(progress_value))
-        status_text_area.text(f"Processed: {i + 1}/{total_queries} queries. Successful API calls: {successful_fetches}")
-
-    # Assign the collected responses list to the new column.
-    # This list will have the same length as the number of rows iterated.
-    output_df['llm_output'] = responses_collected
+    # Requests run concurrently on a pooled keep-alive client (starting at FETCH_CONCURRENCY in
+    # flight and adapting to the backend); responses come back in row order, so they line up with output_df.
+    def update_progress(done, total, successful):
+        progress_bar.progress(float(done / total))
+        status_text_area.text(f"Processed: {done}/{total} queries. Successful API calls: {successful}")
+
+    # Repeated questions share one request, and unexpired answers come from the response cache.
+    response_cache = ResponseCache(FETCH_CACHE_PATH, FETCH_CACHE_TTL_SECONDS) if FETCH_CACHE_ENABLED else None
+    fetcher = AsyncBotFetcher(current_api_url, current_api_headers, domain_path,
+                              sender_id="streamlit_app_user_v2", concurrency=FETCH_CONCURRENCY,
+                              api_timeout=25, max_retries=1, response_cache=response_cache)
+    try:
+        results = fetcher.fetch([str(q) for q in output_df[query_column].fillna('')], progress_callback=update_progress)
+    finally:
+        if response_cache is not None: response_cache.close()
+    successful_fetches = sum(result["ok"] for result in results)
+
+    # Add 'llm_output' plus the per-query timing columns (time to first chunk, total latency, chunk count).
+    add_response_columns(output_df, results)
     
-    status_text_area.text(f"All {total_queries} queries processed. Successfully fetched responses for {successful_fetches} queries.")
+    status_text_area.text(f"All {total_queries} queries processed. Successfully fetched responses for {successful_fetches} queries "
+                          f"({fetcher.last_stats['queries_per_second']:.2f} queries/s, "
+                          f"{fetcher.last_stats['calls_saved']} bot calls saved by the cache and duplicate queries).")
     if successful_fetches < total_queries:
         st.warning(f"{total_queries - successful_fetches} queries encountered errors. Please check the 'llm_output' column for details (e.g., 'Error: ...').")
     else:
@@ -144,7 +112,9 @@ def fetch_bot_responses_for_df_streamlit_with_progress(
 def main():
     st.set_page_config(page_title="BYOB Evaluator by Genius AI", page_icon="✨", layout="wide")
 
-    data_loader, evaluator = DataLoader(), Evaluator()
+    # Core messages (model downloads, load errors) and evaluation progress are shown in the page.
+    progress_sink = StreamlitProgressSink(); set_default_sink(progress_sink)
+    data_loader, evaluator = DataLoader(), Evaluator(progress_sink=progress_sink)
     sidebar_view, data_mgmt_view, results_view, tutorial_view = SidebarView(), DataManagementView(), ResultsView(), TutorialView()
 
     default_session_state = {
@@ -169,6 +139,7 @@ def main():
     if go_to_instructions:
         st.session_state.show_tutorial = True; st.session_state.show_results = False
         st.session_state.df_original = pd.DataFrame(); st.session_state.df_evaluated = pd.DataFrame()
+        st.session_state.last_eval_run = None
         st.session_state.file_uploader_key += 1; st.session_state.agreement_calculated = False; st.rerun()
 
     # st.markdown(
@@ -244,6 +215,7 @@ def main():
                     default_thresh = METRIC_THRESHOLDS.get(metric, 0.5)
                     current_val = float(temp_custom_thresholds.get(metric, default_thresh))
                     if metric == "Safety": temp_custom_thresholds[metric] = 1.0; st.markdown(f"↳ **{metric}**: Threshold fixed at 1.0")
+                    elif metric in LOWER_IS_BETTER_METRICS: temp_custom_thresholds[metric] = st.number_input(f"Max. for {metric} (s)", 0.0, None, current_val, 0.5, key=f"main_thresh_{metric}")
                     else: temp_custom_thresholds[metric] = st.number_input(f"Thresh. for {metric}", 0.0, 1.0, current_val, 0.01, key=f"main_thresh_{metric}")
                 st.session_state.main_custom_thresholds = temp_custom_thresholds
             if "Safety" in st.session_state.main_selected_metrics and DEVELOPER_MODE:
@@ -273,14 +245,20 @@ def main():
                         evaluated_data_from_engine = evaluator.evaluate_dataframe(
                             df_to_evaluate, st.session_state.main_selected_metrics,
                             custom_thresholds=eval_custom_thresh, sensitive_keywords=sensitive_keywords_list,
-                            overall_pass_criterion=st.session_state.main_overall_criterion
+                            overall_pass_criterion=st.session_state.main_overall_criterion,
+                            previous_run=st.session_state.get('last_eval_run')
                         )
+                        # Raw scores survive data edits so the next run only recomputes changed rows.
+                        st.session_state.last_eval_run = evaluator.last_run
                         
                         final_evaluated_df = evaluated_data_from_engine.copy()
                         
                         # Pre-populate Reviewer's Final Result
                         # Initialize the column first to ensure it exists with a default
                         final_evaluated_df[reviewer_final_col] = final_evaluated_df[automated_overall_col].fillna('N/A')
+                        # Verdicts seeded from the automated result (None where an initial verdict was given);
+                        # rows still holding them follow the automated result when decisions are re-applied.
+                        reviewer_defaults = final_evaluated_df[reviewer_final_col].astype(object)
 
                         if initial_verdict_col in df_to_evaluate.columns:
                             # Iterate and assign row by row to handle potential index misalignments carefully
@@ -291,18 +269,46 @@ def main():
                                 if pd.notna(initial_verdict) and initial_verdict in ['Pass', 'Fail', 'N/A', 'Error']:
                                     if index in final_evaluated_df.index:
                                         final_evaluated_df.loc[index, reviewer_final_col] = initial_verdict
+                                        reviewer_defaults.loc[index] = None
                         
                         st.session_state.df_evaluated = final_evaluated_df.copy()
+                        st.session_state.reviewer_defaults = reviewer_defaults
+                        st.session_state.last_run_summary = evaluator.last_run_summary
                         
                         st.session_state.show_results = True
                         st.session_state.selected_metrics_for_results = st.session_state.main_selected_metrics[:]
                         st.session_state.custom_thresholds_for_results = eval_custom_thresh.copy() if eval_custom_thresh else None
+                        st.session_state.criterion_for_results = st.session_state.main_overall_criterion
                         st.session_state.show_tutorial = False; st.session_state.agreement_calculated = False
                         st.success("Evaluation Complete!"); st.rerun()
                     except Exception as e: st.error(f"Evaluation Error: {e}"); st.exception(e)
 
     if st.session_state.show_results and not st.session_state.df_evaluated.empty:
         automated_overall_col = "Automated Overall Result"; reviewer_final_col = "Reviewer's Final Result"
+        # Threshold / pass-criterion changes only re-decide the stored scores; no metric is re-run.
+        effective_thresholds = st.session_state.main_custom_thresholds.copy() if st.session_state.main_use_custom_thresholds else None
+        if st.session_state.main_selected_metrics == st.session_state.selected_metrics_for_results and (
+                effective_thresholds != st.session_state.custom_thresholds_for_results
+                or st.session_state.main_overall_criterion != st.session_state.get('criterion_for_results')):
+            st.session_state.df_evaluated = evaluator.apply_decisions(
+                st.session_state.df_evaluated, st.session_state.selected_metrics_for_results,
+                custom_thresholds=effective_thresholds,
+                overall_pass_criterion=st.session_state.main_overall_criterion,
+                run=st.session_state.get('last_eval_run')
+            )
+            reviewer_defaults = st.session_state.get('reviewer_defaults')
+            df_redecided = st.session_state.df_evaluated
+            if reviewer_defaults is not None and reviewer_defaults.index.equals(df_redecided.index) and reviewer_final_col in df_redecided.columns:
+                # Re-seed the verdicts the reviewer has not touched with the new automated result.
+                untouched = df_redecided[reviewer_final_col].astype(object).eq(reviewer_defaults)
+                new_defaults = df_redecided[automated_overall_col].fillna('N/A')
+                df_redecided.loc[untouched, reviewer_final_col] = new_defaults[untouched]
+                st.session_state.reviewer_defaults = reviewer_defaults.where(~untouched, new_defaults)
+            st.session_state.custom_thresholds_for_results = effective_thresholds
+            st.session_state.criterion_for_results = st.session_state.main_overall_criterion
+            st.session_state.agreement_calculated = False
+        if st.session_state.get('last_run_summary'):
+            st.caption(format_run_summary(st.session_state.last_run_summary).replace("\n", "  \n"))
 
         returned_edited_results_df = results_view.render_results(
             st.session_state.df_evaluated.copy(), 
@@ -0,0 +1,79 @@
+# tests/test_async_fetcher.py
+import asyncio
+
+import httpx
+
+from llm_eval_package.data.async_fetcher import EMPTY_RESPONSE, AsyncBotFetcher
+from llm_eval_package.data.flow_control import AdaptiveConcurrencyLimiter, CircuitBreaker
+from llm_eval_package.data.response_cache import ResponseCache
+
+
+def _mock_fetcher(status_codes: list, body: str = '{"data": "ok"}\n', **kwargs) -> tuple:
+    """AsyncBotFetcher whose bot answers with status_codes in turn, then 200 with body; also returns the call log."""
+    responses = iter(status_codes)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status_code = next(responses, 200)
+        return httpx.Response(status_code, text=body if status_code == 200 else "error")
+
+    class MockFetcher(AsyncBotFetcher):
+        def _make_client(self):
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    return MockFetcher("http://bot/chat", {}, "domain", retry_delay=0.001, max_backoff=0.01, **kwargs), calls
+
+
+def test_throttled_probe_releases_half_open_circuit():
+    fetcher, calls = _mock_fetcher([503, 503, 503, 429], concurrency=1, max_retries=6,
+                                   circuit_failure_threshold=3, circuit_cooldown=0.2)
+
+    results = asyncio.run(asyncio.wait_for(fetcher.fetch_all(["q"]), timeout=10))
+
+    assert results[0]["ok"] and results[0]["llm_output"] == "ok"
+    assert len(calls) == 5
+    breaker = fetcher.circuit_breakers["domain"]
+    assert breaker.state == CircuitBreaker.CLOSED and not breaker._probe_in_flight
+
+
+def test_released_probe_is_not_released_twice():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0)
+    breaker.record_failure()
+    first_probe = asyncio.run(breaker.wait_until_allowed())
+    breaker.record_failure()  # the probe failed; the circuit reopens
+    second_probe = asyncio.run(breaker.wait_until_allowed())
+
+    breaker.release_probe(first_probe)  # late release of the settled probe
+
+    assert second_probe != first_probe and breaker._probe_in_flight
+
+
+def test_empty_answer_is_a_failure_and_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"), ttl_seconds=3600)
+    cache.put("http://bot/chat", "domain", "stale", {"llm_output": EMPTY_RESPONSE})  # cached by an older version
+    fetcher, calls = _mock_fetcher([], body="", response_cache=cache)
+
+    results = asyncio.run(fetcher.fetch_all(["q", "stale"]))
+
+    assert [(r["ok"], r["llm_output"], r["cached"]) for r in results] == [(False, EMPTY_RESPONSE, False)] * 2
+    assert len(calls) == 2
+    assert cache.get("http://bot/chat", "domain", "q") is None
+
+
+def test_long_answers_with_fast_first_chunk_do_not_cut_concurrency():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    limiter.on_success(0.0, 0.05)  # one unusually fast response
+    for _ in range(50):
+        limiter.on_success(0.0, 0.2)
+
+    assert limiter.decreases == 0 and limiter.limit > 8
+
+
+def test_slow_first_chunk_cuts_concurrency():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    for _ in range(10):
+        limiter.on_success(0.0, 0.2)
+    limiter.on_success(float("inf"), 1.0)
+
+    assert limiter.decreases == 1
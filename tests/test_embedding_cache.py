@@ -0,0 +1,21 @@
+# tests/test_embedding_cache.py
+import numpy as np
+import pytest
+
+from llm_eval_package.metrics.embedding_cache import EmbeddingCache
+
+
+def test_store_after_failed_store_reuses_the_freed_slot(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", dim=2, max_entries=3)
+    cache.store(["a", "b", "c"], np.arange(6, dtype=float).reshape(3, 2))
+    with pytest.raises(Exception):
+        cache.store(["d"], np.ones((1, 3)))  # wrong dimension; "a" was evicted for it, its slot is freed
+    assert len(cache) == 2
+
+    cache.store(["e"], np.array([[7.0, 8.0]]))
+    cache.store(["f"], np.array([[9.0, 10.0]]))  # full again: evicts the least recently used entry
+
+    embeddings, missing = cache.lookup(["c", "e", "f"])
+    assert not missing.any()
+    assert embeddings.tolist() == [[4.0, 5.0], [7.0, 8.0], [9.0, 10.0]]
+    assert len(cache) == 3
@@ -0,0 +1,66 @@
+# tests/test_engine_details.py
+import pandas as pd
+
+import llm_eval_package.core.engine as engine
+import llm_eval_package.metrics.text_artifacts as text_artifacts
+from llm_eval_package.core.engine import Evaluator
+from llm_eval_package.core.registry import MetricRegistry
+
+
+def test_detail_columns_come_from_scored_rows_only(monkeypatch):
+    evaluator = Evaluator()
+    evaluator.metrics_instances = MetricRegistry({"Safety": "SafetyMetric"})  # Safety is off in the default config
+    safety = evaluator.metrics_instances["Safety"]
+    scored = []
+    compute_batch_details = safety.compute_batch_details
+
+    def recording(llm_outputs, *args, **kwargs):
+        scored.append(list(llm_outputs))
+        return compute_batch_details(llm_outputs, *args, **kwargs)
+
+    monkeypatch.setattr(safety, "compute_batch_details", recording)
+    keywords = ["idiot", "scam"]
+    df = pd.DataFrame({"query": ["q"] * 3, "reference_answer": ["r"] * 3,
+                       "llm_output": ["You idiot", "A fine answer", "You idiot"]})
+
+    first = evaluator.evaluate_dataframe(df, ["Safety"], sensitive_keywords=keywords)
+    edited = df.assign(llm_output=["You idiot", "A fine answer", "Total scam"])
+    second = evaluator.evaluate_dataframe(edited, ["Safety"], sensitive_keywords=keywords, previous_run=evaluator.last_run)
+
+    assert scored == [["You idiot", "A fine answer"], ["Total scam"]]  # duplicates and reused rows are not rescanned
+    assert list(first["Safety Matched Terms"]) == ["idiot", "", "idiot"]
+    assert list(second["Safety Matched Terms"]) == ["idiot", "", "scam"]
+    assert list(second["Safety Score"]) == [0.0, 1.0, 0.0]
+
+
+def test_text_artifacts_are_built_only_for_scored_rows(monkeypatch):
+    evaluator = Evaluator()
+    evaluator.metrics_instances = MetricRegistry({"Completeness": "CompletenessMetric",
+                                                  "Trust & Factuality": "TrustFactualityMetric"})
+    built_for, covered = [], []
+    build_text_artifacts = engine.build_text_artifacts
+    reference_word_coverage = text_artifacts.reference_word_coverage
+
+    def recording_build(column_inputs, requests, memo=None):
+        built_for.append(list(column_inputs["llm_output"]))
+        return build_text_artifacts(column_inputs, requests, memo)
+
+    def recording_coverage(lowered_outputs, lowered_references):
+        covered.append(list(lowered_outputs))
+        return reference_word_coverage(lowered_outputs, lowered_references)
+
+    monkeypatch.setattr(engine, "build_text_artifacts", recording_build)
+    monkeypatch.setattr(text_artifacts, "reference_word_coverage", recording_coverage)
+    df = pd.DataFrame({"query": ["q"] * 3, "llm_output": ["The cat sat", "A dog", "The cat sat"],
+                       "reference_answer": ["the cat", "a cat", "the cat"]})
+    metrics = ["Completeness", "Trust & Factuality"]
+
+    evaluator.evaluate_dataframe(df, metrics)
+    assert built_for == [["The cat sat", "A dog"]] * 2  # duplicate row left out
+    assert covered == [["the cat sat", "a dog"]]  # shared by both metrics through the run's memo
+    assert evaluator.last_run_summary["text_artifacts"]["unique_texts"] == 4
+
+    built_for.clear()
+    evaluator.evaluate_dataframe(df, metrics, previous_run=evaluator.last_run)
+    assert built_for == []  # nothing changed: every score is reused, nothing is preprocessed
+    assert evaluator.last_run_summary["text_artifacts"]["artifacts"] == 0
@@ -0,0 +1,81 @@
+# tests/test_fact_adherence.py
+import re
+
+import pytest
+
+import llm_eval_package.metrics.fact_adherence as fact_adherence
+import llm_eval_package.metrics.text_artifacts as text_artifacts
+from llm_eval_package.metrics.fact_adherence import FactAdherenceMetric
+from llm_eval_package.metrics.text_artifacts import build_text_artifacts
+
+
+def _tag(tokens):
+    return [(t, 'VBD' if t.endswith('ed') else 'NNS' if t.endswith('s') else 'NN') for t in tokens]
+
+
+class _Lemmatizer:
+    def lemmatize(self, word, pos):
+        if pos == 'v' and word.endswith('ed'):
+            return word[:-2]
+        return word[:-1] if word.endswith('s') else word
+
+
+@pytest.fixture
+def nltk_metric(monkeypatch):
+    """FactAdherenceMetric on its NLTK path, with small stand-ins for the NLTK data packages."""
+    tokenized = []
+
+    def word_tokenize(text):
+        tokenized.append(text)
+        return re.findall(r"\w+|[^\w\s]", text)
+
+    class Nltk:
+        pos_tag = staticmethod(_tag)
+        pos_tag_sents = staticmethod(lambda sentences: [_tag(s) for s in sentences])
+
+    class Wordnet:
+        ADJ, VERB, NOUN, ADV = 'a', 'v', 'n', 'r'
+
+    monkeypatch.setattr(fact_adherence, "word_tokenize", word_tokenize, raising=False)
+    monkeypatch.setattr(fact_adherence, "nltk", Nltk, raising=False)
+    monkeypatch.setattr(fact_adherence, "wordnet", Wordnet, raising=False)
+    monkeypatch.setattr(text_artifacts, "_word_tokenize", word_tokenize)
+    metric = FactAdherenceMetric()
+    metric.lemmatizer = _Lemmatizer()
+    metric.nltk_ready = True
+    metric.text_artifacts = (('llm_output', 'tokens'),)
+    return metric, tokenized
+
+
+def test_compute_uses_shared_tokens_artifact(nltk_metric):
+    metric, tokenized = nltk_metric
+    output = "You need NRICs and proofs of address."
+    shared_tokens = re.findall(r"\w+|[^\w\s]", output.lower())
+
+    score = metric.compute(output, required_facts="NRIC;proof of address", llm_output_tokens=shared_tokens)
+
+    assert score == 1.0
+    assert output.lower() not in tokenized  # only the fact phrases were tokenized here
+    assert tokenized == ["nric", "proof of address"]
+
+
+def test_compute_batch_uses_shared_tokens_artifact(nltk_metric):
+    metric, tokenized = nltk_metric
+    outputs = ["He walked home.", "Nothing here"]
+    artifacts, _ = build_text_artifacts({"llm_output": outputs}, metric.text_artifacts)
+    tokenized.clear()  # building the artifact tokenized the outputs once
+
+    scores = metric.compute_batch(outputs, required_facts=["walk;home", "walk"], **artifacts)
+
+    assert list(scores) == [1.0, 0.0]
+    assert not any(output.lower() in tokenized for output in outputs)
+
+
+def test_fallback_whole_word_matching_finds_currency_and_percent_facts():
+    metric = FactAdherenceMetric(word_boundaries=True)
+    metric.nltk_ready = False
+
+    assert metric.compute("Bring NRIC and $500 deposit", required_facts="NRIC; $500; deposit") == 1.0
+    scores, details = metric.compute_batch_details(["Bring NRIC and $5000 at 5%"], required_facts=["NRIC; $500; 5%"])
+    assert list(scores) == [2 / 3]
+    assert details == {"Found Facts": ["NRIC; 5%"], "Missing Facts": ["$500"]}
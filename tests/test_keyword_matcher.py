@@ -0,0 +1,24 @@
+# tests/test_keyword_matcher.py
+from llm_eval_package.metrics.keyword_matcher import FactMatcher, KeywordMatcher
+
+
+def test_whole_word_facts_with_currency_and_percent_signs():
+    matcher = FactMatcher(["NRIC", "proof of address", "$500", "deposit", "5%"], word_boundaries=True)
+
+    flags = matcher.find("please bring your nric, proof of address and a $500 deposit (5% fee).")
+
+    assert flags == [True, True, True, True, True]
+
+
+def test_whole_word_facts_do_not_match_inside_words():
+    matcher = FactMatcher(["$500", "5%", "rice", "500"], word_boundaries=True)
+
+    assert matcher.find("pay $5000 at 15% for the price") == [False, False, False, False]
+    assert matcher.find("pay$500 now, 5%off, rice or 500.") == [True, True, True, True]
+
+
+def test_matched_terms_reports_nested_keywords():
+    matcher = KeywordMatcher(["Hate speech", "hate", "speech", "harm"])
+
+    assert matcher.matched_terms("no hate speech here, nothing harmful") == ["hate", "Hate speech", "speech"]
+    assert matcher.matched_terms("hateful speeches") == []
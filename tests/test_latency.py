@@ -0,0 +1,13 @@
+# tests/test_latency.py
+import numpy as np
+
+from llm_eval_package.metrics.latency import LatencyMetric
+
+
+def test_missing_latency_is_not_described_as_slow():
+    metric = LatencyMetric()
+    score = metric.compute("answer", response_latency_seconds=None)
+
+    assert np.isnan(score)
+    assert metric.get_score_description(score).startswith("Latency not available")
+    assert metric.get_score_description(12.0).startswith("Very slow response")
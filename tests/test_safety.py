@@ -0,0 +1,14 @@
+# tests/test_safety.py
+from llm_eval_package.metrics.safety import SafetyMetric
+
+
+def test_keywords_edited_in_place_take_effect():
+    metric = SafetyMetric()
+    keywords = ["scam"]
+    assert metric.compute("That is a fraud", sensitive_keywords=keywords) == 1.0
+
+    keywords.append("fraud")
+
+    assert metric.compute("That is a fraud", sensitive_keywords=keywords) == 0.0
+    scores, details = metric.compute_batch_details(["That is a fraud"], sensitive_keywords=keywords)
+    assert list(scores) == [0.0] and details == {"Matched Terms": ["fraud"]}
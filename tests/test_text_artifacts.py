@@ -0,0 +1,27 @@
+# tests/test_text_artifacts.py
+from llm_eval_package.metrics.completeness import CompletenessMetric
+from llm_eval_package.metrics.text_artifacts import build_text_artifacts
+from llm_eval_package.metrics.trust_factuality import TrustFactualityMetric
+
+
+def test_reference_coverage_is_built_once_per_pair_and_shared():
+    outputs = ["The Cat sat", "a dog", "The Cat sat", "x"]
+    references = ["the cat ran", "", "the cat ran", "y"]
+    metrics = [CompletenessMetric(), TrustFactualityMetric()]
+    artifacts, stats = build_text_artifacts({"llm_output": outputs, "reference_answer": references},
+                                            [request for m in metrics for request in m.text_artifacts])
+
+    assert artifacts["llm_output_reference_coverage"] == [2 / 3, 1.0, 2 / 3, 0.0]
+    assert stats["artifacts"] == 3
+    for metric in metrics:
+        direct = metric.compute_batch(outputs, references)
+        shared = metric.compute_batch(outputs, references, **artifacts)
+        assert list(direct) == list(shared) == [2 / 3, 0.0, 2 / 3, 0.0]  # "a dog" has no reference to cover
+
+
+def test_metrics_read_the_shared_coverage_instead_of_recomputing():
+    coverage = [0.25, 0.75]  # deliberately not what the texts would give
+
+    scores = CompletenessMetric().compute_batch(["a b", "c d"], ["a", "c"], llm_output_reference_coverage=coverage)
+
+    assert list(scores) == coverage